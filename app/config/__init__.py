@@ -6,7 +6,8 @@ from .schemas import (
     HelperSettings, 
     UISettings, 
     AdvancedSettings, 
-    NavigationStep
+    NavigationStep,
+    HealthBarCalibration
 )
 from .validator import ConfigValidator, ValidationError
 from .migration import ConfigMigrator, ConfigMigration, MigrationError
@@ -32,6 +33,7 @@ __all__ = [
     'UISettings', 
     'AdvancedSettings',
     'NavigationStep',
+    'HealthBarCalibration',
     'ConfigValidator',
     'ValidationError',
     'ConfigMigrator',
@@ -4,7 +4,7 @@ from typing import Dict, Any, Optional, List, Callable
 from pathlib import Path
 import time
 import shutil
-from .schemas import ConfigSchema, ConfigSection, AreaConfig, HelperSettings, AdvancedSettings, UISettings, NavigationStep
+from .schemas import ConfigSchema, ConfigSection, AreaConfig, HelperSettings, AdvancedSettings, UISettings, NavigationStep, HealthBarCalibration
 from .validator import ConfigValidator
 from .migration import ConfigMigrator
 
@@ -232,6 +232,10 @@ class ConfigManager:
         self.schema.coordinate_area = area_config
         self._mark_dirty(ConfigSection.COORDINATE_AREA, area_config)
     
+    def update_health_calibration(self, calibration: HealthBarCalibration):
+        self.schema.health_calibration = calibration
+        self._mark_dirty(ConfigSection.HEALTH_CALIBRATION, calibration)
+    
     def get_area(self, area_name: str) -> Optional[AreaConfig]:
         return self.schema.areas_schema.get(area_name)
     
@@ -250,6 +254,9 @@ class ConfigManager:
     def get_coordinate_area(self) -> AreaConfig:
         return self.schema.coordinate_area
     
+    def get_health_calibration(self) -> HealthBarCalibration:
+        return self.schema.health_calibration
+    
     def export_config(self, export_path: str) -> bool:
         try:
             export_data = self.schema.to_dict()
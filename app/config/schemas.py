@@ -9,6 +9,7 @@ class ConfigSection(Enum):
     COORDINATE_AREA = "coordinate_area"
     UI_SETTINGS = "ui_settings"
     ADVANCED = "advanced_settings"
+    HEALTH_CALIBRATION = "health_calibration"
 
 @dataclass
 class AreaConfig:
@@ -72,6 +73,34 @@ class AdvancedSettings:
     detection_sensitivity: float = 0.8
     performance_mode: bool = False
 
+@dataclass
+class HealthBarCalibration:
+    calibrated: bool = False
+    area: Optional[List[int]] = None
+    x: int = 0
+    y: int = 0
+    width: int = 0
+    height: int = 0
+    direction: str = "left_to_right"
+    empty_color: Optional[List[int]] = None
+    scanlines: List[int] = field(default_factory=list)
+    
+    def is_valid(self) -> bool:
+        if not self.calibrated:
+            return True
+        return all([
+            self.area is not None and len(self.area) == 4,
+            self.width > 0,
+            self.height > 0,
+            self.x >= 0,
+            self.y >= 0,
+            self.direction in ("left_to_right", "right_to_left"),
+            all(0 <= row < self.height for row in self.scanlines)
+        ])
+    
+    def matches_area(self, area) -> bool:
+        return self.calibrated and self.area is not None and list(area) == list(self.area)
+
 @dataclass
 class NavigationStep:
     id: str
@@ -96,6 +125,7 @@ class ConfigSchema:
         self.advanced_settings = AdvancedSettings()
         self.navigation_steps: List[NavigationStep] = []
         self.coordinate_area = AreaConfig("Coordinate Display Area")
+        self.health_calibration = HealthBarCalibration()
         self.version = "2.0"
     
     def to_dict(self) -> Dict[str, Any]:
@@ -106,7 +136,8 @@ class ConfigSchema:
             "ui_settings": asdict(self.ui_settings),
             "advanced_settings": asdict(self.advanced_settings),
             "navigation_steps": [asdict(step) for step in self.navigation_steps],
-            "coordinate_area": asdict(self.coordinate_area)
+            "coordinate_area": asdict(self.coordinate_area),
+            "health_calibration": asdict(self.health_calibration)
         }
     
     @classmethod
@@ -177,6 +208,18 @@ class ConfigSchema:
             
             schema.coordinate_area = AreaConfig(**coord_data)
         
+        if "health_calibration" in data:
+            calibration_data = data["health_calibration"].copy()
+            
+            valid_keys = {field.name for field in HealthBarCalibration.__dataclass_fields__.values()}
+            invalid_keys = [key for key in calibration_data.keys() if key not in valid_keys]
+            
+            for key in invalid_keys:
+                del calibration_data[key]
+            
+            calibration = HealthBarCalibration(**calibration_data)
+            schema.health_calibration = calibration if calibration.is_valid() else HealthBarCalibration()
+        
         if "navigation_steps" in data:
             navigation_steps = []
             valid_keys = {field.name for field in NavigationStep.__dataclass_fields__.values()}
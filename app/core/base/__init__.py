@@ -1,7 +1,13 @@
 from .detector_base import DetectorBase
 from .template_manager import TemplateManager
+from .template_store import TemplateStore, get_template_store
+from .template_atlas import TemplateAtlas, get_template_atlas
 
 __all__ = [
     'DetectorBase',
-    'TemplateManager'
+    'TemplateManager',
+    'TemplateStore',
+    'get_template_store',
+    'TemplateAtlas',
+    'get_template_atlas'
 ]
\ No newline at end of file
@@ -2,43 +2,78 @@ import cv2
 import numpy as np
 import logging
 import abc
+from ..processors.buffer_pool import get_buffer_pool, get_frame_cache
+from ..processors.color_lut import get_color_lut
 
 logger = logging.getLogger('PokeXHelper')
 
 class DetectorBase(abc.ABC):
     def __init__(self):
         self.logger = logging.getLogger('PokeXHelper')
+        self.buffer_pool = get_buffer_pool()
+        self.frame_cache = get_frame_cache()
+        self.color_lut = get_color_lut()
+        self._bounds = {}
+        self._kernels = {}
     
     def _validate_image(self, image):
         if image is None:
             self.logger.warning("Cannot process: image is None")
             return False
             
-        np_image = np.array(image)
+        np_image = np.asarray(image)
         if np_image.size == 0:
             self.logger.warning("Cannot process: image is empty")
             return False
             
         return True
     
+    def _buffer(self, name, shape, dtype=np.uint8):
+        """Per-detector scratch buffer from the shared pool, reused across ticks"""
+        return self.buffer_pool.get(f"{type(self).__name__}.{name}", shape, dtype)
+    
     def _convert_to_grayscale(self, image):
-        np_image = np.array(image)
+        np_image = np.asarray(image)
         if len(np_image.shape) == 3:
-            return cv2.cvtColor(np_image, cv2.COLOR_RGB2GRAY)
+            return self.frame_cache.convert(np_image, cv2.COLOR_RGB2GRAY)
         return np_image
     
     def _convert_to_hsv(self, image):
-        np_image = np.array(image)
-        return cv2.cvtColor(np_image, cv2.COLOR_RGB2HSV)
+        return self.frame_cache.convert(image, cv2.COLOR_RGB2HSV)
+    
+    def _classify_colors(self, image):
+        """Colour class flags for every pixel, shared by all detectors reading the same frame"""
+        np_image = np.asarray(image)
+        return self.frame_cache.derive(np_image, "color_classes", np_image.shape[:2],
+                                       lambda source, dst: self.color_lut.classify(source, out=dst))
+    
+    def _class_mask(self, labels, flags, name):
+        return self.color_lut.mask(labels, flags, dst=self._buffer(name, labels.shape))
+    
+    def _apply_morphology(self, mask, kernel_size=(3, 3), name=None):
+        kernel = self._kernels.get(kernel_size)
+        if kernel is None:
+            kernel = self._kernels[kernel_size] = np.ones(kernel_size, np.uint8)
+        
+        if name is None:
+            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
+            return cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+        
+        opened = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel, dst=self._buffer(f"{name}_open", mask.shape))
+        return cv2.morphologyEx(opened, cv2.MORPH_CLOSE, kernel, dst=self._buffer(f"{name}_close", mask.shape))
     
-    def _apply_morphology(self, mask, kernel_size=(3, 3)):
-        kernel = np.ones(kernel_size, np.uint8)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
-        return mask
+    def _create_color_mask(self, hsv_image, lower_bound, upper_bound, name=None):
+        bounds_key = (tuple(lower_bound), tuple(upper_bound))
+        bounds = self._bounds.get(bounds_key)
+        if bounds is None:
+            bounds = self._bounds[bounds_key] = (np.array(lower_bound), np.array(upper_bound))
+        
+        if name is None:
+            return cv2.inRange(hsv_image, bounds[0], bounds[1])
+        return cv2.inRange(hsv_image, bounds[0], bounds[1], dst=self._buffer(name, hsv_image.shape[:2]))
     
-    def _create_color_mask(self, hsv_image, lower_bound, upper_bound):
-        return cv2.inRange(hsv_image, np.array(lower_bound), np.array(upper_bound))
+    def _combine_masks(self, first, second, name):
+        return cv2.bitwise_or(first, second, dst=self._buffer(name, first.shape))
     
     def _calculate_fill_percentage(self, mask):
         total_pixels = mask.shape[0] * mask.shape[1]
@@ -0,0 +1,186 @@
+import os
+import json
+import glob
+import hashlib
+import logging
+import threading
+import cv2
+import numpy as np
+
+logger = logging.getLogger('PokeXHelper')
+
+ATLAS_VERSION = 1
+DEFAULT_SOURCE_DIRS = ("assets/pokemon_templates", "assets/navigation_icons")
+
+class TemplateAtlas:
+    """Every template PNG decoded once and packed into one memory-mapped file.
+
+    The pixels of all BGR templates are concatenated into a flat uint8 .npy
+    that is opened with mmap_mode='r', and a JSON index records each file's
+    offset, shape, mtime, size and content hash. Loading maps the file
+    instead of decoding PNGs, and get() hands out read-only views into the
+    mapping. When the source files no longer match the index the atlas is
+    rebuilt, copying unchanged templates out of the old atlas and decoding
+    only the new or modified ones.
+    """
+    
+    def __init__(self, source_dirs=DEFAULT_SOURCE_DIRS, cache_dir="cache", name="template_atlas"):
+        self.logger = logging.getLogger('PokeXHelper')
+        self.source_dirs = tuple(source_dirs)
+        self.cache_dir = cache_dir
+        self.blob_path = os.path.join(cache_dir, f"{name}.npy")
+        self.index_path = os.path.join(cache_dir, f"{name}.json")
+        
+        self._lock = threading.Lock()
+        self._blob = None
+        self._index = {}
+        self._by_path = {}
+        self.rebuild_count = 0
+    
+    @staticmethod
+    def _key(directory, name):
+        """Index key for a file under a source directory, as that directory is configured.
+        
+        Not made relative to the working directory: that changes the key when the
+        app is started from elsewhere and fails on Windows across drives.
+        """
+        return os.path.normpath(os.path.join(directory, name)).replace(os.sep, "/")
+    
+    def _scan(self):
+        """{index key: (path, mtime_ns, size)} of every PNG in the source directories"""
+        sources = {}
+        for directory in self.source_dirs:
+            for path in sorted(glob.glob(os.path.join(directory, "*.png"))):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                sources[self._key(directory, os.path.basename(path))] = (path, stat.st_mtime_ns, stat.st_size)
+        return sources
+    
+    def _read_index(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+            if index.get('version') == ATLAS_VERSION:
+                return index.get('entries', {})
+            self.logger.debug(f"Ignoring template atlas index with version {index.get('version')}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"Could not read template atlas index {self.index_path}: {e}")
+        return None
+    
+    def _open_blob(self):
+        blob = np.load(self.blob_path, mmap_mode='r')
+        if blob.dtype != np.uint8 or blob.ndim != 1:
+            raise ValueError(f"unexpected atlas layout {blob.dtype} {blob.shape}")
+        return blob
+    
+    def is_stale(self, sources=None, index=None):
+        sources = sources if sources is not None else self._scan()
+        index = index if index is not None else self._read_index()
+        if index is None or set(index) != set(sources):
+            return True
+        return any(index[key]['mtime'] != mtime or index[key]['size'] != size
+                   for key, (_, mtime, size) in sources.items())
+    
+    def load(self, rebuild=True):
+        """Map the atlas, rebuilding it first when it is missing or out of date; returns self"""
+        with self._lock:
+            try:
+                sources = self._scan()
+                index = self._read_index()
+                if self.is_stale(sources, index) or not os.path.exists(self.blob_path):
+                    if not rebuild:
+                        self.logger.info("Template atlas is out of date; falling back to PNG decoding")
+                        return self
+                    index = self._build(sources, index)
+                
+                self._blob = self._open_blob() if index else None
+                self._index = index
+                self._by_path = {os.path.abspath(key): entry for key, entry in index.items()}
+                self.logger.info(f"Template atlas loaded: {len(index)} templates, {self.get_stats()['bytes']} bytes")
+            except Exception as e:
+                self.logger.error(f"Error loading template atlas: {e}")
+                self._blob, self._index, self._by_path = None, {}, {}
+            return self
+    
+    def _build(self, sources, old_index):
+        """Write a new atlas for sources, reusing unchanged pixels from the old one; returns the new index"""
+        old_blob = None
+        if old_index:
+            try:
+                old_blob = self._open_blob()
+            except Exception:
+                old_index = None
+        
+        chunks, entries = [], {}
+        offset = reused = 0
+        for key, (path, mtime, size) in sources.items():
+            old = (old_index or {}).get(key)
+            if old is not None and old['mtime'] == mtime and old['size'] == size:
+                pixels = np.array(old_blob[old['offset']:old['offset'] + old['nbytes']])
+                shape, digest = old['shape'], old['digest']
+                reused += 1
+            else:
+                data = np.fromfile(path, dtype=np.uint8)
+                image = cv2.imdecode(data, cv2.IMREAD_COLOR) if data.size else None
+                if image is None:
+                    self.logger.warning(f"Skipping undecodable template in atlas: {path}")
+                    continue
+                pixels = np.ascontiguousarray(image).ravel()
+                shape, digest = list(image.shape), hashlib.blake2b(data, digest_size=16).hexdigest()
+            
+            entries[key] = {'offset': offset, 'nbytes': int(pixels.size), 'shape': shape,
+                            'mtime': mtime, 'size': size, 'digest': digest}
+            chunks.append(pixels)
+            offset += pixels.size
+        
+        # Release the old mapping before replacing the file underneath it
+        del old_blob
+        self._blob = None
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        blob_temp = f"{self.blob_path}.{os.getpid()}.tmp"
+        index_temp = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(blob_temp, 'wb') as f:
+            np.save(f, np.concatenate(chunks) if chunks else np.zeros(0, np.uint8))
+        with open(index_temp, 'w') as f:
+            json.dump({'version': ATLAS_VERSION, 'sources': list(self.source_dirs), 'entries': entries}, f)
+        os.replace(blob_temp, self.blob_path)
+        os.replace(index_temp, self.index_path)
+        
+        self.rebuild_count += 1
+        self.logger.info(f"Built template atlas: {len(entries)} templates, {len(entries) - reused} decoded, {reused} reused")
+        return entries
+    
+    def get(self, path, mtime=None, size=None):
+        """(read-only BGR view, digest bytes) for path, or None when it is not in the atlas or the file has changed since"""
+        entry = self._by_path.get(os.path.abspath(path))
+        if entry is None or self._blob is None:
+            return None
+        if (mtime is not None and entry['mtime'] != mtime) or (size is not None and entry['size'] != size):
+            return None
+        start = entry['offset']
+        view = np.asarray(self._blob[start:start + entry['nbytes']]).reshape(entry['shape'])
+        return view, bytes.fromhex(entry['digest'])
+    
+    def __contains__(self, path):
+        return os.path.abspath(path) in self._by_path
+    
+    def get_stats(self):
+        return {
+            'templates': len(self._index),
+            'bytes': int(self._blob.size) if self._blob is not None else 0,
+            'rebuilds': self.rebuild_count
+        }
+
+_template_atlas = None
+
+def get_template_atlas():
+    """The shared atlas over the default template folders, loaded (and rebuilt if stale) on first use"""
+    global _template_atlas
+    if _template_atlas is None:
+        _template_atlas = TemplateAtlas().load()
+    return _template_atlas
\ No newline at end of file
@@ -0,0 +1,243 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+import collections
+import cv2
+import numpy as np
+
+logger = logging.getLogger('PokeXHelper')
+
+class _TemplateEntry:
+    def __init__(self, image, mtime, size, digest, checked_at):
+        self.image = image
+        self.mtime = mtime
+        self.size = size
+        self.digest = digest
+        self.checked_at = checked_at
+        self.derived = {}
+        self.nbytes = image.nbytes
+
+class TemplateStore:
+    """Process-wide cache of template images and their derived forms.
+
+    Entries are keyed by absolute path and read flags, and hold the decoded
+    image plus anything computed from it (grayscale, pyramids, normalisation
+    stats). The least recently used entries are evicted once the images and
+    derived forms together exceed max_bytes. A file is re-checked at most
+    every check_interval seconds; a changed mtime or size re-reads it, and
+    the derived forms are dropped only when the content hash differs.
+    Returned arrays are read-only because every caller shares them. With
+    an atlas attached, colour templates that still match it are served as
+    views into its mapping instead of being decoded.
+    """
+    
+    def __init__(self, max_bytes=64 * 1024 * 1024, check_interval=1.0):
+        self.logger = logging.getLogger('PokeXHelper')
+        self.max_bytes = max_bytes
+        self.check_interval = check_interval
+        
+        self._entries = collections.OrderedDict()
+        self._lock = threading.RLock()
+        self.total_bytes = 0
+        self.atlas = None
+        
+        self.hits = 0
+        self.misses = 0
+        self.atlas_loads = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.derived_hits = 0
+        self.derived_misses = 0
+    
+    @staticmethod
+    def _nbytes(value):
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, (list, tuple)):
+            return sum(TemplateStore._nbytes(item) for item in value)
+        return 0
+    
+    @staticmethod
+    def _freeze(value):
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                TemplateStore._freeze(item)
+        return value
+    
+    def _read(self, path, flags):
+        """(image, digest) decoded from the file bytes, or (None, None) when unreadable"""
+        data = np.fromfile(path, dtype=np.uint8)
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        image = cv2.imdecode(data, flags) if data.size else None
+        if image is None:
+            return None, None
+        return self._freeze(image), digest
+    
+    def attach_atlas(self, atlas):
+        """Serve colour templates from a loaded TemplateAtlas when its copy is current"""
+        with self._lock:
+            self.atlas = atlas
+    
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.nbytes
+    
+    def _evict(self, keep_key):
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            if key == keep_key:
+                self._entries.move_to_end(key)
+                continue
+            self._drop(key)
+            self.evictions += 1
+    
+    def _entry(self, path, flags):
+        """Current entry for path, loading or refreshing it as needed; None when the file is missing or unreadable"""
+        key = (os.path.abspath(path), flags)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        
+        if entry is not None and now - entry.checked_at < self.check_interval:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return key, entry
+        
+        try:
+            stat = os.stat(key[0])
+        except OSError:
+            if entry is not None:
+                self._drop(key)
+                self.invalidations += 1
+            return key, None
+        
+        if entry is not None:
+            entry.checked_at = now
+            if stat.st_mtime_ns == entry.mtime and stat.st_size == entry.size:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return key, entry
+        
+        packed = None
+        if self.atlas is not None and flags == cv2.IMREAD_COLOR:
+            packed = self.atlas.get(key[0], stat.st_mtime_ns, stat.st_size)
+        if packed is not None:
+            image, digest = packed
+            self.atlas_loads += 1
+        else:
+            image, digest = self._read(key[0], flags)
+        if image is None:
+            self.logger.error(f"Failed to decode template: {path}")
+            if entry is not None:
+                self._drop(key)
+                self.invalidations += 1
+            return key, None
+        
+        if entry is not None and entry.digest == digest:
+            # Touched but unchanged: keep the derived forms
+            entry.mtime, entry.size = stat.st_mtime_ns, stat.st_size
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return key, entry
+        
+        if entry is not None:
+            self._drop(key)
+            self.invalidations += 1
+            self.logger.debug(f"Template changed on disk, reloaded: {path}")
+        
+        self.misses += 1
+        entry = _TemplateEntry(image, stat.st_mtime_ns, stat.st_size, digest, now)
+        self._entries[key] = entry
+        self.total_bytes += entry.nbytes
+        self._evict(key)
+        return key, entry
+    
+    def get(self, path, flags=cv2.IMREAD_COLOR):
+        """Read-only image for path, or None when it is missing or unreadable"""
+        try:
+            with self._lock:
+                _, entry = self._entry(path, flags)
+                return entry.image if entry is not None else None
+        except Exception as e:
+            self.logger.error(f"Error loading template {path}: {e}")
+            return None
+    
+    def derive(self, path, kind, compute, flags=cv2.IMREAD_COLOR):
+        """Cached compute(image) for path under the hashable kind; dropped with the image when the file changes"""
+        try:
+            with self._lock:
+                key, entry = self._entry(path, flags)
+                if entry is None:
+                    return None
+                if kind in entry.derived:
+                    self.derived_hits += 1
+                    return entry.derived[kind]
+                
+                value = self._freeze(compute(entry.image))
+                entry.derived[kind] = value
+                size = self._nbytes(value)
+                entry.nbytes += size
+                self.total_bytes += size
+                self.derived_misses += 1
+                self._evict(key)
+                return value
+        except Exception as e:
+            self.logger.error(f"Error deriving {kind} for template {path}: {e}")
+            return None
+    
+    def get_gray(self, path):
+        return self.derive(path, 'gray', lambda image: cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+    
+    def get_pyramid(self, path, matcher):
+        """RGB pyramid built by matcher, cached per matcher configuration"""
+        kind = ('rgb_pyramid', matcher.max_levels, matcher.min_template_size)
+        return self.derive(path, kind, lambda image: matcher.build_pyramid(cv2.cvtColor(image, cv2.COLOR_BGR2RGB)))
+    
+    def get_norm_stats(self, path):
+        """(mean, std) of the grayscale template, as used by normalised correlation"""
+        def compute(image):
+            mean, std = cv2.meanStdDev(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+            return float(mean[0, 0]), float(std[0, 0])
+        return self.derive(path, 'norm_stats', compute)
+    
+    def invalidate(self, path=None):
+        """Drop one template, every template under a directory, or everything when path is None"""
+        with self._lock:
+            if path is None:
+                keys = list(self._entries)
+            else:
+                target = os.path.abspath(path)
+                prefix = target.rstrip(os.sep) + os.sep
+                keys = [key for key in self._entries if key[0] == target or key[0].startswith(prefix)]
+            for key in keys:
+                self._drop(key)
+            self.invalidations += len(keys)
+    
+    def get_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'atlas_loads': self.atlas_loads,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'derived_hits': self.derived_hits,
+                'derived_misses': self.derived_misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+_template_store = None
+
+def get_template_store():
+    global _template_store
+    if _template_store is None:
+        _template_store = TemplateStore()
+    return _template_store
\ No newline at end of file
@@ -1,9 +1,13 @@
 from .pokemon_detector import PokemonDetector
 from .health_detector import HealthDetector
 from .battle_detector import BattleDetector
+from .battle_scene import BattleScene
+from .health_calibration import HealthBarCalibrator
 
 __all__ = [
     'PokemonDetector',
     'HealthDetector', 
-    'BattleDetector'
+    'BattleDetector',
+    'BattleScene',
+    'HealthBarCalibrator'
 ]
\ No newline at end of file
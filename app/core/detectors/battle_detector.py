@@ -1,95 +1,178 @@
 import cv2
+import threading
+import collections
 import numpy as np
-import os
-import time
+from app.screen_capture.frame_ring import get_frame_ring
 from ..base.detector_base import DetectorBase
+from ..processors.color_lut import GREEN, WHITE
+from .battle_scene import BattleScene
 
 class BattleDetector(DetectorBase):
-    def __init__(self):
+    def __init__(self, max_cached_scenes=4):
         super().__init__()
+        self.battle_white_ratio = 0.1
+        self.min_bar_area = 50
+        self.min_bar_width = 30
+        self.min_bar_aspect = 2.0
+        self.menu_edge_threshold = 40
+        self.menu_line_length = 31
+        self.menu_line_fill = 0.8
+        self.min_menu_lines = 10
+        self.min_menu_vertical_lines = 2
+        # "hough" until the edge-run thresholds are validated on recorded sessions
+        # (benchmarks/compare_menu_detector.py --sessions ...); "edge_runs" opts in
+        self.menu_detector = "hough"
+        self.max_cached_scenes = max_cached_scenes
+        self._scenes = collections.OrderedDict()
+        self._scene_lock = threading.Lock()
         
     def detect(self, screen_image):
         return self.is_in_battle(screen_image)
     
-    def is_in_battle(self, screen_image):
+    def analyze(self, battle_image, frame_id=None):
+        """BattleScene for this frame, shared by every accessor that asks about the same frame id"""
+        key = self._scene_key(battle_image, frame_id)
+        if key is not None:
+            with self._scene_lock:
+                scene = self._scenes.get(key)
+                if scene is not None:
+                    self._scenes.move_to_end(key)
+                    return scene
+        
+        scene = BattleScene(self, battle_image, frame_id)
+        if key is not None:
+            with self._scene_lock:
+                self._scenes[key] = scene
+                while len(self._scenes) > self.max_cached_scenes:
+                    self._scenes.popitem(last=False)
+        return scene
+    
+    @staticmethod
+    def _scene_key(image, frame_id):
+        if frame_id is not None:
+            return ('frame', frame_id)
+        
+        np_image = np.asarray(image) if image is not None else None
+        if np_image is None or np_image.flags.writeable:
+            return None
+        return ('array', np_image.__array_interface__['data'][0], np_image.shape, np_image.strides)
+    
+    def clear_scenes(self):
+        with self._scene_lock:
+            self._scenes.clear()
+    
+    def is_in_battle(self, screen_image, frame_id=None):
+        return self.analyze(screen_image, frame_id).in_battle
+    
+    def detect_battle_menu(self, screen_image, frame_id=None):
+        return self.analyze(screen_image, frame_id).has_menu
+    
+    def detect_pokemon_health_bars(self, battle_image, frame_id=None):
+        return list(self.analyze(battle_image, frame_id).health_bars)
+    
+    def count_enemy_pokemon(self, battle_image, frame_id=None):
+        return self.analyze(battle_image, frame_id).enemy_count
+    
+    def get_our_pokemon_health(self, battle_image, frame_id=None):
+        return self.analyze(battle_image, frame_id).our_health
+    
+    def has_enemy_pokemon(self, battle_image, frame_id=None):
+        return self.analyze(battle_image, frame_id).has_enemies
+    
+    def _measure_white_ratio(self, screen_image):
         try:
             if not self._validate_image(screen_image):
-                return False
+                return 0.0
             
-            hsv_image = self._convert_to_hsv(screen_image)
+            labels = self._classify_colors(screen_image)
             
-            battle_ui_mask = self._create_color_mask(hsv_image, [0, 0, 200], [180, 50, 255])
+            battle_ui_mask = self._class_mask(labels, WHITE, "battle_ui")
             
             white_ratio = self._calculate_fill_percentage(battle_ui_mask) / 100
+            self.logger.debug(f"Battle detection - white ratio: {white_ratio:.3f}, in_battle: {white_ratio > self.battle_white_ratio}")
             
-            in_battle = white_ratio > 0.1
-            self.logger.debug(f"Battle detection - white ratio: {white_ratio:.3f}, in_battle: {in_battle}")
-            
-            return in_battle
+            return white_ratio
             
         except Exception as e:
             self.logger.error(f"Error detecting battle state: {e}")
-            return False
+            return 0.0
     
-    def detect_battle_menu(self, screen_image):
+    def _detect_menu(self, screen_image):
         try:
             if not self._validate_image(screen_image):
                 return False
             
             gray_image = self._convert_to_grayscale(screen_image)
-            
-            edges = cv2.Canny(gray_image, 50, 150)
-            
-            lines = cv2.HoughLinesP(edges, 1, np.pi/180, threshold=50, minLineLength=30, maxLineGap=10)
-            
-            if lines is not None and len(lines) > 10:
-                self.logger.debug(f"Battle menu detected - found {len(lines)} lines")
-                return True
-            
-            return False
+            if self.menu_detector == "edge_runs":
+                return self._detect_menu_edge_runs(gray_image)
+            return self._detect_menu_hough(gray_image)
             
         except Exception as e:
             self.logger.error(f"Error detecting battle menu: {e}")
             return False
     
-    def detect_pokemon_health_bars(self, battle_image):
+    def _detect_menu_hough(self, gray_image):
+        edges = cv2.Canny(gray_image, 50, 150)
+        lines = cv2.HoughLinesP(edges, 1, np.pi/180, threshold=50, minLineLength=30, maxLineGap=10)
+        
+        if lines is not None and len(lines) > 10:
+            self.logger.debug(f"Battle menu detected - found {len(lines)} lines")
+            return True
+        return False
+    
+    def _detect_menu_edge_runs(self, gray_image):
+        horizontal, vertical = self._count_menu_lines(gray_image)
+        # Health bars alone give long horizontal edges; a menu box also has its vertical borders
+        if horizontal + vertical >= self.min_menu_lines and vertical >= self.min_menu_vertical_lines:
+            self.logger.debug(f"Battle menu detected - found {horizontal} horizontal, {vertical} vertical line segments")
+            return True
+        return False
+    
+    def _count_menu_lines(self, gray_image):
+        """Count (horizontal, vertical) edge runs of at least menu_line_length pixels"""
+        height, width = gray_image.shape[:2]
+        length = self.menu_line_length
+        if height <= length or width <= length:
+            return 0, 0
+        
+        # Menus are drawn with axis-aligned borders, so row and column differences stand in for
+        # Canny + Hough; a box filter along the edge direction finds the runs that are mostly edge
+        min_fill = int(np.ceil(self.menu_line_fill * length))
+        line_counts = []
+        for axis, kernel in ((0, (length, 1)), (1, (1, length))):
+            if axis == 0:
+                first, second = gray_image[1:], gray_image[:-1]
+            else:
+                first, second = gray_image[:, 1:], gray_image[:, :-1]
+            
+            name = f"menu_{'rows' if axis == 0 else 'columns'}"
+            edges = cv2.absdiff(first, second, dst=self._buffer(f"{name}_edges", first.shape))
+            cv2.threshold(edges, self.menu_edge_threshold - 1, 1, cv2.THRESH_BINARY, dst=edges)
+            run_lengths = cv2.boxFilter(edges, cv2.CV_16U, kernel, dst=self._buffer(f"{name}_runs", first.shape, np.uint16),
+                                        normalize=False, borderType=cv2.BORDER_CONSTANT)
+            runs = run_lengths >= min_fill
+            if axis == 1:
+                runs = runs.T
+            
+            # One segment per start of a run along each row (or column)
+            line_counts.append(int(np.count_nonzero(runs[:, 0]) + np.count_nonzero(runs[:, 1:] > runs[:, :-1])))
+        
+        return tuple(line_counts)
+    
+    def _extract_health_bars(self, battle_image):
         try:
             if not self._validate_image(battle_image):
                 return []
             
-            hsv_image = self._convert_to_hsv(battle_image)
+            labels = self._classify_colors(battle_image)
             
-            green_mask = self._create_color_mask(hsv_image, [40, 50, 50], [80, 255, 255])
+            green_mask = self._class_mask(labels, GREEN, "green")
             
             self._save_debug_mask(green_mask, "battle_health_mask")
             
-            green_mask = self._apply_morphology(green_mask)
-            
-            contours, _ = cv2.findContours(green_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            green_mask = self._apply_morphology(green_mask, name="green")
             
-            health_bars = []
-            for contour in contours:
-                area = cv2.contourArea(contour)
-                if area > 50:
-                    x, y, w, h = cv2.boundingRect(contour)
-                    aspect_ratio = w / h
-                    
-                    if aspect_ratio > 2.0 and w > 30:
-                        roi = green_mask[y:y+h, x:x+w]
-                        filled_pixels = cv2.countNonZero(roi)
-                        total_pixels = w * h
-                        health_percentage = (filled_pixels / total_pixels) * 100
-                        
-                        health_bars.append({
-                            'x': x,
-                            'y': y,
-                            'width': w,
-                            'height': h,
-                            'health_percentage': health_percentage,
-                            'area': area
-                        })
-            
-            health_bars.sort(key=lambda bar: bar['y'])
+            health_bars = self._bars_from_mask(green_mask)
             
             self.logger.debug(f"Detected {len(health_bars)} health bars in battle area")
             return health_bars
@@ -98,33 +181,62 @@ class BattleDetector(DetectorBase):
             self.logger.error(f"Error detecting pokemon health bars: {e}", exc_info=True)
             return []
     
-    def count_enemy_pokemon(self, battle_image):
-        health_bars = self.detect_pokemon_health_bars(battle_image)
-        
-        if len(health_bars) <= 1:
-            return 0
-        
-        return len(health_bars) - 1
+    def detect_bars_in_roi(self, battle_image, roi, min_width=4):
+        """Bars inside roi (x1, y1, x2, y2), in battle-area coordinates, down to min_width so nearly empty bars still show"""
+        try:
+            x1, y1, x2, y2 = roi
+            crop = np.asarray(battle_image)[y1:y2, x1:x2]
+            if crop.size == 0:
+                return []
+            
+            labels = self._classify_colors(crop)
+            green_mask = self._class_mask(labels, GREEN, "roi_green")
+            green_mask = self._apply_morphology(green_mask, name="roi_green")
+            
+            health_bars = self._bars_from_mask(green_mask, min_area=min_width, min_width=min_width, min_aspect=0.0)
+            for bar in health_bars:
+                bar['x'] += x1
+                bar['y'] += y1
+            return health_bars
+            
+        except Exception as e:
+            self.logger.error(f"Error detecting health bars in {roi}: {e}")
+            return []
     
-    def get_our_pokemon_health(self, battle_image):
-        health_bars = self.detect_pokemon_health_bars(battle_image)
+    def _bars_from_mask(self, mask, min_area=None, min_width=None, min_aspect=None):
+        """Wide, flat external contours of the mask as bars, sorted top to bottom"""
+        min_area = self.min_bar_area if min_area is None else min_area
+        min_width = self.min_bar_width if min_width is None else min_width
+        min_aspect = self.min_bar_aspect if min_aspect is None else min_aspect
         
-        if not health_bars:
-            return 100.0
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
-        our_pokemon = health_bars[0]
-        return our_pokemon['health_percentage']
-    
-    def has_enemy_pokemon(self, battle_image):
-        return self.count_enemy_pokemon(battle_image) > 0
+        health_bars = []
+        for contour in contours:
+            area = cv2.contourArea(contour)
+            if area > min_area:
+                x, y, w, h = cv2.boundingRect(contour)
+                
+                if w > min_aspect * h and w > min_width:
+                    roi = mask[y:y+h, x:x+w]
+                    filled_pixels = cv2.countNonZero(roi)
+                    total_pixels = w * h
+                    health_percentage = (filled_pixels / total_pixels) * 100
+                    
+                    health_bars.append({
+                        'x': x,
+                        'y': y,
+                        'width': w,
+                        'height': h,
+                        'health_percentage': health_percentage,
+                        'area': area
+                    })
+        
+        health_bars.sort(key=lambda bar: bar['y'])
+        return health_bars
     
     def _save_debug_mask(self, mask, prefix):
         try:
-            debug_dir = "debug_images"
-            if not os.path.exists(debug_dir):
-                os.makedirs(debug_dir)
-            
-            mask_filename = f"{debug_dir}/{prefix}_{time.strftime('%H%M%S')}.png"
-            cv2.imwrite(mask_filename, mask)
+            get_frame_ring().push(prefix, mask)
         except Exception as e:
             self.logger.debug(f"Could not save debug mask: {e}")
\ No newline at end of file
@@ -0,0 +1,70 @@
+class BattleScene:
+    """Everything the battle detector reads from one battle-area frame.
+    
+    Each part is computed on first access and then kept, so asking for the
+    enemy count, our HP and the bar list of the same frame only extracts the
+    bars once, and a frame that is not in battle never pays for bar
+    extraction at all.
+    """
+    
+    def __init__(self, detector, image, frame_id=None):
+        self.detector = detector
+        self.image = image
+        self.frame_id = frame_id
+        self._white_ratio = None
+        self._health_bars = None
+        self._has_menu = None
+    
+    @property
+    def white_ratio(self):
+        if self._white_ratio is None:
+            self._white_ratio = self.detector._measure_white_ratio(self.image)
+        return self._white_ratio
+    
+    @property
+    def in_battle(self):
+        return self.white_ratio > self.detector.battle_white_ratio
+    
+    @property
+    def health_bars(self):
+        """Bars sorted top to bottom; ours is the first one"""
+        if self._health_bars is None:
+            self._health_bars = self.detector._extract_health_bars(self.image)
+        return self._health_bars
+    
+    @property
+    def enemy_count(self):
+        return max(0, len(self.health_bars) - 1)
+    
+    @property
+    def has_enemies(self):
+        return self.enemy_count > 0
+    
+    @property
+    def our_health(self):
+        if not self.health_bars:
+            return 100.0
+        return self.health_bars[0]['health_percentage']
+    
+    @property
+    def enemy_health(self):
+        return [bar['health_percentage'] for bar in self.health_bars[1:]]
+    
+    @property
+    def has_menu(self):
+        if self._has_menu is None:
+            self._has_menu = self.detector._detect_menu(self.image)
+        return self._has_menu
+    
+    def to_dict(self):
+        return {
+            'frame_id': self.frame_id,
+            'in_battle': self.in_battle,
+            'white_ratio': round(self.white_ratio, 3),
+            'enemy_count': self.enemy_count,
+            'our_health': self.our_health,
+            'health_bars': self.health_bars
+        }
+    
+    def __repr__(self):
+        return f"BattleScene(frame_id={self.frame_id}, in_battle={self.in_battle})"
\ No newline at end of file
@@ -0,0 +1,151 @@
+import logging
+import cv2
+import numpy as np
+from app.config.schemas import HealthBarCalibration
+from ..processors.color_lut import get_color_lut, GREEN, RED
+
+logger = logging.getLogger('PokeXHelper')
+
+FILL_CLASSES = GREEN | RED
+
+class HealthBarCalibrator:
+    """Finds the health bar inside the configured area and measures it along a few scanlines.
+    
+    Calibration takes the largest green/red component as the filled part of
+    the bar and follows its rows outwards over pixels of one uniform colour
+    to find the empty part of the track, which gives the full bar width,
+    the fill direction and the empty colour. Without an empty track the
+    fill is only taken as the whole bar when the caller knows the bar is
+    full or the fill spans the area; otherwise calibration is deferred.
+    Measuring then only classifies the calibrated scanlines and finds where
+    the fill ends.
+    """
+    
+    def __init__(self, color_lut=None, color_tolerance=40, min_fill_pixels=20,
+                 scanline_count=3, min_row_agreement=0.7, edge_margin=2):
+        self.logger = logging.getLogger('PokeXHelper')
+        self.color_lut = color_lut or get_color_lut()
+        self.color_tolerance = color_tolerance
+        self.min_fill_pixels = min_fill_pixels
+        self.scanline_count = scanline_count
+        self.min_row_agreement = min_row_agreement
+        self.edge_margin = edge_margin
+        self._kernel = np.ones((3, 3), np.uint8)
+    
+    def calibrate(self, image, area=None, bar_full=False):
+        """Return a HealthBarCalibration for the bar in image, or None if no bar is visible or its full width is unknown"""
+        try:
+            np_image = np.asarray(image)
+            labels = self.color_lut.classify(np_image)
+            fill_mask = self.color_lut.mask(labels, FILL_CLASSES)
+            fill_mask = cv2.morphologyEx(fill_mask, cv2.MORPH_OPEN, self._kernel)
+            
+            count, _, stats, _ = cv2.connectedComponentsWithStats(fill_mask, connectivity=8)
+            if count <= 1:
+                return None
+            
+            largest = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+            x, y, width, height, pixels = (int(value) for value in stats[largest])
+            if pixels < self.min_fill_pixels or width < height:
+                self.logger.debug(f"No horizontal health bar found ({width}x{height}, {pixels} px)")
+                return None
+            
+            rows = sorted({y + max(0, min(height - 1, height * part // 4)) for part in (1, 2, 3)})
+            min_track = max(3, height)
+            
+            right_length, right_color = self._extend_track(np_image, rows, x + width, 1)
+            left_length, left_color = self._extend_track(np_image, rows, x - 1, -1)
+            
+            # A run that reaches the edge of the area is background, not the enclosed empty track
+            right_valid = min_track <= right_length < np_image.shape[1] - (x + width)
+            left_valid = min_track <= left_length < x
+            
+            if right_valid and (not left_valid or right_length >= left_length):
+                direction, bar_x, bar_width, empty_color = "left_to_right", x, width + right_length, right_color
+            elif left_valid:
+                direction, bar_x, bar_width, empty_color = "right_to_left", x - left_length, width + left_length, left_color
+            elif bar_full or (x <= self.edge_margin and x + width >= np_image.shape[1] - self.edge_margin):
+                direction, bar_x, bar_width, empty_color = "left_to_right", x, width, None
+            else:
+                # A partial fill with no visible track would be taken as the full bar and inflate every reading
+                self.logger.debug(f"No empty track next to the {width}px fill, not calibrating yet")
+                return None
+            
+            scanlines = sorted({max(0, min(height - 1, height * (part + 1) // (self.scanline_count + 1)))
+                                for part in range(self.scanline_count)})
+            if area is None:
+                area = (0, 0, np_image.shape[1], np_image.shape[0])
+            
+            calibration = HealthBarCalibration(
+                calibrated=True,
+                area=[int(value) for value in area],
+                x=bar_x,
+                y=y,
+                width=bar_width,
+                height=height,
+                direction=direction,
+                empty_color=[int(value) for value in empty_color] if empty_color is not None else None,
+                scanlines=scanlines
+            )
+            self.logger.info(f"Health bar calibrated: {bar_width}x{height} at ({bar_x},{y}), {direction}, "
+                             f"empty colour {calibration.empty_color}")
+            return calibration
+        
+        except Exception as e:
+            self.logger.error(f"Error calibrating health bar: {e}")
+            return None
+    
+    def _extend_track(self, image, rows, start, step):
+        """Length of the run of one uniform colour next to the fill, agreed on by every row"""
+        if start < 0 or start >= image.shape[1]:
+            return 0, None
+        
+        reference = image[rows[len(rows) // 2], start].astype(np.int16)
+        lengths = []
+        
+        for row in rows:
+            pixels = image[row, start:] if step > 0 else image[row, start::-1]
+            matches = np.abs(pixels.astype(np.int16) - reference).max(axis=-1) <= self.color_tolerance
+            mismatches = np.flatnonzero(~matches)
+            lengths.append(int(mismatches[0]) if mismatches.size else len(pixels))
+        
+        return min(lengths), reference
+    
+    def measure(self, image, calibration):
+        """Health percentage from the calibrated scanlines, or None if the bar no longer looks calibrated"""
+        np_image = np.asarray(image)
+        x, y, width = calibration.x, calibration.y, calibration.width
+        if np_image.ndim != 3 or np_image.shape[0] < y + calibration.height or np_image.shape[1] < x + width:
+            return None
+        
+        scanlines = [y + row for row in calibration.scanlines]
+        rows = np_image[scanlines, x:x + width]
+        if calibration.direction == "right_to_left":
+            rows = rows[:, ::-1]
+        
+        filled = (self.color_lut.classify(rows) & FILL_CLASSES) != 0
+        if calibration.empty_color is None and filled.all() and x + width < np_image.shape[1]:
+            # Calibrated on a full bar: fill running past its end means the bar was wider than it looked
+            beyond = self.color_lut.classify(np_image[scanlines, x + width:x + width + 1]) & FILL_CLASSES
+            if np.count_nonzero(beyond) > len(scanlines) // 2:
+                return None
+        
+        if calibration.empty_color is not None:
+            difference = np.abs(rows.astype(np.int16) - np.array(calibration.empty_color, np.int16)).max(axis=-1)
+            empty = difference <= self.color_tolerance
+        else:
+            empty = ~filled
+        
+        boundaries = []
+        for row_filled, row_empty in zip(filled, empty):
+            filled_indices = np.flatnonzero(row_filled)
+            boundary = int(filled_indices[-1]) + 1 if filled_indices.size else 0
+            
+            fill_agreement = row_filled[:boundary].mean() if boundary else 1.0
+            empty_agreement = row_empty[boundary:].mean() if boundary < width else 1.0
+            if fill_agreement >= self.min_row_agreement and empty_agreement >= self.min_row_agreement:
+                boundaries.append(boundary)
+        
+        if not boundaries:
+            return None
+        return float(np.median(boundaries)) / width * 100
\ No newline at end of file
@@ -1,33 +1,80 @@
-import cv2
-import os
 import time
+from app.screen_capture.frame_ring import get_frame_ring
 from ..base.detector_base import DetectorBase
+from ..processors.color_lut import GREEN, RED
+from .health_calibration import HealthBarCalibrator
 
 class HealthDetector(DetectorBase):
     def __init__(self):
         super().__init__()
+        self.calibrator = HealthBarCalibrator(self.color_lut)
+        self.calibration = None
+        self.calibration_changed = False
+        self.auto_calibrate = True
+        self.max_failed_measurements = 10
+        self.calibration_retry_interval = 2.0
+        self._failed_measurements = 0
+        self._last_calibration_attempt = 0.0
         
     def detect(self, image):
         return self.detect_health_percentage(image)
+    
+    def set_calibration(self, calibration):
+        self.calibration = calibration if calibration is not None and calibration.calibrated else None
+        self._failed_measurements = 0
+    
+    def calibrate(self, image, area=None, bar_full=False):
+        """Locate the bar inside the area and switch to scanline measurement; pass bar_full when HP is known to be full"""
+        self._last_calibration_attempt = time.time()
+        calibration = self.calibrator.calibrate(image, area, bar_full)
+        if calibration is not None:
+            self.set_calibration(calibration)
+            self.calibration_changed = True
+        return calibration
         
-    def detect_health_percentage(self, image):
+    def detect_health_percentage(self, image, area=None):
         try:
             if not self._validate_image(image):
                 return 100
             
-            hsv_image = self._convert_to_hsv(image)
+            if self.calibration is not None and area is not None and not self.calibration.matches_area(area):
+                self.logger.info("Health bar area changed, recalibrating")
+                self.set_calibration(None)
+            
+            if self.calibration is not None:
+                percentage = self.calibrator.measure(image, self.calibration)
+                if percentage is not None:
+                    self._failed_measurements = 0
+                    self.logger.debug(f"Health bar percentage (scanline): {percentage:.1f}%")
+                    return max(0, min(100, percentage))
+                
+                self._failed_measurements += 1
+                if self._failed_measurements >= self.max_failed_measurements:
+                    self.logger.warning("Health bar no longer matches its calibration, recalibrating")
+                    self.set_calibration(None)
             
-            green_mask = self._create_color_mask(hsv_image, [40, 50, 50], [80, 255, 255])
+            percentage = self._detect_from_area(image)
             
-            red_mask1 = self._create_color_mask(hsv_image, [0, 50, 50], [10, 255, 255])
-            red_mask2 = self._create_color_mask(hsv_image, [160, 50, 50], [180, 255, 255])
-            red_mask = red_mask1 | red_mask2
+            if (self.auto_calibrate and self.calibration is None and percentage > 0 and
+                    time.time() - self._last_calibration_attempt >= self.calibration_retry_interval):
+                self.calibrate(image, area)
+            
+            return percentage
+            
+        except Exception as e:
+            self.logger.error(f"Error detecting health bar percentage: {e}", exc_info=True)
+            return 100
+    
+    def _detect_from_area(self, image):
+        """Fill ratio of the whole configured area, used until the bar is calibrated"""
+        try:
+            labels = self._classify_colors(image)
             
-            health_mask = green_mask | red_mask
+            health_mask = self._class_mask(labels, GREEN | RED, "health")
             
             self._save_debug_mask(health_mask, "health_mask")
             
-            health_mask = self._apply_morphology(health_mask)
+            health_mask = self._apply_morphology(health_mask, name="health")
             
             percentage = self._calculate_fill_percentage(health_mask)
             
@@ -35,16 +82,11 @@ class HealthDetector(DetectorBase):
             return max(0, min(100, percentage))
             
         except Exception as e:
-            self.logger.error(f"Error detecting health bar percentage: {e}", exc_info=True)
+            self.logger.error(f"Error measuring health bar area: {e}", exc_info=True)
             return 100
     
     def _save_debug_mask(self, mask, prefix):
         try:
-            debug_dir = "debug_images"
-            if not os.path.exists(debug_dir):
-                os.makedirs(debug_dir)
-            
-            mask_filename = f"{debug_dir}/{prefix}_{time.strftime('%H%M%S')}.png"
-            cv2.imwrite(mask_filename, mask)
+            get_frame_ring().push(prefix, mask)
         except Exception as e:
             self.logger.debug(f"Could not save debug mask: {e}")
\ No newline at end of file
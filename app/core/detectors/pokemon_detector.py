@@ -1,16 +1,18 @@
 import cv2
 import numpy as np
 import time
-import os
 from ..base.detector_base import DetectorBase
 from ..base.template_manager import TemplateManager
 from ..processors.match_processor import MatchProcessor
+from ..processors.batch_matcher import BatchTemplateMatcher
+from app.utils.debug_writer import get_debug_writer
 
 class PokemonDetector(DetectorBase):
     def __init__(self, templates_dir="assets/pokemon_templates"):
         super().__init__()
         self.template_manager = TemplateManager(templates_dir)
         self.match_processor = MatchProcessor()
+        self.batch_matcher = BatchTemplateMatcher()
     
     def detect(self, screen_image, template_name, threshold=0.8):
         return self.detect_pokemon(screen_image, template_name, threshold)
@@ -20,24 +22,20 @@ class PokemonDetector(DetectorBase):
             if not self._validate_image(screen_image):
                 return False, None
                 
-            template = self.template_manager.load_template(template_name)
-            if template is None:
+            template_gray = self.template_manager.get_template_grayscale(template_name)
+            if template_gray is None:
                 return False, None
             
             screen_gray = self._convert_to_grayscale(screen_image)
-            template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
             
             result = cv2.matchTemplate(screen_gray, template_gray, cv2.TM_CCOEFF_NORMED)
-            locations = np.where(result >= threshold)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
             
-            if len(locations[0]) > 0:
-                max_val = np.max(result)
-                max_loc = np.unravel_index(np.argmax(result), result.shape)
-                
+            if max_val >= threshold:
                 self.logger.debug(f"Pokemon {template_name} detected with confidence: {max_val:.3f}")
                 
                 h, w = template_gray.shape
-                match_box = (max_loc[1], max_loc[0], max_loc[1] + w, max_loc[0] + h)
+                match_box = (max_loc[0], max_loc[1], max_loc[0] + w, max_loc[1] + h)
                 
                 return True, match_box
             else:
@@ -48,24 +46,29 @@ class PokemonDetector(DetectorBase):
             self.logger.error(f"Error detecting pokemon {template_name}: {e}", exc_info=True)
             return False, None
     
-    def detect_multiple_pokemon(self, screen_image, template_names, threshold=0.8):
-        detections = {}
-        
-        for template_name in template_names:
-            detected, location = self.detect_pokemon(screen_image, template_name, threshold)
-            detections[template_name] = {
-                'detected': detected,
-                'location': location
-            }
+    def detect_multiple_pokemon(self, screen_image, template_names=None, threshold=0.8):
+        """Match every named template (all available ones if None) in one batch against a single grayscale screen"""
+        if template_names is None:
+            template_names = self.template_manager.get_available_templates()
         
-        return detections
+        try:
+            if not self._validate_image(screen_image):
+                return {name: {'detected': False, 'location': None, 'confidence': 0.0} for name in template_names}
+            
+            screen_gray = self._convert_to_grayscale(screen_image)
+            templates = self.template_manager.get_templates_grayscale(template_names)
+            detections = self.batch_matcher.match_all(screen_gray, templates, threshold)
+            
+            found = [name for name, detection in detections.items() if detection['detected']]
+            self.logger.debug(f"Matched {len(templates)} templates, found: {found}")
+            return detections
+            
+        except Exception as e:
+            self.logger.error(f"Error detecting multiple pokemon: {e}", exc_info=True)
+            return {name: {'detected': False, 'location': None, 'confidence': 0.0} for name in template_names}
     
     def save_detection_debug(self, screen_image, detections, filename_prefix="detection"):
         try:
-            debug_dir = "debug_images"
-            if not os.path.exists(debug_dir):
-                os.makedirs(debug_dir)
-            
             screen_np = np.array(screen_image)
             debug_image = screen_np.copy()
             
@@ -77,10 +80,9 @@ class PokemonDetector(DetectorBase):
                                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
             
             timestamp = time.strftime('%H%M%S')
-            debug_path = f"{debug_dir}/{filename_prefix}_{timestamp}.png"
-            cv2.imwrite(debug_path, cv2.cvtColor(debug_image, cv2.COLOR_RGB2BGR))
-            
-            self.logger.debug(f"Saved detection debug image: {debug_path}")
+            debug_path = f"{filename_prefix}_{timestamp}.png"
+            if get_debug_writer().write("pokemon_detection", debug_image, debug_path, rgb=True):
+                self.logger.debug(f"Queued detection debug image: {debug_path}")
             
         except Exception as e:
             self.logger.error(f"Error saving detection debug: {e}")
\ No newline at end of file
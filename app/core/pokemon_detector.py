@@ -3,13 +3,14 @@ import numpy as np
 import logging
 import os
 import time
+from app.core.base.template_store import get_template_store
 
 logger = logging.getLogger('PokeXHelper')
 
 class PokemonDetector:
     def __init__(self):
         self.logger = logging.getLogger('PokeXHelper')
-        self.template_cache = {}
+        self.template_store = get_template_store()
         self.templates_dir = "assets/pokemon_templates"
         
         if not os.path.exists(self.templates_dir):
@@ -17,28 +18,16 @@ class PokemonDetector:
             self.logger.info(f"Created templates directory: {self.templates_dir}")
     
     def load_template(self, template_name):
-        if template_name in self.template_cache:
-            return self.template_cache[template_name]
-        
         template_path = os.path.join(self.templates_dir, f"{template_name}.png")
         
         if not os.path.exists(template_path):
             self.logger.warning(f"Template not found: {template_path}")
             return None
         
-        try:
-            template = cv2.imread(template_path, cv2.IMREAD_COLOR)
-            if template is None:
-                self.logger.error(f"Failed to load template: {template_path}")
-                return None
-            
-            self.template_cache[template_name] = template
-            self.logger.debug(f"Loaded template: {template_name}")
-            return template
-            
-        except Exception as e:
-            self.logger.error(f"Error loading template {template_name}: {e}")
-            return None
+        template = self.template_store.get(template_path, cv2.IMREAD_COLOR)
+        if template is None:
+            self.logger.error(f"Failed to load template: {template_path}")
+        return template
     
     def detect_pokemon(self, screen_image, template_name, threshold=0.8):
         try:
@@ -49,14 +38,13 @@ class PokemonDetector:
             template = self.load_template(template_name)
             if template is None:
                 return False, None
+            template_gray = self.template_store.get_gray(os.path.join(self.templates_dir, f"{template_name}.png"))
             
             screen_np = np.array(screen_image)
             if len(screen_np.shape) == 3:
                 screen_gray = cv2.cvtColor(screen_np, cv2.COLOR_RGB2GRAY)
             else:
                 screen_gray = screen_np
-                
-            template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
             
             result = cv2.matchTemplate(screen_gray, template_gray, cv2.TM_CCOEFF_NORMED)
             locations = np.where(result >= threshold)
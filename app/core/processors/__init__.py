@@ -1,7 +1,18 @@
 from .image_processor import ImageProcessor
 from .match_processor import MatchProcessor
+from .change_gate import RegionChangeGate
+from .buffer_pool import BufferPool, ConvertedFrameCache
+from .color_lut import ColorClassLUT
+from .batch_matcher import BatchTemplateMatcher
+from .pyramid_matcher import PyramidMatcher
 
 __all__ = [
     'ImageProcessor',
-    'MatchProcessor'
+    'MatchProcessor',
+    'RegionChangeGate',
+    'BufferPool',
+    'ConvertedFrameCache',
+    'ColorClassLUT',
+    'BatchTemplateMatcher',
+    'PyramidMatcher'
 ]
\ No newline at end of file
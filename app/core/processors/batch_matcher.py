@@ -0,0 +1,102 @@
+import os
+import time
+import logging
+import threading
+import concurrent.futures
+import cv2
+import numpy as np
+
+logger = logging.getLogger('PokeXHelper')
+
+class BatchTemplateMatcher:
+    """Matches a whole set of grayscale templates against one prepared screen.
+    
+    The screen is converted once by the caller and each template is reduced
+    to its best score with minMaxLoc instead of thresholding the full
+    result map. matchTemplate releases the GIL, so batches of at least
+    min_parallel templates are spread over a small thread pool.
+    """
+    
+    def __init__(self, max_workers=None, min_parallel=4, method=cv2.TM_CCOEFF_NORMED):
+        self.logger = logging.getLogger('PokeXHelper')
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.min_parallel = min_parallel
+        self.method = method
+        
+        self._executor = None
+        self._lock = threading.Lock()
+        
+        self.batch_count = 0
+        self.template_count = 0
+        self.skipped_count = 0
+        self.total_seconds = 0.0
+    
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="TemplateMatcher")
+            return self._executor
+    
+    def _match_one(self, screen_gray, template_gray):
+        """(best score, top-left of the best match) for one template"""
+        result = cv2.matchTemplate(screen_gray, template_gray, self.method)
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        if self.method in (cv2.TM_SQDIFF, cv2.TM_SQDIFF_NORMED):
+            return 1.0 - min_val, min_loc
+        return max_val, max_loc
+    
+    def match_all(self, screen_gray, templates, threshold=0.8):
+        """Best match of every template; templates maps name to a grayscale image.
+        
+        Returns {name: {'detected', 'location', 'confidence'}} with location as
+        (x1, y1, x2, y2) when detected. Templates larger than the screen are
+        reported as not detected.
+        """
+        start = time.perf_counter()
+        screen_gray = np.ascontiguousarray(screen_gray)
+        screen_height, screen_width = screen_gray.shape[:2]
+        
+        names, jobs = [], []
+        detections = {}
+        for name, template_gray in templates.items():
+            if template_gray is None or template_gray.shape[0] > screen_height or template_gray.shape[1] > screen_width:
+                detections[name] = {'detected': False, 'location': None, 'confidence': 0.0}
+                self.skipped_count += 1
+                continue
+            names.append(name)
+            jobs.append(template_gray)
+        
+        if len(jobs) >= self.min_parallel and self.max_workers > 1:
+            results = self._get_executor().map(lambda template: self._match_one(screen_gray, template), jobs)
+        else:
+            results = (self._match_one(screen_gray, template) for template in jobs)
+        
+        for name, template_gray, (confidence, (x, y)) in zip(names, jobs, results):
+            detected = confidence >= threshold
+            height, width = template_gray.shape[:2]
+            detections[name] = {
+                'detected': detected,
+                'location': (x, y, x + width, y + height) if detected else None,
+                'confidence': float(confidence)
+            }
+        
+        self.batch_count += 1
+        self.template_count += len(jobs)
+        self.total_seconds += time.perf_counter() - start
+        return {name: detections[name] for name in templates}
+    
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+    
+    def get_stats(self):
+        return {
+            'batches': self.batch_count,
+            'templates': self.template_count,
+            'skipped': self.skipped_count,
+            'workers': self.max_workers,
+            'mean_batch_ms': round(self.total_seconds / self.batch_count * 1000, 3) if self.batch_count else 0.0
+        }
\ No newline at end of file
@@ -0,0 +1,194 @@
+import logging
+import threading
+import collections
+import cv2
+import numpy as np
+
+logger = logging.getLogger('PokeXHelper')
+
+class BufferPool:
+    """Preallocated image buffers keyed by name and shape.
+    
+    Named buffers are per thread and live for the life of the pool, so a
+    detector that writes its masks into them with OpenCV dst= outputs stops
+    allocating once every region shape has been seen. Anonymous buffers are
+    handed out with acquire() and returned with release().
+    """
+    
+    def __init__(self, max_free_per_shape=4):
+        self.logger = logging.getLogger('PokeXHelper')
+        self.max_free_per_shape = max_free_per_shape
+        
+        self._lock = threading.Lock()
+        self._named = {}
+        self._free = collections.defaultdict(list)
+        
+        self.allocation_count = 0
+        self.request_count = 0
+        self.tick = None
+        self.tick_count = 0
+        self.tick_allocations = 0
+        self.last_tick_allocations = 0
+        self.max_tick_allocations = 0
+    
+    def _allocate(self, shape, dtype):
+        self.allocation_count += 1
+        self.tick_allocations += 1
+        return np.empty(shape, dtype=dtype)
+    
+    def get(self, name, shape, dtype=np.uint8):
+        """Return the calling thread's scratch buffer for name, reallocating only when the shape changes"""
+        shape = tuple(shape)
+        key = (threading.get_ident(), name, shape, np.dtype(dtype).str)
+        
+        with self._lock:
+            self.request_count += 1
+            buffer = self._named.get(key)
+            if buffer is None:
+                buffer = self._allocate(shape, dtype)
+                self._named[key] = buffer
+            return buffer
+    
+    def acquire(self, shape, dtype=np.uint8):
+        shape = tuple(shape)
+        key = (shape, np.dtype(dtype).str)
+        
+        with self._lock:
+            self.request_count += 1
+            free = self._free.get(key)
+            if free:
+                buffer = free.pop()
+                buffer.flags.writeable = True
+                return buffer
+            return self._allocate(shape, dtype)
+    
+    def release(self, buffer):
+        if buffer is None or buffer.base is not None:
+            return
+        
+        key = (buffer.shape, buffer.dtype.str)
+        with self._lock:
+            free = self._free[key]
+            if len(free) < self.max_free_per_shape:
+                free.append(buffer)
+    
+    def begin_tick(self, tick):
+        """Start counting allocations for a new frame; call once per frame id"""
+        with self._lock:
+            if tick == self.tick:
+                return
+            if self.tick is not None:
+                self.last_tick_allocations = self.tick_allocations
+                self.max_tick_allocations = max(self.max_tick_allocations, self.tick_allocations)
+                self.tick_count += 1
+            self.tick = tick
+            self.tick_allocations = 0
+    
+    def clear(self):
+        with self._lock:
+            self._named.clear()
+            self._free.clear()
+    
+    def get_stats(self):
+        with self._lock:
+            return {
+                'allocations': self.allocation_count,
+                'requests': self.request_count,
+                'ticks': self.tick_count,
+                'last_tick_allocations': self.last_tick_allocations,
+                'max_tick_allocations': self.max_tick_allocations,
+                'named_buffers': len(self._named),
+                'bytes': sum(buffer.nbytes for buffer in self._named.values())
+            }
+
+class ConvertedFrameCache:
+    """Colour conversions of read-only frames, computed once and shared by all detectors.
+    
+    Only read-only arrays are cached (frame bus frames are); writable ones are
+    converted into a new array the caller owns, since a shared scratch buffer
+    would be overwritten by the next conversion of the same shape. Each cache entry
+    holds a reference to its source so the memory cannot be reused while the
+    entry is alive. Returned arrays are read-only and are recycled once they
+    fall out of the cache, so callers must not keep them past the current tick.
+    """
+    
+    def __init__(self, pool, max_entries=8):
+        self.pool = pool
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _key(image, tag):
+        interface = image.__array_interface__
+        return (interface['data'][0], image.shape, image.strides, tag)
+    
+    @staticmethod
+    def _output_shape(image, code):
+        if code in (cv2.COLOR_RGB2GRAY, cv2.COLOR_BGR2GRAY):
+            return image.shape[:2]
+        return image.shape[:2] + (3,)
+    
+    def convert(self, image, code):
+        np_image = np.asarray(image)
+        return self.derive(np_image, code, self._output_shape(np_image, code),
+                           lambda source, dst: cv2.cvtColor(source, code, dst=dst))
+    
+    def derive(self, image, tag, shape, compute):
+        """Cached compute(image, dst) for any per-pixel product of a frame, such as colour class labels"""
+        np_image = np.asarray(image)
+        if np_image.flags.writeable:
+            self.misses += 1
+            return compute(np_image, np.empty(shape, np.uint8))
+        
+        key = self._key(np_image, tag)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        
+        converted = compute(np_image, self.pool.acquire(shape))
+        converted.flags.writeable = False
+        
+        with self._lock:
+            self._entries[key] = (np_image, converted)
+            while len(self._entries) > self.max_entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.pool.release(evicted)
+        return converted
+    
+    def clear(self):
+        with self._lock:
+            for _, converted in self._entries.values():
+                self.pool.release(converted)
+            self._entries.clear()
+    
+    def get_stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'entries': len(self._entries)
+        }
+
+_buffer_pool = None
+_frame_cache = None
+
+def get_buffer_pool():
+    global _buffer_pool
+    if _buffer_pool is None:
+        _buffer_pool = BufferPool()
+    return _buffer_pool
+
+def get_frame_cache():
+    global _frame_cache
+    if _frame_cache is None:
+        _frame_cache = ConvertedFrameCache(get_buffer_pool())
+    return _frame_cache
\ No newline at end of file
@@ -0,0 +1,170 @@
+import cv2
+import time
+import logging
+import threading
+import numpy as np
+
+logger = logging.getLogger('PokeXHelper')
+
+class GateStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+    
+    def to_dict(self):
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': round(self.hit_rate, 3)}
+
+class _RegionState:
+    def __init__(self, thumbnail, shape):
+        self.thumbnail = thumbnail
+        self.shape = shape
+        self.results = {}
+        self.changed_at = time.time()
+        self.last_frame_id = None
+        self.last_changed = True
+
+class RegionChangeGate:
+    """Skips detection on regions that have not changed since the cached result was computed.
+    
+    Each region is reduced to an area-averaged grayscale thumbnail and compared
+    cell by cell against the thumbnail the cached results were computed from.
+    The region counts as changed when more than min_changed_cells cells differ
+    by more than pixel_tolerance, so sensor noise is ignored. Averaging 4x4
+    cells can blur a one-digit change in small text below the tolerance, so
+    text regions read by OCR are compared at full resolution with a lower
+    tolerance through region_settings.
+    """
+    
+    DEFAULT_REGION_SETTINGS = {
+        'coordinate_area': {'scale': 1, 'pixel_tolerance': 8}
+    }
+    
+    def __init__(self, scale=4, pixel_tolerance=12, min_changed_cells=0, max_age=None, region_settings=None):
+        self.logger = logging.getLogger('PokeXHelper')
+        self.scale = scale
+        self.pixel_tolerance = pixel_tolerance
+        self.min_changed_cells = min_changed_cells
+        self.max_age = max_age
+        self.enabled = True
+        self.region_settings = {region: dict(settings) for region, settings in self.DEFAULT_REGION_SETTINGS.items()}
+        for region, settings in (region_settings or {}).items():
+            self.configure_region(region, **settings)
+        
+        self._lock = threading.Lock()
+        self._regions = {}
+        self._stats = {}
+    
+    def configure_region(self, region, scale=None, pixel_tolerance=None):
+        """Override the thumbnail scale and pixel tolerance for one region"""
+        with self._lock:
+            settings = self.region_settings.setdefault(region, {})
+            if scale is not None:
+                settings['scale'] = scale
+            if pixel_tolerance is not None:
+                settings['pixel_tolerance'] = pixel_tolerance
+            self._regions.pop(region, None)
+    
+    def _settings(self, region):
+        settings = self.region_settings.get(region, {})
+        return settings.get('scale', self.scale), settings.get('pixel_tolerance', self.pixel_tolerance)
+    
+    def _thumbnail(self, image, scale):
+        np_image = np.asarray(image)
+        if np_image.ndim == 3:
+            np_image = cv2.cvtColor(np_image, cv2.COLOR_RGB2GRAY)
+        if scale <= 1:
+            return np_image.copy()
+        
+        height, width = np_image.shape[:2]
+        size = (max(1, width // scale), max(1, height // scale))
+        return cv2.resize(np_image, size, interpolation=cv2.INTER_AREA)
+    
+    def check(self, region, image, frame_id=None):
+        """Return True when the region differs from the image its cached results came from"""
+        np_image = np.asarray(image)
+        
+        if frame_id is not None:
+            with self._lock:
+                state = self._regions.get(region)
+                if state is not None and state.last_frame_id == frame_id:
+                    return state.last_changed
+        
+        scale, pixel_tolerance = self._settings(region)
+        thumbnail = self._thumbnail(np_image, scale)
+        
+        with self._lock:
+            state = self._regions.get(region)
+            changed = (
+                state is None or
+                state.shape != np_image.shape or
+                (self.max_age is not None and time.time() - state.changed_at > self.max_age) or
+                state.thumbnail.shape != thumbnail.shape or
+                self._count_changed_cells(state.thumbnail, thumbnail, pixel_tolerance) > self.min_changed_cells
+            )
+            
+            if changed:
+                state = _RegionState(thumbnail, np_image.shape)
+                self._regions[region] = state
+            
+            state.last_frame_id = frame_id
+            state.last_changed = changed
+            return changed
+    
+    def _count_changed_cells(self, previous, current, pixel_tolerance):
+        difference = cv2.absdiff(previous, current)
+        return int(np.count_nonzero(difference > pixel_tolerance))
+    
+    def get_or_compute(self, region, name, image, compute, *args, frame_id=None, **kwargs):
+        """Return the cached result of compute(image, *args) for this region, recomputing only after a change.
+        
+        Pass the frame bus frame_id when several results are read from one frame
+        so the thumbnail comparison runs once per frame instead of once per call.
+        """
+        if not self.enabled or image is None:
+            return compute(image, *args, **kwargs)
+        
+        key = f"{region}:{name}"
+        changed = self.check(region, image, frame_id)
+        
+        with self._lock:
+            stats = self._stats.setdefault(key, GateStats())
+            # invalidate() on another thread can drop the region between check() and here
+            state = self._regions.get(region)
+            if state is not None and not changed and name in state.results:
+                stats.hits += 1
+                return state.results[name]
+            stats.misses += 1
+        
+        result = compute(image, *args, **kwargs)
+        
+        with self._lock:
+            if state is not None and self._regions.get(region) is state:
+                state.results[name] = result
+        return result
+    
+    def invalidate(self, region=None):
+        with self._lock:
+            if region is None:
+                self._regions.clear()
+            else:
+                self._regions.pop(region, None)
+    
+    def get_stats(self):
+        with self._lock:
+            return {key: stats.to_dict() for key, stats in self._stats.items()}
+    
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {}
+    
+    def get_summary(self):
+        with self._lock:
+            hits = sum(stats.hits for stats in self._stats.values())
+            misses = sum(stats.misses for stats in self._stats.values())
+        total = hits + misses
+        return {'hits': hits, 'misses': misses, 'hit_rate': round(hits / total, 3) if total else 0.0}
\ No newline at end of file
@@ -0,0 +1,126 @@
+import os
+import hashlib
+import logging
+import threading
+import cv2
+import numpy as np
+from .buffer_pool import get_buffer_pool
+
+logger = logging.getLogger('PokeXHelper')
+
+BACKGROUND = 0
+GREEN = 1
+RED = 2
+WHITE = 4
+
+DEFAULT_COLOR_RANGES = {
+    GREEN: [((40, 50, 50), (80, 255, 255))],
+    RED: [((0, 50, 50), (10, 255, 255)), ((160, 50, 50), (180, 255, 255))],
+    WHITE: [((0, 0, 200), (180, 50, 255))]
+}
+
+class ColorClassLUT:
+    """Quantised RGB -> colour class table built from the detectors' HSV ranges.
+    
+    Each channel is reduced to `bits` bits and the combined index looks up a
+    byte of class flags, so one table index labels a whole region for every
+    detector at once. Flags are bits rather than exclusive labels because the
+    HSV ranges overlap at their edges. The table is cached on disk keyed by
+    the ranges and bit depth.
+    """
+    
+    def __init__(self, color_ranges=None, bits=6, cache_dir="cache", pool=None):
+        self.logger = logging.getLogger('PokeXHelper')
+        self.pool = pool or get_buffer_pool()
+        self.color_ranges = color_ranges or DEFAULT_COLOR_RANGES
+        self.bits = bits
+        self.cache_dir = cache_dir
+        
+        shift = 8 - bits
+        values = np.arange(256, dtype=np.uint32) >> shift
+        self._channel_tables = (values << (2 * bits), values << bits, values)
+        self._mask_tables = {}
+        self._lock = threading.Lock()
+        
+        self.table = self._load_or_build()
+    
+    def _cache_key(self):
+        ranges = sorted((flag, tuple(ranges)) for flag, ranges in self.color_ranges.items())
+        return hashlib.sha1(repr((self.bits, ranges)).encode()).hexdigest()[:16]
+    
+    def _cache_path(self):
+        return os.path.join(self.cache_dir, f"color_lut_{self._cache_key()}.npy")
+    
+    def _load_or_build(self):
+        path = self._cache_path()
+        size = 1 << (3 * self.bits)
+        
+        try:
+            if os.path.exists(path):
+                table = np.load(path)
+                if table.shape == (size,) and table.dtype == np.uint8:
+                    self.logger.debug(f"Loaded colour lookup table from {path}")
+                    return table
+                self.logger.warning(f"Ignoring colour lookup table with unexpected shape: {path}")
+        except Exception as e:
+            self.logger.warning(f"Could not load colour lookup table {path}: {e}")
+        
+        table = self.build()
+        
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                np.save(f, table)
+            os.replace(temp_path, path)
+            self.logger.debug(f"Saved colour lookup table to {path}")
+        except Exception as e:
+            self.logger.warning(f"Could not save colour lookup table {path}: {e}")
+        return table
+    
+    def build(self):
+        """Classify the centre colour of every quantisation bin with the HSV ranges"""
+        levels = 1 << self.bits
+        step = 1 << (8 - self.bits)
+        centres = (np.arange(levels, dtype=np.uint16) * step + step // 2).astype(np.uint8)
+        
+        r, g, b = np.meshgrid(centres, centres, centres, indexing='ij')
+        rgb = np.stack([r.ravel(), g.ravel(), b.ravel()], axis=-1).reshape(-1, 1, 3)
+        hsv = cv2.cvtColor(rgb, cv2.COLOR_RGB2HSV)
+        
+        table = np.zeros(levels ** 3, dtype=np.uint8)
+        for flag, ranges in self.color_ranges.items():
+            for lower, upper in ranges:
+                in_range = cv2.inRange(hsv, np.array(lower), np.array(upper)).ravel()
+                table[in_range > 0] |= flag
+        return table
+    
+    def classify(self, image, out=None):
+        """Return a uint8 image of class flags for an RGB image"""
+        np_image = np.asarray(image)
+        red_table, green_table, blue_table = self._channel_tables
+        shape = np_image.shape[:2]
+        index = self.pool.get("color_lut_index", shape, np.uint32)
+        channel = self.pool.get("color_lut_channel", shape, np.uint32)
+        
+        np.take(red_table, np_image[..., 0], out=index)
+        index += np.take(green_table, np_image[..., 1], out=channel)
+        index += np.take(blue_table, np_image[..., 2], out=channel)
+        return np.take(self.table, index, out=out)
+    
+    def mask(self, labels, flags, dst=None):
+        """Return a 0/255 mask of the pixels carrying any of the given class flags"""
+        with self._lock:
+            table = self._mask_tables.get(flags)
+            if table is None:
+                table = np.where(np.arange(256) & flags, 255, 0).astype(np.uint8)
+                self._mask_tables[flags] = table
+        return cv2.LUT(labels, table, dst=dst)
+
+_color_lut = None
+
+def get_color_lut():
+    global _color_lut
+    if _color_lut is None:
+        _color_lut = ColorClassLUT()
+    return _color_lut
\ No newline at end of file
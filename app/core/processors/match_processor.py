@@ -5,28 +5,80 @@ import logging
 logger = logging.getLogger('PokeXHelper')
 
 class MatchProcessor:
-    def __init__(self):
+    def __init__(self, peak_radius=None, max_peaks=100):
         self.logger = logging.getLogger('PokeXHelper')
+        self.peak_radius = peak_radius
+        self.max_peaks = max_peaks
+        self._kernels = {}
+    
+    def find_peaks(self, result, threshold, radius=1, max_peaks=None):
+        """(ys, xs, scores) of the local maxima at or above threshold, best first, at most max_peaks"""
+        size = 2 * radius + 1
+        kernel = self._kernels.get(size)
+        if kernel is None:
+            kernel = self._kernels[size] = np.ones((size, size), np.uint8)
+        
+        # A pixel is a peak when it equals the maximum of its neighbourhood
+        is_peak = result >= threshold
+        is_peak &= result >= cv2.dilate(result, kernel)
+        indices = np.flatnonzero(is_peak)
+        scores = result.ravel()[indices]
+        
+        if max_peaks is not None and len(indices) > max_peaks:
+            keep = np.argpartition(scores, -max_peaks)[-max_peaks:]
+            indices, scores = indices[keep], scores[keep]
+        
+        order = np.argsort(scores, kind='stable')[::-1]
+        ys, xs = np.divmod(indices[order], result.shape[1])
+        return ys, xs, scores[order]
+    
+    def non_max_suppression(self, boxes, scores, iou_threshold=0.3):
+        """Indices of the boxes kept by greedy IoU suppression, best score first; boxes is an (N, 4) x1, y1, x2, y2 array"""
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        order = np.argsort(np.asarray(scores), kind='stable')[::-1]
+        areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        
+        keep = []
+        while order.size:
+            best = order[0]
+            keep.append(best)
+            rest = order[1:]
+            
+            overlap_width = np.clip(np.minimum(boxes[best, 2], boxes[rest, 2]) - np.maximum(boxes[best, 0], boxes[rest, 0]), 0, None)
+            overlap_height = np.clip(np.minimum(boxes[best, 3], boxes[rest, 3]) - np.maximum(boxes[best, 1], boxes[rest, 1]), 0, None)
+            overlap = overlap_width * overlap_height
+            union = areas[best] + areas[rest] - overlap
+            iou = np.divide(overlap, union, out=np.zeros_like(overlap), where=union > 0)
+            order = rest[iou <= iou_threshold]
+        
+        return np.array(keep, dtype=np.intp)
+    
+    def find_template_peaks(self, screen_gray, template_gray, threshold=0.8, method=cv2.TM_CCOEFF_NORMED,
+                            max_peaks=None, iou_threshold=0.3):
+        """(boxes, scores) arrays of the separate matches above threshold, best first"""
+        result = cv2.matchTemplate(screen_gray, template_gray, method)
+        h, w = template_gray.shape[:2]
+        radius = self.peak_radius if self.peak_radius is not None else max(1, min(h, w) // 4)
+        
+        ys, xs, scores = self.find_peaks(result, threshold, radius, max_peaks or self.max_peaks)
+        boxes = np.stack([xs, ys, xs + w, ys + h], axis=1).astype(np.int32)
+        
+        if iou_threshold is not None and len(boxes) > 1:
+            keep = self.non_max_suppression(boxes, scores, iou_threshold)
+            boxes, scores = boxes[keep], scores[keep]
+        return boxes, scores
     
     def find_template_matches(self, screen_gray, template_gray, threshold=0.8, method=cv2.TM_CCOEFF_NORMED):
         try:
-            result = cv2.matchTemplate(screen_gray, template_gray, method)
-            locations = np.where(result >= threshold)
+            boxes, scores = self.find_template_peaks(screen_gray, template_gray, threshold, method, iou_threshold=None)
             
             matches = []
-            if len(locations[0]) > 0:
-                for y, x in zip(locations[0], locations[1]):
-                    confidence = result[y, x]
-                    h, w = template_gray.shape
-                    match_box = (x, y, x + w, y + h)
-                    
-                    matches.append({
-                        'box': match_box,
-                        'confidence': confidence,
-                        'center': (x + w // 2, y + h // 2)
-                    })
-                
-                matches.sort(key=lambda m: m['confidence'], reverse=True)
+            for (x1, y1, x2, y2), confidence in zip(boxes.tolist(), scores.tolist()):
+                matches.append({
+                    'box': (x1, y1, x2, y2),
+                    'confidence': confidence,
+                    'center': (x1 + (x2 - x1) // 2, y1 + (y2 - y1) // 2)
+                })
             
             return matches
             
@@ -42,34 +94,6 @@ class MatchProcessor:
         if not matches:
             return matches
         
-        filtered_matches = []
-        matches_sorted = sorted(matches, key=lambda m: m['confidence'], reverse=True)
-        
-        for match in matches_sorted:
-            is_overlapping = False
-            for existing_match in filtered_matches:
-                if self._calculate_overlap(match['box'], existing_match['box']) > overlap_threshold:
-                    is_overlapping = True
-                    break
-            
-            if not is_overlapping:
-                filtered_matches.append(match)
-        
-        return filtered_matches
-    
-    def _calculate_overlap(self, box1, box2):
-        x1_1, y1_1, x2_1, y2_1 = box1
-        x1_2, y1_2, x2_2, y2_2 = box2
-        
-        overlap_x = max(0, min(x2_1, x2_2) - max(x1_1, x1_2))
-        overlap_y = max(0, min(y2_1, y2_2) - max(y1_1, y1_2))
-        overlap_area = overlap_x * overlap_y
-        
-        area1 = (x2_1 - x1_1) * (y2_1 - y1_1)
-        area2 = (x2_2 - x1_2) * (y2_2 - y1_2)
-        union_area = area1 + area2 - overlap_area
-        
-        if union_area == 0:
-            return 0
-        
-        return overlap_area / union_area
\ No newline at end of file
+        boxes = np.array([match['box'] for match in matches])
+        scores = np.array([match['confidence'] for match in matches])
+        return [matches[index] for index in self.non_max_suppression(boxes, scores, overlap_threshold)]
\ No newline at end of file
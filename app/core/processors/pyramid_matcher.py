@@ -0,0 +1,101 @@
+import logging
+import cv2
+import numpy as np
+from .buffer_pool import get_frame_cache
+
+logger = logging.getLogger('PokeXHelper')
+
+class PyramidMatcher:
+    """Coarse-to-fine template matching over Gaussian pyramids.
+    
+    The image and the template are both reduced with pyrDown as far as the
+    template stays at least min_template_size pixels on each side. The
+    coarse match picks up to candidates peaks, and each one is refined at
+    full resolution in a window just larger than the template. Image levels
+    of read-only frames come from the shared frame cache, so every step
+    icon matched against the same minimap frame reuses them.
+    """
+    
+    def __init__(self, max_levels=2, min_template_size=6, candidates=3, refine_margin=2,
+                 coarse_slack=0.25, method=cv2.TM_CCOEFF_NORMED):
+        self.logger = logging.getLogger('PokeXHelper')
+        self.max_levels = max_levels
+        self.min_template_size = min_template_size
+        self.candidates = candidates
+        self.refine_margin = refine_margin
+        self.coarse_slack = coarse_slack
+        self.method = method
+        self.frame_cache = get_frame_cache()
+    
+    def build_pyramid(self, template):
+        """Template levels, full resolution first; cache the result per template"""
+        levels = [np.ascontiguousarray(template)]
+        while len(levels) <= self.max_levels:
+            height, width = levels[-1].shape[:2]
+            if min(height, width) // 2 < self.min_template_size:
+                break
+            levels.append(cv2.pyrDown(levels[-1]))
+        return levels
+    
+    def _image_level(self, image, level):
+        for number in range(1, level + 1):
+            height, width = image.shape[:2]
+            shape = ((height + 1) // 2, (width + 1) // 2) + image.shape[2:]
+            image = self.frame_cache.derive(image, f"pyramid_{number}", shape,
+                                            lambda source, dst: cv2.pyrDown(source, dst=dst))
+        return image
+    
+    def match(self, image, pyramid, threshold=0.8):
+        """(confidence, (x, y)) of the best full-resolution match, with (x, y) None when nothing came close"""
+        image = np.asarray(image)
+        template = pyramid[0]
+        height, width = image.shape[:2]
+        template_height, template_width = template.shape[:2]
+        if template_height > height or template_width > width:
+            return 0.0, None
+        
+        level = len(pyramid) - 1
+        while level > 0 and (pyramid[level].shape[0] > height >> level or pyramid[level].shape[1] > width >> level):
+            level -= 1
+        
+        if level == 0:
+            result = cv2.matchTemplate(image, template, self.method)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            return float(max_val), max_loc
+        
+        coarse = cv2.matchTemplate(self._image_level(image, level), pyramid[level], self.method)
+        scale = 1 << level
+        pad = scale + self.refine_margin
+        coarse_height, coarse_width = pyramid[level].shape[:2]
+        
+        best_val, best_loc = 0.0, None
+        for _ in range(self.candidates):
+            _, coarse_val, _, (coarse_x, coarse_y) = cv2.minMaxLoc(coarse)
+            if coarse_val < threshold - self.coarse_slack:
+                break
+            
+            # Suppress this peak so the next pass finds a different candidate
+            coarse[max(0, coarse_y - coarse_height // 2):coarse_y + coarse_height // 2 + 1,
+                   max(0, coarse_x - coarse_width // 2):coarse_x + coarse_width // 2 + 1] = -1.0
+            
+            x1 = max(0, coarse_x * scale - pad)
+            y1 = max(0, coarse_y * scale - pad)
+            x2 = min(width, coarse_x * scale + template_width + pad)
+            y2 = min(height, coarse_y * scale + template_height + pad)
+            if x2 - x1 < template_width or y2 - y1 < template_height:
+                continue
+            
+            result = cv2.matchTemplate(image[y1:y2, x1:x2], template, self.method)
+            _, max_val, _, (x, y) = cv2.minMaxLoc(result)
+            if best_loc is None or max_val > best_val:
+                best_val, best_loc = float(max_val), (x1 + x, y1 + y)
+        
+        return best_val, best_loc
+
+_pyramid_matcher = None
+
+def get_pyramid_matcher():
+    global _pyramid_matcher
+    if _pyramid_matcher is None:
+        _pyramid_matcher = PyramidMatcher()
+    return _pyramid_matcher
\ No newline at end of file
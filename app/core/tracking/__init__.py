@@ -0,0 +1,13 @@
+from .hp_tracker import HPTracker
+from .battle_state import BattleStateMachine, BattleEvent
+from .enemy_tracker import EnemyTracker, TrackedEnemy
+from .icon_tracker import IconLocationTracker
+
+__all__ = [
+    'HPTracker',
+    'BattleStateMachine',
+    'BattleEvent',
+    'EnemyTracker',
+    'TrackedEnemy',
+    'IconLocationTracker'
+]
\ No newline at end of file
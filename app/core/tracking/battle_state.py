@@ -0,0 +1,185 @@
+import time
+import logging
+import threading
+
+logger = logging.getLogger('PokeXHelper')
+
+IDLE = "idle"
+ENGAGED = "engaged"
+CLEARED = "cleared"
+
+BATTLE_STARTED = "battle_started"
+ENEMY_COUNT_CHANGED = "enemy_count_changed"
+ENEMIES_CLEARED = "enemies_cleared"
+BATTLE_ENDED = "battle_ended"
+
+class BattleEvent:
+    """One transition of the battle state machine"""
+    
+    def __init__(self, kind, state, previous_state, timestamp, enemy_count=0, frame_id=None, duration=None):
+        self.kind = kind
+        self.state = state
+        self.previous_state = previous_state
+        self.timestamp = timestamp
+        self.enemy_count = enemy_count
+        self.frame_id = frame_id
+        self.duration = duration
+    
+    def to_dict(self):
+        return {
+            'kind': self.kind,
+            'state': self.state,
+            'previous_state': self.previous_state,
+            'timestamp': self.timestamp,
+            'enemy_count': self.enemy_count,
+            'frame_id': self.frame_id,
+            'duration': self.duration
+        }
+    
+    def __repr__(self):
+        return f"BattleEvent(kind='{self.kind}', state='{self.state}', enemy_count={self.enemy_count})"
+
+class BattleStateMachine:
+    """Debounced battle state (idle -> engaged -> cleared -> idle) built from per-frame battle readings.
+    
+    Each reading is classified as engaged (battle UI with enemies), cleared
+    (battle UI, no enemies) or idle (no battle UI). The state only follows a
+    reading once it has been seen on at least min_frames frames in a row
+    and for the hold time of that transition, so a single noisy frame can
+    neither start nor win a battle. Transitions are published as
+    BattleEvents to subscribers on the calling thread.
+    """
+    
+    def __init__(self, enter_after=0.5, clear_after=1.0, exit_after=2.0, min_frames=2):
+        self.logger = logging.getLogger('PokeXHelper')
+        self.hold_times = {
+            ENGAGED: enter_after,
+            CLEARED: clear_after,
+            IDLE: exit_after
+        }
+        self.min_frames = min_frames
+        
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        self.state = IDLE
+        self.enemy_count = 0
+        self.state_since = None
+        self.battle_started_at = None
+        self.battles_started = 0
+        self.battles_won = 0
+        self.battles_left = 0
+        self._candidate = None
+        self._candidate_since = None
+        self._candidate_frames = 0
+        self._candidate_enemies = 0
+        self._enemy_frames = 0
+    
+    @property
+    def in_battle(self):
+        return self.state != IDLE
+    
+    def subscribe(self, callback, kinds=None):
+        """Call callback(event) for every event, or only for the event kinds given"""
+        with self._lock:
+            self._subscribers.append((callback, set(kinds) if kinds else None))
+    
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers = [(subscriber, kinds) for subscriber, kinds in self._subscribers
+                                 if subscriber != callback]
+    
+    def _publish(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        
+        for callback, kinds in subscribers:
+            if kinds is not None and event.kind not in kinds:
+                continue
+            try:
+                callback(event)
+            except Exception as e:
+                self.logger.error(f"Error in battle event subscriber for {event.kind}: {e}")
+    
+    def _observe(self, observed, enemy_count, timestamp):
+        """Track how long the current reading has held; returns True once it is stable"""
+        if observed != self._candidate:
+            self._candidate = observed
+            self._candidate_since = timestamp
+            self._candidate_frames = 0
+        self._candidate_frames += 1
+        
+        if enemy_count != self._candidate_enemies:
+            self._candidate_enemies = enemy_count
+            self._enemy_frames = 0
+        self._enemy_frames += 1
+        
+        held = timestamp - self._candidate_since
+        return self._candidate_frames >= self.min_frames and held >= self.hold_times[observed]
+    
+    def update(self, in_battle, enemy_count, timestamp=None, frame_id=None):
+        """Feed one battle reading; returns the events it caused"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        enemy_count = enemy_count if in_battle else 0
+        
+        if not in_battle:
+            observed = IDLE
+        elif enemy_count > 0:
+            observed = ENGAGED
+        else:
+            observed = CLEARED
+        
+        stable = self._observe(observed, enemy_count, timestamp)
+        events = []
+        
+        if stable and observed != self.state and not (self.state == IDLE and observed == CLEARED):
+            events.extend(self._transition(observed, timestamp, frame_id))
+        elif (self.state == ENGAGED and observed == ENGAGED and enemy_count != self.enemy_count
+              and self._enemy_frames >= self.min_frames):
+            self.enemy_count = enemy_count
+            events.append(self._event(ENEMY_COUNT_CHANGED, self.state, timestamp, frame_id))
+        
+        for event in events:
+            self.logger.debug(f"Battle event: {event}")
+            self._publish(event)
+        return events
+    
+    def _transition(self, new_state, timestamp, frame_id):
+        previous_state = self.state
+        self.state = new_state
+        self.state_since = self._candidate_since
+        self.enemy_count = self._candidate_enemies
+        events = []
+        
+        if new_state == ENGAGED:
+            if previous_state == IDLE:
+                self.battle_started_at = self._candidate_since
+                self.battles_started += 1
+                events.append(self._event(BATTLE_STARTED, previous_state, timestamp, frame_id))
+            else:
+                events.append(self._event(ENEMY_COUNT_CHANGED, previous_state, timestamp, frame_id))
+        elif new_state == CLEARED:
+            self.battles_won += 1
+            events.append(self._event(ENEMIES_CLEARED, previous_state, timestamp, frame_id))
+        else:
+            if previous_state == ENGAGED:
+                self.battles_left += 1
+            events.append(self._event(BATTLE_ENDED, previous_state, timestamp, frame_id))
+            self.battle_started_at = None
+        
+        return events
+    
+    def _event(self, kind, previous_state, timestamp, frame_id):
+        duration = timestamp - self.battle_started_at if self.battle_started_at is not None else None
+        return BattleEvent(kind, self.state, previous_state, timestamp, self.enemy_count, frame_id, duration)
+    
+    def get_stats(self):
+        return {
+            'state': self.state,
+            'enemy_count': self.enemy_count,
+            'battles_started': self.battles_started,
+            'battles_won': self.battles_won,
+            'battles_left': self.battles_left
+        }
\ No newline at end of file
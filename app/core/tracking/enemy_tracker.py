@@ -0,0 +1,211 @@
+import time
+import logging
+import collections
+import numpy as np
+
+logger = logging.getLogger('PokeXHelper')
+
+class TrackedEnemy:
+    """One enemy health bar followed across frames"""
+    
+    def __init__(self, enemy_id, bar, timestamp, history_size=120):
+        self.enemy_id = enemy_id
+        self.first_seen = timestamp
+        self.full_width = bar['width']
+        self.hits = 0
+        self.missed = 0
+        self.min_health = 100.0
+        self.history = collections.deque(maxlen=history_size)
+        self.update(bar, timestamp)
+    
+    def update(self, bar, timestamp):
+        self.x = bar['x']
+        self.y = bar['y']
+        self.width = bar['width']
+        self.height = bar['height']
+        self.last_seen = timestamp
+        self.hits += 1
+        self.missed = 0
+        
+        # The green fill shrinks from the right as the enemy loses HP, so the widest bar seen is its full bar
+        self.full_width = max(self.full_width, self.width)
+        self.health = self.width / self.full_width * min(100.0, bar['health_percentage'])
+        self.min_health = min(self.min_health, self.health)
+        self.history.append((timestamp, self.health))
+    
+    @property
+    def bbox(self):
+        return self.x, self.y, self.x + self.full_width, self.y + self.height
+    
+    def get_rate(self, window=2.0):
+        """HP change in percent per second over the last window seconds"""
+        if len(self.history) < 2:
+            return 0.0
+        last_time, last_health = self.history[-1]
+        for timestamp, health in self.history:
+            if timestamp >= last_time - window:
+                break
+        span = last_time - timestamp
+        return (last_health - health) / span if span > 0 else 0.0
+    
+    def to_dict(self):
+        return {
+            'enemy_id': self.enemy_id,
+            'x': self.x,
+            'y': self.y,
+            'width': self.width,
+            'height': self.height,
+            'health': round(self.health, 1),
+            'min_health': round(self.min_health, 1),
+            'hits': self.hits,
+            'missed': self.missed
+        }
+    
+    def __repr__(self):
+        return f"TrackedEnemy(enemy_id={self.enemy_id}, health={self.health:.1f}, at=({self.x}, {self.y}))"
+
+class EnemyTracker:
+    """Gives enemy health bars stable IDs across frames and reports kills.
+    
+    Bars are matched to tracks greedily by the distance between their left
+    ends, which stay put while the fill shrinks. A track that goes unmatched
+    for more than max_missed scans is dropped, and counted as a kill if its
+    HP had fallen to kill_health or below. Between full rescans, detection
+    only needs to cover search_roi(), the box around the known bars.
+    """
+    
+    def __init__(self, max_distance=30, max_missed=2, min_hits=2, kill_health=25.0,
+                 min_new_width=30, roi_margin=16, roi_step=16, rescan_every=4):
+        self.logger = logging.getLogger('PokeXHelper')
+        self.max_distance = max_distance
+        self.max_missed = max_missed
+        self.min_hits = min_hits
+        self.kill_health = kill_health
+        self.min_new_width = min_new_width
+        self.roi_margin = roi_margin
+        self.roi_step = roi_step
+        self.rescan_every = rescan_every
+        
+        self.kills = 0
+        self._next_id = 1
+        self.clear()
+    
+    def clear(self):
+        self.tracks = []
+        self.own_bar = None
+        self.scans_since_rescan = 0
+    
+    @property
+    def confirmed(self):
+        return [track for track in self.tracks if track.hits >= self.min_hits]
+    
+    @property
+    def enemy_count(self):
+        return len(self.confirmed)
+    
+    def get(self, enemy_id):
+        for track in self.tracks:
+            if track.enemy_id == enemy_id:
+                return track
+        return None
+    
+    def search_roi(self, image_shape):
+        """(x1, y1, x2, y2) box around the tracked bars, or None when a full rescan is due"""
+        if not self.tracks or self.scans_since_rescan >= self.rescan_every:
+            return None
+        
+        # Snapped to roi_step so the box keeps the same shape from scan to scan and its pooled buffers are reused
+        boxes = np.array([track.bbox for track in self.tracks])
+        height, width = image_shape[:2]
+        step = self.roi_step
+        x1 = max(0, (int(boxes[:, 0].min()) - self.roi_margin) // step * step)
+        y1 = max(0, (int(boxes[:, 1].min()) - self.roi_margin) // step * step)
+        x2 = min(width, -(-(int(boxes[:, 2].max()) + self.roi_margin) // step) * step)
+        y2 = min(height, -(-(int(boxes[:, 3].max()) + self.roi_margin) // step) * step)
+        if x2 <= x1 or y2 <= y1:
+            return None
+        return x1, y1, x2, y2
+    
+    def _is_own_bar(self, bar):
+        own = self.own_bar
+        if own is None:
+            return False
+        return (bar['x'] < own['x'] + own['width'] and own['x'] < bar['x'] + bar['width'] and
+                bar['y'] < own['y'] + own['height'] and own['y'] < bar['y'] + bar['height'])
+    
+    def update(self, health_bars, timestamp=None, frame_id=None, roi=None):
+        """Match one scan's bars to the tracks.
+        
+        health_bars are as BattleDetector returns them: on a full scan (roi None)
+        the first bar is our own; on a roi scan any bar overlapping our last
+        known bar is ignored, and bars narrower than min_new_width only
+        continue existing tracks. Returns a dict of new, lost and killed tracks.
+        """
+        timestamp = timestamp if timestamp is not None else time.time()
+        if roi is None:
+            self.own_bar = health_bars[0] if health_bars else None
+            bars = list(health_bars[1:])
+            self.scans_since_rescan = 0
+        else:
+            bars = [bar for bar in health_bars if not self._is_own_bar(bar)]
+            self.scans_since_rescan += 1
+        
+        matched_tracks, matched_bars = self._associate(bars)
+        for track_index, bar_index in zip(matched_tracks, matched_bars):
+            self.tracks[track_index].update(bars[bar_index], timestamp)
+        
+        new, lost, killed = [], [], []
+        matched_tracks = set(matched_tracks)
+        remaining = []
+        for index, track in enumerate(self.tracks):
+            if index not in matched_tracks:
+                track.missed += 1
+                if track.missed > self.max_missed:
+                    lost.append(track)
+                    if track.hits >= self.min_hits and track.min_health <= self.kill_health:
+                        killed.append(track)
+                    continue
+            remaining.append(track)
+        
+        matched_bars = set(matched_bars)
+        for index, bar in enumerate(bars):
+            if index not in matched_bars and bar['width'] >= self.min_new_width:
+                track = TrackedEnemy(self._next_id, bar, timestamp)
+                self._next_id += 1
+                remaining.append(track)
+                new.append(track)
+        
+        self.tracks = sorted(remaining, key=lambda track: track.y)
+        self.kills += len(killed)
+        for track in killed:
+            self.logger.debug(f"Enemy {track.enemy_id} defeated after {timestamp - track.first_seen:.1f}s")
+        
+        return {'new': new, 'lost': lost, 'killed': killed, 'frame_id': frame_id}
+    
+    def _associate(self, bars):
+        """Greedy nearest-first matching of bar left ends to track left ends within max_distance"""
+        if not self.tracks or not bars:
+            return [], []
+        
+        track_points = np.array([(track.x, track.y) for track in self.tracks], dtype=np.float32)
+        bar_points = np.array([(bar['x'], bar['y']) for bar in bars], dtype=np.float32)
+        distances = np.linalg.norm(track_points[:, None, :] - bar_points[None, :, :], axis=2)
+        
+        matched_tracks, matched_bars = [], []
+        for flat_index in np.argsort(distances, axis=None):
+            track_index, bar_index = divmod(int(flat_index), len(bars))
+            if distances[track_index, bar_index] > self.max_distance:
+                break
+            if track_index in matched_tracks or bar_index in matched_bars:
+                continue
+            matched_tracks.append(track_index)
+            matched_bars.append(bar_index)
+        return matched_tracks, matched_bars
+    
+    def get_stats(self):
+        return {
+            'tracked': len(self.tracks),
+            'confirmed': self.enemy_count,
+            'kills': self.kills,
+            'next_id': self._next_id
+        }
\ No newline at end of file
@@ -0,0 +1,145 @@
+import math
+import time
+import logging
+import threading
+import numpy as np
+
+logger = logging.getLogger('PokeXHelper')
+
+class HPTracker:
+    """Smoothed HP history with a loss-rate estimate and time-to-threshold prediction.
+    
+    Readings go into fixed-size circular arrays. Each reading is smoothed
+    with an exponential filter whose weight depends on the time since the
+    previous reading, so the smoothing does not change with the scan rate.
+    The rate is the least-squares slope of the smoothed values over the
+    last rate_window seconds.
+    """
+    
+    def __init__(self, capacity=600, time_constant=0.15, rate_window=1.0, min_rate_span=0.2):
+        self.logger = logging.getLogger('PokeXHelper')
+        self.capacity = capacity
+        self.time_constant = time_constant
+        self.rate_window = rate_window
+        self.min_rate_span = min_rate_span
+        
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._raw = np.zeros(capacity, dtype=np.float32)
+        self._smoothed = np.zeros(capacity, dtype=np.float32)
+        self._count = 0
+        self._next = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return self._count
+    
+    def add(self, percentage, timestamp=None):
+        """Record a reading and return the smoothed HP"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        
+        with self._lock:
+            if self._count:
+                last = (self._next - 1) % self.capacity
+                elapsed = timestamp - self._times[last]
+                if elapsed <= 0:
+                    return float(self._smoothed[last])
+                weight = 1.0 - math.exp(-elapsed / self.time_constant) if self.time_constant > 0 else 1.0
+                smoothed = self._smoothed[last] + weight * (percentage - self._smoothed[last])
+            else:
+                smoothed = percentage
+            
+            self._times[self._next] = timestamp
+            self._raw[self._next] = percentage
+            self._smoothed[self._next] = smoothed
+            self._next = (self._next + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+            return float(smoothed)
+    
+    def _ordered(self, array):
+        if self._count < self.capacity:
+            return array[:self._count]
+        return np.concatenate((array[self._next:], array[:self._next]))
+    
+    def get_history(self, seconds=None, smoothed=True):
+        """Return (timestamps, values) arrays, oldest first, optionally limited to the last seconds"""
+        with self._lock:
+            times = self._ordered(self._times).copy()
+            values = self._ordered(self._smoothed if smoothed else self._raw).copy()
+        
+        if seconds is not None and len(times):
+            start = np.searchsorted(times, times[-1] - seconds)
+            times, values = times[start:], values[start:]
+        return times, values
+    
+    @property
+    def level(self):
+        """Latest smoothed HP, or None before the first reading"""
+        with self._lock:
+            if not self._count:
+                return None
+            return float(self._smoothed[(self._next - 1) % self.capacity])
+    
+    @property
+    def last_timestamp(self):
+        with self._lock:
+            if not self._count:
+                return None
+            return float(self._times[(self._next - 1) % self.capacity])
+    
+    def get_rate(self):
+        """HP change in percent per second; negative while HP is being lost"""
+        times, values = self.get_history(self.rate_window)
+        if len(times) < 3 or times[-1] - times[0] < self.min_rate_span:
+            return 0.0
+        
+        offsets = times - times[-1]
+        centred_times = offsets - offsets.mean()
+        denominator = float(np.dot(centred_times, centred_times))
+        if denominator <= 0:
+            return 0.0
+        return float(np.dot(centred_times, values - values.mean()) / denominator)
+    
+    def time_to(self, threshold):
+        """Seconds until the smoothed HP reaches threshold at the current rate; 0 if already below, inf if not falling"""
+        level = self.level
+        if level is None:
+            return math.inf
+        if level <= threshold:
+            return 0.0
+        
+        rate = self.get_rate()
+        if rate >= 0:
+            return math.inf
+        return (level - threshold) / -rate
+    
+    def should_heal(self, threshold, lead_time):
+        """True when HP is predicted to reach threshold within lead_time seconds"""
+        return self.time_to(threshold) <= lead_time
+    
+    def value_at(self, timestamp, smoothed=True):
+        """Reading closest to but not after timestamp, or None when the history does not reach back that far"""
+        times, values = self.get_history(smoothed=smoothed)
+        index = np.searchsorted(times, timestamp, side='right') - 1
+        if index < 0:
+            return None
+        return float(values[index])
+    
+    def change_since(self, timestamp):
+        """Smoothed HP gained (positive) or lost since timestamp"""
+        before = self.value_at(timestamp)
+        level = self.level
+        if before is None or level is None:
+            return None
+        return level - before
+    
+    def clear(self):
+        with self._lock:
+            self._count = 0
+            self._next = 0
+    
+    def get_stats(self):
+        return {
+            'samples': self._count,
+            'level': round(self.level, 2) if self.level is not None else None,
+            'rate': round(self.get_rate(), 3)
+        }
\ No newline at end of file
@@ -0,0 +1,118 @@
+import time
+import logging
+import threading
+
+logger = logging.getLogger('PokeXHelper')
+
+class IconLocationTracker:
+    """Last-seen position and velocity of each minimap icon, used to search a small window first.
+    
+    Positions are template top-left corners in image coordinates. The
+    predicted window grows with the time since the last sighting, and a
+    prior older than max_age is not used. Window and full search timings
+    are kept per outcome so the time saved can be reported.
+    """
+    
+    def __init__(self, margin=12, margin_per_second=20.0, max_speed=200.0, max_age=10.0, smoothing=0.5):
+        self.logger = logging.getLogger('PokeXHelper')
+        self.margin = margin
+        self.margin_per_second = margin_per_second
+        self.max_speed = max_speed
+        self.max_age = max_age
+        self.smoothing = smoothing
+        
+        self._priors = {}
+        self._lock = threading.Lock()
+        self.clear_stats()
+    
+    def clear_stats(self):
+        self.window_hits = 0
+        self.window_misses = 0
+        self.full_searches = 0
+        self.window_seconds = 0.0
+        self.full_seconds = 0.0
+    
+    def forget(self, key=None):
+        with self._lock:
+            if key is None:
+                self._priors.clear()
+            else:
+                self._priors.pop(key, None)
+    
+    def predict(self, key, timestamp=None):
+        """Predicted (x, y) and seconds since the last sighting, or None without a recent prior"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        with self._lock:
+            prior = self._priors.get(key)
+        if prior is None:
+            return None
+        
+        x, y, velocity_x, velocity_y, seen_at = prior
+        elapsed = timestamp - seen_at
+        if elapsed < 0 or elapsed > self.max_age:
+            return None
+        return (x + velocity_x * elapsed, y + velocity_y * elapsed), elapsed
+    
+    def search_window(self, key, template_shape, image_shape, timestamp=None):
+        """(x1, y1, x2, y2) around the predicted position, or None when a full search is needed"""
+        prediction = self.predict(key, timestamp)
+        if prediction is None:
+            return None
+        
+        (x, y), elapsed = prediction
+        template_height, template_width = template_shape[:2]
+        height, width = image_shape[:2]
+        margin = int(self.margin + self.margin_per_second * elapsed)
+        
+        x1 = max(0, int(x) - margin)
+        y1 = max(0, int(y) - margin)
+        x2 = min(width, int(x) + template_width + margin)
+        y2 = min(height, int(y) + template_height + margin)
+        if x2 - x1 < template_width or y2 - y1 < template_height:
+            return None
+        if (x2 - x1) * (y2 - y1) >= width * height // 2:
+            return None
+        return x1, y1, x2, y2
+    
+    def update(self, key, x, y, timestamp=None):
+        """Record a sighting at (x, y) and blend the implied velocity into the prior"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        with self._lock:
+            prior = self._priors.get(key)
+            velocity_x = velocity_y = 0.0
+            if prior is not None:
+                last_x, last_y, last_velocity_x, last_velocity_y, seen_at = prior
+                elapsed = timestamp - seen_at
+                if 0 < elapsed <= self.max_age:
+                    weight = self.smoothing
+                    velocity_x = weight * (x - last_x) / elapsed + (1 - weight) * last_velocity_x
+                    velocity_y = weight * (y - last_y) / elapsed + (1 - weight) * last_velocity_y
+                    velocity_x = max(-self.max_speed, min(self.max_speed, velocity_x))
+                    velocity_y = max(-self.max_speed, min(self.max_speed, velocity_y))
+            self._priors[key] = (x, y, velocity_x, velocity_y, timestamp)
+    
+    def record_window(self, hit, seconds):
+        if hit:
+            self.window_hits += 1
+        else:
+            self.window_misses += 1
+        self.window_seconds += seconds
+    
+    def record_full(self, seconds):
+        self.full_searches += 1
+        self.full_seconds += seconds
+    
+    def get_stats(self):
+        window_tries = self.window_hits + self.window_misses
+        mean_full = self.full_seconds / self.full_searches if self.full_searches else 0.0
+        # Every lookup would have cost a full search; windows that missed paid for both
+        saved = (self.window_hits * mean_full - self.window_seconds) if mean_full else 0.0
+        return {
+            'window_hits': self.window_hits,
+            'window_misses': self.window_misses,
+            'window_hit_rate': round(self.window_hits / window_tries, 3) if window_tries else 0.0,
+            'full_searches': self.full_searches,
+            'mean_window_ms': round(self.window_seconds / window_tries * 1000, 3) if window_tries else 0.0,
+            'mean_full_ms': round(mean_full * 1000, 3),
+            'saved_ms': round(saved * 1000, 1)
+        }
\ No newline at end of file
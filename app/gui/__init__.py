@@ -58,6 +58,34 @@ class PokeXGamesHelper:
     def battle_area_selector(self):
         return self.component_manager.battle_area_selector
     
+    @property
+    def frame_bus(self):
+        return self.component_manager.frame_bus
+    
+    @property
+    def change_gate(self):
+        return self.component_manager.change_gate
+    
+    @property
+    def cooldowns(self):
+        return self.component_manager.cooldowns
+    
+    @property
+    def hp_tracker(self):
+        return self.component_manager.hp_tracker
+    
+    @property
+    def battle_state(self):
+        return self.component_manager.battle_state
+    
+    @property
+    def enemy_tracker(self):
+        return self.component_manager.enemy_tracker
+    
+    @property
+    def input_dispatcher(self):
+        return self.component_manager.input_dispatcher
+    
     @property
     def health_detector(self):
         return self.component_manager.health_detector
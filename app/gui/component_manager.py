@@ -9,23 +9,50 @@ class ComponentManager:
     def _initialize_components(self):
         try:
             from app.screen_capture.area_selector import AreaSelector
+            from app.screen_capture.frame_bus import FrameBus
+            from app.core.processors.change_gate import RegionChangeGate
+            from app.scheduling.cooldowns import CooldownManager
+            from app.core.tracking.hp_tracker import HPTracker
+            from app.core.tracking.battle_state import BattleStateMachine
+            from app.core.tracking.enemy_tracker import EnemyTracker
             from app.core.detectors.health_detector import HealthDetector
             from app.core.detectors.battle_detector import BattleDetector
             from app.navigation.navigation_manager import NavigationManager
             from app.utils.mouse_controller import MouseController
+            from app.utils.input_dispatcher import InputDispatcher
+            from app.core.base.template_store import get_template_store
+            from app.core.base.template_atlas import get_template_atlas
+            
+            # Map every template up front so no PNG is decoded mid-battle
+            get_template_store().attach_atlas(get_template_atlas())
             
             self.health_bar_selector = AreaSelector(None)
             self.minimap_selector = AreaSelector(None)
             self.battle_area_selector = AreaSelector(None)
             
+            self.frame_bus = FrameBus()
+            self.frame_bus.register_region("health_bar", self.health_bar_selector)
+            self.frame_bus.register_region("minimap", self.minimap_selector)
+            self.frame_bus.register_region("battle_area", self.battle_area_selector)
+            self.change_gate = RegionChangeGate()
+            self.cooldowns = CooldownManager()
+            self.hp_tracker = HPTracker()
+            self.battle_state = BattleStateMachine()
+            self.enemy_tracker = EnemyTracker()
+            
             self.health_detector = HealthDetector()
             self.battle_detector = BattleDetector()
             self.mouse_controller = MouseController()
+            self.input_dispatcher = InputDispatcher(self.mouse_controller)
             self.navigation_manager = NavigationManager(
                 self.mouse_controller,
                 self.minimap_selector,
                 settings={}
             )
+            self.navigation_manager.set_frame_bus(self.frame_bus)
+            self.navigation_manager.set_change_gate(self.change_gate)
+            self.navigation_manager.set_cooldowns(self.cooldowns)
+            self.navigation_manager.set_input_dispatcher(self.input_dispatcher)
             
             logger.info("Components initialized successfully")
             
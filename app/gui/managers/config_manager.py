@@ -1,6 +1,7 @@
 import logging
 from typing import Dict, Any, Optional
-from PIL import ImageGrab
+from app.screen_capture.capture_backend import get_capture_backend
+from app.utils.debug_writer import get_debug_writer
 
 logger = logging.getLogger('PokeXHelper')
 
@@ -37,6 +38,7 @@ class ConfigManager:
         self._load_coordinate_area_config_from_schema(schema)
         self._load_navigation_config_from_schema(schema)
         self._load_helper_settings_from_schema(schema)
+        self._load_health_calibration_from_schema(schema)
     
     def _load_legacy_config(self):
         from app.config import load_config
@@ -64,9 +66,8 @@ class ConfigManager:
                         self.main_app.log(f"Loaded {area_name}: ({area_config.x1},{area_config.y1}) to ({area_config.x2},{area_config.y2})")
                         
                         try:
-                            selector.preview_image = ImageGrab.grab(
-                                bbox=(area_config.x1, area_config.y1, area_config.x2, area_config.y2), 
-                                all_screens=True
+                            selector.preview_image = get_capture_backend().grab(
+                                bbox=(area_config.x1, area_config.y1, area_config.x2, area_config.y2)
                             )
                         except Exception as e:
                             logger.warning(f"Could not create preview for {area_name}: {e}")
@@ -107,8 +108,8 @@ class ConfigManager:
                             self.main_app.log(f"Loaded {area_name}: ({x1},{y1}) to ({x2},{y2})")
                             
                             try:
-                                selector.preview_image = ImageGrab.grab(
-                                    bbox=(x1, y1, x2, y2), all_screens=True)
+                                selector.preview_image = get_capture_backend().grab(
+                                    bbox=(x1, y1, x2, y2))
                             except Exception as e:
                                 logger.warning(f"Could not create preview for {area_name}: {e}")
                             
@@ -191,6 +192,8 @@ class ConfigManager:
                 logger.error(f"Error loading navigation config: {e}")
     
     def _load_helper_settings_from_schema(self, schema):
+        self.main_app.scan_interval = schema.advanced_settings.scan_interval
+        get_debug_writer().set_enabled(schema.advanced_settings.debug_enabled)
         try:
             if (hasattr(self.main_app, 'interface_manager') and 
                 hasattr(self.main_app.interface_manager, 'controls_panel')):
@@ -203,7 +206,29 @@ class ConfigManager:
         except Exception as e:
             logger.debug(f"Could not load helper settings: {e}")
     
+    def _load_health_calibration_from_schema(self, schema):
+        try:
+            calibration = schema.health_calibration
+            area = schema.areas_schema.get("health_bar")
+            if not calibration.calibrated or area is None or not area.configured:
+                return
+            
+            if calibration.empty_color is None and calibration.width < (area.x2 - area.x1) - 4:
+                # Saved before partial fills without a track were rejected; its width may be a partial fill
+                logger.info("Saved health bar calibration has no empty track, it will be recalibrated")
+                return
+            
+            if calibration.matches_area((area.x1, area.y1, area.x2, area.y2)):
+                self.main_app.health_detector.set_calibration(calibration)
+                self.main_app.log(f"Loaded health bar calibration: {calibration.width}x{calibration.height} ({calibration.direction})")
+            else:
+                logger.info("Saved health bar calibration is for a different area, it will be recalibrated")
+        except Exception as e:
+            logger.debug(f"Could not load health bar calibration: {e}")
+    
     def _load_helper_settings(self, config):
+        self.main_app.scan_interval = config.get("scan_interval", 0.5)
+        get_debug_writer().set_enabled(config.get("debug_enabled", True))
         try:
             if (hasattr(self.main_app, 'interface_manager') and 
                 hasattr(self.main_app.interface_manager, 'controls_panel')):
@@ -262,6 +287,7 @@ class ConfigManager:
         self._update_helper_settings_in_schema()
         self._update_navigation_in_schema()
         self._update_ui_settings_in_schema()
+        self._update_health_calibration_in_schema()
         
         self._config_core.save_config()
     
@@ -401,6 +427,7 @@ class ConfigManager:
                     helper_settings, advanced_settings = controls_panel.get_settings_for_schema()
                     self._config_core.update_helper_settings(helper_settings)
                     self._config_core.update_advanced_settings(advanced_settings)
+                    get_debug_writer().set_enabled(advanced_settings.debug_enabled)
                 else:
                     helper_settings = HelperSettings()
                     advanced_settings = AdvancedSettings()
@@ -456,6 +483,18 @@ class ConfigManager:
         except Exception as e:
             logger.debug(f"Could not save UI settings: {e}")
     
+    def _update_health_calibration_in_schema(self):
+        if not self._config_core:
+            return
+            
+        from app.config import HealthBarCalibration
+        
+        try:
+            calibration = getattr(self.main_app.health_detector, 'calibration', None)
+            self._config_core.update_health_calibration(calibration or HealthBarCalibration())
+        except Exception as e:
+            logger.debug(f"Could not save health bar calibration: {e}")
+    
     def export_configuration(self, file_path: str) -> bool:
         if self._config_core:
             return self._config_core.export_config(file_path)
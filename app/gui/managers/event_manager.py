@@ -1,6 +1,15 @@
+import os
 import logging
 import threading
 import time
+from app.screen_capture.frame_ring import get_frame_ring
+from app.core.processors.buffer_pool import get_buffer_pool, get_frame_cache
+from app.core.base.template_store import get_template_store
+from app.utils.debug_writer import get_debug_writer
+from app.scheduling.scheduler import TaskScheduler
+from app.scheduling.rate_policy import AdaptiveRatePolicy
+from app.utils.input_dispatcher import PRIORITY_HEAL
+from app.core.tracking.battle_state import BATTLE_STARTED, ENEMY_COUNT_CHANGED, ENEMIES_CLEARED, BATTLE_ENDED
 
 logger = logging.getLogger('PokeXHelper')
 
@@ -13,6 +22,14 @@ class EventManager:
         self.heals_used = 0
         self.steps_completed = 0
         self.battles_won = 0
+        self.session_recorder = None
+        self.pending_heal_check = None
+        self.scheduler = None
+        self.rate_policy = None
+        self.rate_mode = None
+        self.frame_max_age = 0.05
+        self.heal_cooldown = 1.0
+        self.game_latency = 0.3
     
     def start_helper(self):
         if self.running:
@@ -30,7 +47,17 @@ class EventManager:
             self.heals_used = 0
             self.steps_completed = 0
             self.battles_won = 0
+            self.main_app.hp_tracker.clear()
+            self.main_app.battle_state.reset()
+            self.main_app.enemy_tracker.clear()
+            self.main_app.battle_state.subscribe(self._on_battle_event)
             
+            record_dir = os.environ.get("PXG_RECORD_SESSION")
+            if record_dir:
+                from app.session.recorder import SessionRecorder
+                self.start_recording(SessionRecorder.default_path(record_dir))
+            
+            self._create_scheduler()
             self.helper_thread = threading.Thread(target=self._helper_loop, daemon=True)
             self.helper_thread.start()
             
@@ -49,10 +76,16 @@ class EventManager:
         
         try:
             self.running = False
+            if self.scheduler:
+                self.scheduler.stop()
             
             if self.helper_thread and self.helper_thread.is_alive():
                 self.helper_thread.join(timeout=2.0)
             
+            self.main_app.battle_state.unsubscribe(self._on_battle_event)
+            self.main_app.navigation_manager.resume_navigation("battle")
+            self.stop_recording()
+            
             elapsed_time = time.time() - self.start_time if self.start_time else 0
             elapsed_minutes = int(elapsed_time // 60)
             elapsed_seconds = int(elapsed_time % 60)
@@ -61,87 +94,245 @@ class EventManager:
             self.main_app.log(f"Helper stopped - Runtime: {elapsed_minutes}m {elapsed_seconds}s")
             self.main_app.log(f"Session stats - Heals: {self.heals_used}, Steps: {self.steps_completed}, Battles: {self.battles_won}")
             
+            gate_summary = self.main_app.change_gate.get_summary()
+            for name, stats in self.scheduler.get_stats().items():
+                logger.info(f"Task {name}: {stats}")
+            logger.info(f"Input dispatcher: {self.main_app.input_dispatcher.get_stats()}")
+            logger.info(f"Battle state: {self.main_app.battle_state.get_stats()}, enemies: {self.main_app.enemy_tracker.get_stats()}")
+            logger.info(f"Buffer pool: {get_buffer_pool().get_stats()}, frame cache: {get_frame_cache().get_stats()}")
+            logger.info(f"Debug writer: {get_debug_writer().get_stats()}")
+            logger.info(f"Template store: {get_template_store().get_stats()}")
+            self.main_app.log(f"Change gate - Skipped: {gate_summary['hits']}, Detected: {gate_summary['misses']} ({gate_summary['hit_rate']:.0%} skipped)")
+            
         except Exception as e:
             logger.error(f"Error stopping helper: {e}")
             self.main_app.log(f"Error stopping helper: {e}")
         finally:
             self.running = False
     
+    def start_recording(self, path):
+        from app.session.recorder import SessionRecorder
+        
+        if self.session_recorder:
+            self.stop_recording()
+        
+        self.session_recorder = SessionRecorder(path, metadata={
+            'regions': {
+                name: self.main_app.frame_bus.get_region_bbox(name)
+                for name in self.main_app.frame_bus.regions
+            },
+            'step_icon_threshold': self.main_app.navigation_manager.step_icon_threshold
+        })
+        self.session_recorder.start()
+        self.main_app.navigation_manager.set_session_recorder(self.session_recorder)
+        self.main_app.log(f"Recording session to {path}")
+    
+    def stop_recording(self):
+        if not self.session_recorder:
+            return
+        
+        self.main_app.navigation_manager.set_session_recorder(None)
+        self.session_recorder.stop()
+        self.main_app.log(f"Session saved to {self.session_recorder.path}")
+        self.session_recorder = None
+    
+    def _create_scheduler(self):
+        """Health at 10 Hz, battle at 2 Hz, coordinates at 2 Hz only while navigating; rates adapt every 250 ms"""
+        self.rate_policy = AdaptiveRatePolicy(scan_interval=getattr(self.main_app, 'scan_interval', 0.5),
+                                              hp_tracker=self.main_app.hp_tracker)
+        self.rate_mode = None
+        
+        cooldowns = self.main_app.cooldowns
+        cooldowns.set_duration("heal", self.heal_cooldown)
+        
+        self.scheduler = TaskScheduler(cooldowns=cooldowns)
+        self.scheduler.add_task("health", self._check_health, self.rate_policy.health_interval,
+                                priority=3, budget_ms=30, cooldown="heal")
+        self.scheduler.add_task("battle", self._check_battle_state, self.rate_policy.battle_interval,
+                                priority=2, budget_ms=100)
+        # Woken when a step's settle wait ends, so step validation gets a fresh read straight away
+        self.scheduler.add_task("coordinates", self.main_app.navigation_manager.read_coordinates, 0.5,
+                                priority=1, budget_ms=100, cooldown="step_settle", condition=self._needs_coordinates)
+        self.scheduler.add_task("adapt_rates", self._adapt_rates, 0.25)
+    
+    def _adapt_rates(self):
+        if self._is_navigating():
+            self.rate_policy.record_activity()
+        
+        mode, intervals = self.rate_policy.get_intervals()
+        for name, interval in intervals.items():
+            self.scheduler.set_interval(name, interval)
+        
+        if mode != self.rate_mode:
+            logger.debug(f"Check rates switched to {mode}: {intervals}")
+            self.rate_mode = mode
+    
+    def _is_navigating(self):
+        return self.main_app.navigation_manager.is_navigating
+    
+    def _needs_coordinates(self):
+        navigation_manager = self.main_app.navigation_manager
+        return (navigation_manager.is_navigating and navigation_manager.coordinate_validation_enabled
+                and navigation_manager.coordinate_area is not None and navigation_manager.coordinate_area.is_setup())
+    
+    def _get_region(self, name):
+        """Region view from the shared frame, recaptured once it is older than frame_max_age"""
+        region_frame = self.main_app.frame_bus.get_region(name, max_age=self.frame_max_age)
+        if region_frame is None:
+            return None
+        
+        get_buffer_pool().begin_tick(region_frame.frame_id)
+        if self.session_recorder:
+            self.session_recorder.begin_tick(region_frame.frame_id, region_frame.timestamp)
+        return region_frame
+    
     def _helper_loop(self):
+        navigation_manager = self.main_app.navigation_manager
         try:
-            while self.running:
-                self._check_health()
-                self._check_navigation()
-                self._check_battle_state()
-                time.sleep(0.5)
+            navigation_manager.scheduled_coordinates = True
+            self.scheduler.run()
                 
         except Exception as e:
             logger.error(f"Error in helper loop: {e}")
             self.main_app.log(f"Helper error: {e}")
             self.running = False
             self.main_app.update_status("Helper Error", "#dc3545")
+        finally:
+            navigation_manager.scheduled_coordinates = False
     
     def _check_health(self):
         try:
             if not self.main_app.health_bar_selector.is_setup():
                 return
             
-            from PIL import ImageGrab
+            health_frame = self._get_region("health_bar")
+            if health_frame is None:
+                return
             
-            bbox = (
-                self.main_app.health_bar_selector.x1,
-                self.main_app.health_bar_selector.y1,
-                self.main_app.health_bar_selector.x2,
-                self.main_app.health_bar_selector.y2
-            )
+            get_frame_ring().push_region(health_frame)
+            health_detector = self.main_app.health_detector
+            health_percentage = health_detector.detect_health_percentage(health_frame.image, area=health_frame.bbox)
+            if health_detector.calibration_changed:
+                health_detector.calibration_changed = False
+                self.main_app.root.after(0, self.main_app.config_manager.save_configuration)
+            if self.session_recorder:
+                self.session_recorder.record_frame(health_frame)
+                self.session_recorder.record_output("health", health_percentage)
             
-            health_image = ImageGrab.grab(bbox=bbox, all_screens=True)
-            health_percentage = self.main_app.health_detector.detect_health_percentage(health_image)
+            hp_tracker = self.main_app.hp_tracker
+            hp_tracker.add(health_percentage, health_frame.timestamp)
+            self.rate_policy.record_health(health_percentage, health_frame.timestamp)
+            self._verify_last_heal()
             
             threshold = getattr(self.main_app, 'health_threshold', 60)
             auto_heal = getattr(self.main_app, 'auto_heal_enabled', True)
             
-            if auto_heal and health_percentage < threshold:
+            below_threshold = health_percentage < threshold
+            predicted = not below_threshold and hp_tracker.should_heal(threshold, self._heal_lead_time())
+            
+            if auto_heal and (below_threshold or predicted) and self.main_app.cooldowns.is_ready("heal"):
                 heal_key = getattr(self.main_app, 'heal_key', 'F1')
-                from app.utils.keyboard_input import press_key
-                press_key(heal_key)
+                self.main_app.input_dispatcher.press_key(heal_key, priority=PRIORITY_HEAL, deadline=0.5)
+                if self.session_recorder:
+                    self.session_recorder.record_action("press_key", key=heal_key)
                 self.heals_used += 1
-                self.main_app.log(f"Auto-heal triggered (Health: {health_percentage:.1f}%)")
-                time.sleep(1)
+                self.pending_heal_check = (health_percentage, heal_key, health_frame.timestamp)
+                self.main_app.cooldowns.trigger("heal")
+                if predicted:
+                    self.main_app.log(f"Predictive heal triggered (Health: {health_percentage:.1f}%, "
+                                      f"{hp_tracker.get_rate():.1f}%/s, threshold in {hp_tracker.time_to(threshold):.2f}s)")
+                else:
+                    self.main_app.log(f"Auto-heal triggered (Health: {health_percentage:.1f}%)")
                 
         except Exception as e:
             logger.error(f"Error in health check: {e}")
     
-    def _check_navigation(self):
-        try:
-            if hasattr(self.main_app, 'navigation_manager'):
-                if self.main_app.navigation_manager.is_navigating:
-                    return
-        except Exception as e:
-            logger.debug(f"Navigation check error: {e}")
+    def _heal_lead_time(self):
+        """How far ahead a heal must be sent: one health scan, the keyboard queue latency and the game's reaction"""
+        task = self.scheduler.get_task("health") if self.scheduler else None
+        scan_interval = task.interval if task else 0.1
+        input_latency = self.main_app.input_dispatcher.get_latency("keyboard") or 0.0
+        return scan_interval + input_latency + self.game_latency
+    
+    def _verify_last_heal(self):
+        """Dump the frame ring when the previous heal did not raise HP by the end of its cooldown"""
+        if self.pending_heal_check is None or not self.main_app.cooldowns.is_ready("heal"):
+            return
+        
+        health_before, heal_key, healed_at = self.pending_heal_check
+        self.pending_heal_check = None
+        
+        health_change = self.main_app.hp_tracker.change_since(healed_at)
+        health_percentage = self.main_app.hp_tracker.level
+        if health_change is not None and health_change <= 0:
+            logger.warning(f"Heal had no effect: {health_before:.1f}% -> {health_percentage:.1f}%")
+            get_frame_ring().dump("heal_no_effect", {
+                'health_before': health_before,
+                'health_after': health_percentage,
+                'heal_key': heal_key
+            })
     
     def _check_battle_state(self):
         try:
             if not self.main_app.battle_area_selector.is_setup():
                 return
             
-            from PIL import ImageGrab
+            battle_frame = self._get_region("battle_area")
+            if battle_frame is None:
+                return
             
-            bbox = (
-                self.main_app.battle_area_selector.x1,
-                self.main_app.battle_area_selector.y1,
-                self.main_app.battle_area_selector.x2,
-                self.main_app.battle_area_selector.y2
+            get_frame_ring().push_region(battle_frame)
+            scene = self.main_app.change_gate.get_or_compute(
+                "battle_area", "battle_scene", battle_frame.image, self.main_app.battle_detector.analyze,
+                battle_frame.frame_id, frame_id=battle_frame.frame_id
             )
+            in_battle = scene.in_battle
+            enemy_count = self._track_enemies(scene, battle_frame) if in_battle else 0
+            if self.session_recorder:
+                self.session_recorder.record_frame(battle_frame)
+                self.session_recorder.record_output("in_battle", in_battle)
+                if in_battle:
+                    self.session_recorder.record_output("enemy_count", scene.enemy_count)
+                    self.session_recorder.record_output("tracked_enemy_count", enemy_count)
             
-            battle_image = ImageGrab.grab(bbox=bbox, all_screens=True)
-            in_battle = self.main_app.battle_detector.is_in_battle(battle_image)
-            
-            if in_battle:
-                enemy_count = self.main_app.battle_detector.count_enemy_pokemon(battle_image)
-                if enemy_count == 0:
-                    self.battles_won += 1
-                    self.main_app.log(f"Battle won! Total battles won: {self.battles_won}")
+            battle_state = self.main_app.battle_state
+            battle_state.update(in_battle, enemy_count, battle_frame.timestamp, battle_frame.frame_id)
+            self.rate_policy.record_battle(in_battle or battle_state.in_battle, battle_frame.timestamp)
                     
         except Exception as e:
-            logger.debug(f"Battle state check error: {e}")
\ No newline at end of file
+            logger.debug(f"Battle state check error: {e}")
+    
+    def _track_enemies(self, scene, battle_frame):
+        """Follow the enemy bars, scanning only around the known ones between full rescans; returns the enemy count"""
+        enemy_tracker = self.main_app.enemy_tracker
+        roi = enemy_tracker.search_roi(battle_frame.image.shape)
+        if roi is None:
+            health_bars = scene.health_bars
+        else:
+            health_bars = self.main_app.battle_detector.detect_bars_in_roi(battle_frame.image, roi)
+        
+        changes = enemy_tracker.update(health_bars, battle_frame.timestamp, battle_frame.frame_id, roi=roi)
+        for enemy in changes['killed']:
+            self.main_app.log(f"Enemy #{enemy.enemy_id} defeated")
+        if self.session_recorder and (changes['new'] or changes['lost']):
+            self.session_recorder.record_output("enemies", [enemy.to_dict() for enemy in enemy_tracker.tracks])
+        return enemy_tracker.enemy_count
+    
+    def _on_battle_event(self, event):
+        """Pause navigation for the length of a battle and count each cleared battle once"""
+        if self.session_recorder:
+            self.session_recorder.record_output("battle_event", event.to_dict())
+        
+        navigation_manager = self.main_app.navigation_manager
+        if event.kind == BATTLE_STARTED:
+            self.main_app.log(f"Battle started ({event.enemy_count} enemies)")
+            if navigation_manager.is_navigating:
+                navigation_manager.pause_navigation("battle")
+        elif event.kind == ENEMY_COUNT_CHANGED:
+            logger.debug(f"Enemies in battle: {event.enemy_count}")
+        elif event.kind == ENEMIES_CLEARED:
+            self.battles_won += 1
+            self.main_app.log(f"Battle won in {event.duration:.1f}s! Total battles won: {self.battles_won}")
+        elif event.kind == BATTLE_ENDED:
+            self.main_app.enemy_tracker.clear()
+            navigation_manager.resume_navigation("battle")
@@ -115,6 +115,8 @@ class InterfaceManager:
                     self._create_preview_for_selector(selector)
                     if hasattr(self, 'area_config_panel'):
                         self.area_config_panel.update_area_status(selector)
+                        if selector is self.main_app.health_bar_selector:
+                            self.area_config_panel.calibrate_health_bar()
                     self.check_configuration()
                 else:
                     self.log(f"{title} selection cancelled")
@@ -141,13 +143,10 @@ class InterfaceManager:
     def _create_preview_for_selector(self, selector):
         try:
             if selector.is_setup():
-                from PIL import ImageGrab
+                from app.screen_capture.capture_backend import get_capture_backend
                 
                 bbox = (selector.x1, selector.y1, selector.x2, selector.y2)
-                try:
-                    preview_img = ImageGrab.grab(bbox=bbox, all_screens=True)
-                except TypeError:
-                    preview_img = ImageGrab.grab(bbox=bbox)
+                preview_img = get_capture_backend().grab(bbox=bbox)
                 
                 selector.preview_image = preview_img
                 logger.debug(f"Created preview image for selector")
@@ -1,18 +1,15 @@
 import cv2
 import numpy as np
 import re
-import os
 import logging
 import time
+from app.screen_capture.frame_ring import get_frame_ring
 
 logger = logging.getLogger('PokeXHelper')
 
 class EnhancedCoordinateValidator:
     def __init__(self, debug_enabled=True):
         self.debug_enabled = debug_enabled
-        self.debug_dir = "debug_images"
-        if not os.path.exists(self.debug_dir):
-            os.makedirs(self.debug_dir)
     
     def extract_coordinates_from_image(self, image, expected_coords=None):
         """
@@ -53,6 +50,9 @@ class EnhancedCoordinateValidator:
                     return coords
             
             logger.warning("All coordinate extraction methods failed")
+            ring = get_frame_ring()
+            ring.push("coord_source", img_cv)
+            ring.dump("ocr_failed", {'expected_coords': expected_coords})
             return None
             
         except Exception as e:
@@ -71,8 +71,7 @@ class EnhancedCoordinateValidator:
             thresh = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 11, 2)
         
         if self.debug_enabled:
-            debug_path = f"{self.debug_dir}/coord_{method_name}_{timestamp}.png"
-            cv2.imwrite(debug_path, thresh)
+            get_frame_ring().push(f"coord_{method_name}", thresh)
         
         # Use fallback OCR without pytesseract
         text = self._fallback_ocr(thresh)
@@ -94,8 +93,7 @@ class EnhancedCoordinateValidator:
             
             if 0.1 < white_pixels / (white_pixels + black_pixels) < 0.9:
                 if self.debug_enabled and i == 0:
-                    debug_path = f"{self.debug_dir}/coord_{method_name}_{timestamp}.png"
-                    cv2.imwrite(debug_path, binary)
+                    get_frame_ring().push(f"coord_{method_name}", binary)
                 
                 text = self._fallback_ocr(binary)
                 coords = self._robust_coordinate_parsing(text)
@@ -121,8 +119,7 @@ class EnhancedCoordinateValidator:
             coords = self._robust_coordinate_parsing(text)
             if coords:
                 if self.debug_enabled:
-                    debug_path = f"{self.debug_dir}/coord_{method_name}_{timestamp}_t{threshold}.png"
-                    cv2.imwrite(debug_path, cleaned)
+                    get_frame_ring().push(f"coord_{method_name}_t{threshold}", cleaned)
                 return coords
         
         return None
@@ -139,8 +136,7 @@ class EnhancedCoordinateValidator:
         _, binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
         
         if self.debug_enabled:
-            debug_path = f"{self.debug_dir}/coord_{method_name}_{timestamp}.png"
-            cv2.imwrite(debug_path, binary)
+            get_frame_ring().push(f"coord_{method_name}", binary)
         
         text = self._fallback_ocr(binary)
         return self._robust_coordinate_parsing(text)
@@ -163,8 +159,7 @@ class EnhancedCoordinateValidator:
             coords = self._robust_coordinate_parsing(text)
             if coords:
                 if self.debug_enabled:
-                    debug_path = f"{self.debug_dir}/coord_{method_name}_{timestamp}_k{kernel_size[0]}x{kernel_size[1]}.png"
-                    cv2.imwrite(debug_path, processed)
+                    get_frame_ring().push(f"coord_{method_name}_k{kernel_size[0]}x{kernel_size[1]}", processed)
                 return coords
         
         return None
@@ -181,8 +176,7 @@ class EnhancedCoordinateValidator:
         _, binary = cv2.threshold(sharpened, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
         
         if self.debug_enabled:
-            debug_path = f"{self.debug_dir}/coord_{method_name}_{timestamp}.png"
-            cv2.imwrite(debug_path, binary)
+            get_frame_ring().push(f"coord_{method_name}", binary)
         
         text = self._fallback_ocr(binary)
         return self._robust_coordinate_parsing(text)
@@ -201,8 +195,7 @@ class EnhancedCoordinateValidator:
         _, binary = cv2.threshold(combined, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
         
         if self.debug_enabled:
-            debug_path = f"{self.debug_dir}/coord_{method_name}_{timestamp}.png"
-            cv2.imwrite(debug_path, binary)
+            get_frame_ring().push(f"coord_{method_name}", binary)
         
         text = self._fallback_ocr(binary)
         return self._robust_coordinate_parsing(text)
@@ -1,11 +1,15 @@
 import time
-import cv2
 import numpy as np
 import logging
 import os
 import re
 import threading
 import math
+from app.screen_capture.frame_ring import get_frame_ring
+from app.scheduling.cooldowns import CooldownManager
+from app.utils.input_dispatcher import PRIORITY_NAVIGATION
+from app.core.processors.pyramid_matcher import get_pyramid_matcher
+from app.core.tracking.icon_tracker import IconLocationTracker
 from .enhanced_coordinate_validator import EnhancedCoordinateValidator
 
 logger = logging.getLogger('PokeXHelper')
@@ -31,6 +35,24 @@ class NavigationManager:
         
         self.coordinate_area = None
         
+        self.frame_bus = None
+        self.frame_max_age = 0.1
+        self.session_recorder = None
+        self.change_gate = None
+        self.cooldowns = CooldownManager()
+        self.input_dispatcher = None
+        self.click_deadline = 1.0
+        self.step_icon_threshold = 0.7
+        self._region_frame_ids = {}
+        self.scheduled_coordinates = False
+        self.coordinate_wait_timeout = 1.0
+        self._coordinate_reading = (None, 0.0)
+        self._coordinate_ready = threading.Condition()
+        self.icon_tracker = IconLocationTracker()
+        self.pause_reasons = set()
+        self._resumed = threading.Event()
+        self._resumed.set()
+        
         self.coordinate_validator = EnhancedCoordinateValidator(debug_enabled=True)
     
     def set_ui_log_callback(self, callback):
@@ -46,6 +68,105 @@ class NavigationManager:
     def set_coordinate_area(self, coordinate_area_selector):
         """Set the coordinate area selector"""
         self.coordinate_area = coordinate_area_selector
+        if self.frame_bus:
+            self.frame_bus.register_region("coordinate_area", coordinate_area_selector)
+    
+    def set_frame_bus(self, frame_bus):
+        """Share the helper's frame bus so captures come from the same tick"""
+        self.frame_bus = frame_bus
+        self.frame_bus.register_region("minimap", self.minimap_area)
+        if self.coordinate_area:
+            self.frame_bus.register_region("coordinate_area", self.coordinate_area)
+    
+    def set_change_gate(self, change_gate):
+        """Reuse minimap and coordinate results while those regions are unchanged"""
+        self.change_gate = change_gate
+    
+    def set_cooldowns(self, cooldowns):
+        """Share the helper's cooldown manager so step waits are visible to the scheduler"""
+        self.cooldowns = cooldowns
+    
+    def set_input_dispatcher(self, input_dispatcher):
+        """Send clicks through the shared dispatcher so heals can jump ahead of them"""
+        self.input_dispatcher = input_dispatcher
+    
+    def _click(self, x, y):
+        if not self.input_dispatcher:
+            return self.mouse_controller.click_at(x, y)
+        action = self.input_dispatcher.click_at(x, y, priority=PRIORITY_NAVIGATION, deadline=self.click_deadline)
+        return action.wait(timeout=self.click_deadline + 2.0)
+    
+    def _move(self, x, y):
+        if not self.input_dispatcher:
+            return self.mouse_controller.move_to(x, y)
+        action = self.input_dispatcher.move_to(x, y, priority=PRIORITY_NAVIGATION, deadline=self.click_deadline)
+        return action.wait(timeout=self.click_deadline + 2.0)
+    
+    def _wait(self, name, seconds):
+        """Wait on a named cooldown; returns False if navigation was stopped meanwhile"""
+        return self.cooldowns.sleep(name, seconds, should_stop=lambda: self.stop_navigation_flag)
+    
+    @property
+    def is_paused(self):
+        return bool(self.pause_reasons)
+    
+    def pause_navigation(self, reason):
+        """Hold navigation before its next step until every pause reason has been resumed"""
+        if reason not in self.pause_reasons:
+            self.pause_reasons.add(reason)
+            self._resumed.clear()
+            self.logger.info(f"Navigation paused ({reason})")
+    
+    def resume_navigation(self, reason):
+        if reason not in self.pause_reasons:
+            return
+        self.pause_reasons.discard(reason)
+        if not self.pause_reasons:
+            self._resumed.set()
+            self.logger.info(f"Navigation resumed ({reason})")
+    
+    def _wait_until_resumed(self):
+        """Block while navigation is paused; returns False if navigation was stopped meanwhile"""
+        while not self._resumed.wait(timeout=0.1):
+            if self.stop_navigation_flag:
+                return False
+        return not self.stop_navigation_flag
+    
+    def set_session_recorder(self, recorder):
+        """Record navigation frames, outputs and clicks into a session (None to stop)"""
+        self.session_recorder = recorder
+    
+    def _capture_region(self, name, area):
+        """Get the latest image of an area, reusing the shared frame when it is fresh"""
+        return self._capture_region_frame(name, area)[0]
+    
+    def _capture_region_frame(self, name, area):
+        """(image, frame id) of the latest image of an area; the id is None when it was grabbed directly"""
+        if self.frame_bus:
+            region_frame = self.frame_bus.get_region(name, max_age=self.frame_max_age)
+            if region_frame is not None:
+                self._region_frame_ids[name] = region_frame.frame_id
+                get_frame_ring().push_region(region_frame)
+                if self.session_recorder:
+                    self.session_recorder.record_frame(region_frame)
+                return region_frame.image, region_frame.frame_id
+        self._region_frame_ids[name] = None
+        return area.get_current_screenshot_region(), None
+    
+    def _gated(self, region, name, image, compute, frame_id=None):
+        """Run compute(image) through the change gate when one is set"""
+        if not self.change_gate:
+            return compute(image)
+        return self.change_gate.get_or_compute(region, name, image, compute, frame_id=frame_id)
+    
+    def _record_output(self, detector, value, frame_id):
+        """Record an output under the id of the region frame it was computed from"""
+        if self.session_recorder:
+            self.session_recorder.record_output(detector, value, tick=frame_id)
+    
+    def _record_action(self, action, frame_id, **details):
+        if self.session_recorder:
+            self.session_recorder.record_action(action, tick=frame_id, **details)
     
     def add_step(self, name, coordinates="", wait_seconds=3.0):
         from .navigation_step import NavigationStep
@@ -74,6 +195,7 @@ class NavigationManager:
                     self.logger.error(f"Failed to delete icon file: {e}")
             
             self.steps.remove(step)
+            self.icon_tracker.forget(step_id)
             self.logger.info(f"Removing step {step_id}: '{step.name}'")
             self.logger.info(f"Step {step_id} removed, remaining steps: {len(self.steps)}")
     
@@ -85,41 +207,82 @@ class NavigationManager:
             return None
             
         try:
-            minimap_image = self.minimap_area.get_current_screenshot_region()
+            minimap_image, frame_id = self._capture_region_frame("minimap", self.minimap_area)
             if minimap_image is None:
                 return None
             
-            minimap_cv = cv2.cvtColor(np.array(minimap_image), cv2.COLOR_RGB2BGR)
-            
-            result = cv2.matchTemplate(minimap_cv, step.template_image, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            
-            if max_val >= threshold:
-                template_height, template_width = step.template_image.shape[:2]
-                center_x = max_loc[0] + template_width // 2
-                center_y = max_loc[1] + template_height // 2
-                
-                minimap_x = self.minimap_area.x1 + center_x
-                minimap_y = self.minimap_area.y1 + center_y
-                
-                return (minimap_x, minimap_y, max_val)
+            location = self._gated("minimap", f"step_{step.step_id}_{threshold}", minimap_image,
+                                   lambda image: self.locate_step_icon(step, image, threshold=threshold), frame_id)
+            self._record_output(f"step_icon_{step.step_id}", location, frame_id)
+            self._record_output(f"step_icon_{step.step_id}_threshold", threshold, frame_id)
+            return location
             
         except Exception as e:
             self.logger.error(f"Error finding step icon: {e}")
         
         return None
     
+    def locate_step_icon(self, step, minimap_image, origin=None, threshold=0.8):
+        """Match a step icon in an RGB minimap image and return screen (x, y, confidence)"""
+        if step.template_image is None:
+            return None
+        
+        if origin is None:
+            origin = (self.minimap_area.x1, self.minimap_area.y1)
+        
+        max_val, max_loc = self._search_step_icon(step, np.asarray(minimap_image), threshold)
+        
+        if max_loc is not None and max_val >= threshold:
+            template_height, template_width = step.template_image.shape[:2]
+            center_x = max_loc[0] + template_width // 2
+            center_y = max_loc[1] + template_height // 2
+            
+            minimap_x = origin[0] + center_x
+            minimap_y = origin[1] + center_y
+            
+            return (minimap_x, minimap_y, float(max_val))
+        
+        return None
+    
+    def _search_step_icon(self, step, minimap_image, threshold):
+        """Search the window predicted from the icon's last sighting first and the whole minimap only on a miss"""
+        # The pyramid holds the template in RGB, so the minimap is matched without a colour conversion
+        matcher = get_pyramid_matcher()
+        pyramid = step.get_template_pyramid(matcher)
+        now = time.time()
+        
+        window = self.icon_tracker.search_window(step.step_id, pyramid[0].shape, minimap_image.shape, now)
+        if window is not None:
+            x1, y1, x2, y2 = window
+            start = time.perf_counter()
+            max_val, max_loc = matcher.match(minimap_image[y1:y2, x1:x2], pyramid, threshold)
+            hit = max_loc is not None and max_val >= threshold
+            self.icon_tracker.record_window(hit, time.perf_counter() - start)
+            if hit:
+                max_loc = (x1 + max_loc[0], y1 + max_loc[1])
+                self.icon_tracker.update(step.step_id, max_loc[0], max_loc[1], now)
+                return max_val, max_loc
+        
+        start = time.perf_counter()
+        max_val, max_loc = matcher.match(minimap_image, pyramid, threshold)
+        self.icon_tracker.record_full(time.perf_counter() - start)
+        if max_loc is not None and max_val >= threshold:
+            self.icon_tracker.update(step.step_id, max_loc[0], max_loc[1], now)
+        return max_val, max_loc
+    
     def extract_coordinates_from_coordinate_area(self):
         """Extract coordinates using enhanced validator"""
         if not self.coordinate_area or not self.coordinate_area.is_setup():
             return None
         
         try:
-            coord_image = self.coordinate_area.get_current_screenshot_region()
+            coord_image, frame_id = self._capture_region_frame("coordinate_area", self.coordinate_area)
             if coord_image is None:
                 return None
             
-            coordinates = self.coordinate_validator.extract_coordinates_from_image(coord_image)
+            coordinates = self._gated("coordinate_area", "coordinates", coord_image,
+                                      self.coordinate_validator.extract_coordinates_from_image, frame_id)
+            self._record_output("coordinates", coordinates, frame_id)
             
             if coordinates:
                 self.logger.debug(f"Extracted coordinates: {coordinates}")
@@ -132,6 +295,31 @@ class NavigationManager:
             self.logger.error(f"Error extracting coordinates from coordinate area: {e}")
             return None
     
+    def read_coordinates(self):
+        """Scheduled coordinate read while navigating; publishes the result to wait_for_coordinates()"""
+        started = time.perf_counter()
+        coordinates = self.extract_coordinates_from_coordinate_area()
+        with self._coordinate_ready:
+            self._coordinate_reading = (coordinates, started)
+            self._coordinate_ready.notify_all()
+        return coordinates
+    
+    def wait_for_coordinates(self, since):
+        """Coordinates from the first scheduled read that started after since; reads directly when none is scheduled"""
+        if not self.scheduled_coordinates:
+            return self.extract_coordinates_from_coordinate_area()
+        
+        with self._coordinate_ready:
+            fresh = self._coordinate_ready.wait_for(
+                lambda: self._coordinate_reading[1] >= since or self.stop_navigation_flag,
+                timeout=self.coordinate_wait_timeout
+            )
+            if fresh and self._coordinate_reading[1] >= since:
+                return self._coordinate_reading[0]
+        
+        self.logger.debug("No scheduled coordinate read in time, reading directly")
+        return self.extract_coordinates_from_coordinate_area()
+    
     def parse_coordinates(self, coord_string):
         """Parse coordinate string and return (x, y, z) tuple"""
         if not coord_string or not isinstance(coord_string, str):
@@ -190,37 +378,42 @@ class NavigationManager:
                 attempt_msg = f" (attempt {attempt + 1}/{max_retries})" if max_retries > 1 else ""
                 self.logger.info(f" Executing step {step.step_id}: '{step.name}'{attempt_msg}")
                 
-                location = self.find_step_icon_in_minimap(step, threshold=0.7)
+                location = self.find_step_icon_in_minimap(step, threshold=self.step_icon_threshold)
                 if not location:
                     self.logger.warning(f" Step {step.step_id} icon not found in minimap{attempt_msg}")
                     if attempt < max_retries - 1:
                         self.logger.info(f" Retrying step {step.step_id} in 2 seconds...")
-                        time.sleep(2)
+                        if not self._wait("navigation_retry", 2):
+                            return False
                         continue
                     return False
                     
                 x, y, confidence = location
                 self.logger.info(f" Found step {step.step_id} icon at ({x}, {y}) with {confidence:.1%} confidence{attempt_msg}")
                 
-                if self.mouse_controller.click_at(x, y):
+                # Tagged with the minimap frame the icon was just found in
+                self._record_action("click", self._region_frame_ids.get("minimap"), x=x, y=y, step_id=step.step_id)
+                if self._click(x, y):
                     self.logger.info(f" Clicked at ({x}, {y}) for step {step.step_id}{attempt_msg}")
                     
                     screen_width = 3440
                     screen_height = 1440
                     center_x = screen_width // 2
                     center_y = screen_height // 2
-                    self.mouse_controller.move_to(center_x, center_y)
+                    self._move(center_x, center_y)
                     self.logger.info(f" Moved mouse to screen center ({center_x}, {center_y})")
                     
                     self.logger.info(f" Waiting {step.wait_seconds} seconds for step completion")
-                    time.sleep(step.wait_seconds)
+                    if not self._wait(f"step_{step.step_id}", step.wait_seconds):
+                        return False
                     
                     validation_result = self.validate_step_completion(step)
                     if validation_result:
                         return True
                     elif attempt < max_retries - 1:
                         self.logger.warning(f" Step {step.step_id} validation failed, retrying...")
-                        time.sleep(1)
+                        if not self._wait("navigation_retry", 1):
+                            return False
                         continue
                     else:
                         self.logger.error(f" Step {step.step_id} validation failed after {max_retries} attempts")
@@ -229,7 +422,8 @@ class NavigationManager:
                     self.logger.error(f" Failed to click at ({x}, {y}) for step {step.step_id}{attempt_msg}")
                     if attempt < max_retries - 1:
                         self.logger.info(f" Retrying click for step {step.step_id}...")
-                        time.sleep(1)
+                        if not self._wait("navigation_retry", 1):
+                            return False
                         continue
                     return False
                     
@@ -237,7 +431,8 @@ class NavigationManager:
                 self.logger.error(f"Error executing step {step.step_id}{attempt_msg}: {e}")
                 if attempt < max_retries - 1:
                     self.logger.info(f" Retrying step {step.step_id} due to error...")
-                    time.sleep(2)
+                    if not self._wait("navigation_retry", 2):
+                        return False
                     continue
                 return False
         
@@ -247,9 +442,10 @@ class NavigationManager:
         """Validate if step was completed successfully"""
         try:
             if self.coordinate_validation_enabled and self.coordinate_area:
-                time.sleep(0.5)
+                self._wait("step_settle", 0.5)
                 
-                current_coords = self.extract_coordinates_from_coordinate_area()
+                # The scheduler's coordinate task wakes when the settle cooldown expires
+                current_coords = self.wait_for_coordinates(self.cooldowns.expires_at("step_settle"))
                 if not current_coords:
                     self.logger.warning(f"Could not extract coordinates for validation")
                     return True
@@ -266,6 +462,12 @@ class NavigationManager:
                     return True
                 else:
                     self.logger.warning(f"[WARNING] Step {step.step_id} validation failed - distance: {distance}")
+                    get_frame_ring().dump(f"step_{step.step_id}_validation", {
+                        'step': step.name,
+                        'current_coords': current_coords,
+                        'target_coords': target_coords,
+                        'distance': distance
+                    })
                     return False
             
             return True
@@ -310,6 +512,7 @@ class NavigationManager:
         if self.navigation_thread and self.navigation_thread.is_alive():
             self.navigation_thread.join(timeout=2.0)
         
+        self.logger.info(f"Step icon search: {self.icon_tracker.get_stats()}")
         self.logger.info("Navigation stopped")
     
     def _navigation_loop(self):
@@ -331,7 +534,7 @@ class NavigationManager:
                 sequence_success = True
                 
                 for step_index, step in enumerate(ready_steps):
-                    if self.stop_navigation_flag:
+                    if not self._wait_until_resumed():
                         break
                     
                     self.logger.info(f" Processing step {step_index+1}/{len(ready_steps)}: '{step.name}'")
@@ -346,11 +549,11 @@ class NavigationManager:
                         break
                 
                 if sequence_success and not self.stop_navigation_flag:
-                    time.sleep(1)
+                    self._wait("navigation_restart", 1)
                     self.logger.info(" Navigation sequence completed successfully - restarting from beginning")
                 elif not self.stop_navigation_flag:
                     self.logger.warning(" Navigation sequence failed - retrying from beginning in 5 seconds")
-                    time.sleep(5)
+                    self._wait("navigation_restart", 5)
                     
         except Exception as e:
             self.logger.error(f"Error in navigation loop: {e}")
@@ -391,6 +594,9 @@ class NavigationManager:
             max_step_id = max(max_step_id, step.step_id)
         
         self.next_step_id = max_step_id + 1
+        self.icon_tracker.forget()
+        if self.change_gate:
+            self.change_gate.invalidate("minimap")
         self.logger.info(f"Loaded {len(self.steps)} navigation steps")
     
     def preview_step_detection(self, step):
@@ -455,6 +661,8 @@ class NavigationManager:
             icon_image.save(icon_path, "PNG")
             step.icon_image_path = icon_path
             step.icon_bounds = icon_bounds
+            if self.change_gate:
+                self.change_gate.invalidate("minimap")
             
             if step.load_template():
                 self.logger.info(f"Saved and loaded icon for step {step.step_id}: {icon_path}")
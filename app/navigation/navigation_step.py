@@ -1,6 +1,7 @@
 import os
 import cv2
 import logging
+from app.core.base.template_store import get_template_store
 
 logger = logging.getLogger('PokeXHelper')
 
@@ -34,7 +35,7 @@ class NavigationStep:
             return False
             
         try:
-            self.template_image = cv2.imread(self.icon_image_path, cv2.IMREAD_COLOR)
+            self.template_image = get_template_store().get(self.icon_image_path, cv2.IMREAD_COLOR)
             if self.template_image is not None:
                 logger.debug(f"Successfully loaded template for step {self.step_id}")
                 return True
@@ -45,6 +46,17 @@ class NavigationStep:
             logger.error(f"Error loading template for step {self.step_id}: {e}")
             return False
     
+    def get_template_pyramid(self, matcher):
+        """RGB template pyramid for matcher from the shared template store, following the icon file if it changes"""
+        if self.template_image is None or not self.icon_image_path:
+            return None
+        store = get_template_store()
+        image = store.get(self.icon_image_path, cv2.IMREAD_COLOR)
+        if image is None:
+            return None
+        self.template_image = image
+        return store.get_pyramid(self.icon_image_path, matcher)
+    
     def to_dict(self):
         """Convert step to dictionary for serialization"""
         return {
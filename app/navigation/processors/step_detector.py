@@ -1,8 +1,7 @@
-import cv2
-import numpy as np
 import time
 import logging
-from PIL import ImageGrab
+from app.screen_capture.capture_backend import get_capture_backend
+from app.core.processors.pyramid_matcher import get_pyramid_matcher
 
 logger = logging.getLogger('PokeXHelper')
 
@@ -26,20 +25,15 @@ class StepDetector:
             bbox = (self.minimap_area.x1, self.minimap_area.y1, 
                    self.minimap_area.x2, self.minimap_area.y2)
             
-            try:
-                minimap_img = ImageGrab.grab(bbox=bbox, all_screens=True)
-            except TypeError:
-                minimap_img = ImageGrab.grab(bbox=bbox)
+            minimap_img = get_capture_backend().grab_array(bbox=bbox)
             
-            # Convert to OpenCV format
-            minimap_cv = cv2.cvtColor(np.array(minimap_img), cv2.COLOR_RGB2BGR)
             template_cv = step.template_image
             
-            # Perform template matching
-            result = cv2.matchTemplate(minimap_cv, template_cv, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+            # Coarse-to-fine match against the step's cached RGB pyramid
+            matcher = get_pyramid_matcher()
+            max_val, max_loc = matcher.match(minimap_img, step.get_template_pyramid(matcher), threshold)
             
-            if max_val >= threshold:
+            if max_loc is not None and max_val >= threshold:
                 # Convert relative coordinates to absolute screen coordinates
                 rel_x, rel_y = max_loc
                 abs_x = self.minimap_area.x1 + rel_x + template_cv.shape[1] // 2
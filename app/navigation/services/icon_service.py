@@ -1,7 +1,7 @@
 import os
 import time
 import logging
-from PIL import ImageGrab
+from app.screen_capture.capture_backend import get_capture_backend
 
 logger = logging.getLogger('PokeXHelper')
 
@@ -19,10 +19,7 @@ class IconService:
             
             # Capture minimap area
             bbox = (minimap_area.x1, minimap_area.y1, minimap_area.x2, minimap_area.y2)
-            try:
-                minimap_image = ImageGrab.grab(bbox=bbox, all_screens=True)
-            except TypeError:
-                minimap_image = ImageGrab.grab(bbox=bbox)
+            minimap_image = get_capture_backend().grab(bbox=bbox)
             
             if minimap_image is None:
                 self.logger.error("Could not capture minimap image")
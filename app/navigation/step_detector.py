@@ -1,5 +1,5 @@
-import cv2
 import numpy as np
+from app.core.processors.pyramid_matcher import get_pyramid_matcher
 
 class StepDetector:
     def __init__(self, minimap_area, logger):
@@ -19,12 +19,10 @@ class StepDetector:
             if minimap_image is None:
                 return None
             
-            minimap_cv = cv2.cvtColor(np.array(minimap_image), cv2.COLOR_RGB2BGR)
+            matcher = get_pyramid_matcher()
+            max_val, max_loc = matcher.match(np.array(minimap_image), step.get_template_pyramid(matcher), threshold)
             
-            result = cv2.matchTemplate(minimap_cv, step.template_image, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            
-            if max_val >= threshold:
+            if max_loc is not None and max_val >= threshold:
                 template_height, template_width = step.template_image.shape[:2]
                 center_x = max_loc[0] + template_width // 2
                 center_y = max_loc[1] + template_height // 2
@@ -1,21 +1,17 @@
 import cv2
 import numpy as np
 import re
-import os
 import logging
 import time
 from PIL import Image, ImageEnhance, ImageFilter
+from app.utils.debug_writer import get_debug_writer
 
 logger = logging.getLogger('PokeXHelper')
 
 class CoordinateValidator:
     def __init__(self, debug_enabled=True):
         self.debug_enabled = debug_enabled
-        self.debug_dir = "debug_images"
         self.logger = logger
-        
-        if not os.path.exists(self.debug_dir):
-            os.makedirs(self.debug_dir)
     
     def extract_coordinates_from_image(self, image, expected_coords=None, attempts=5):
         if image is None:
@@ -141,16 +137,16 @@ class CoordinateValidator:
         
         try:
             timestamp = int(time.time())
-            filename = f"{self.debug_dir}/coordinate_extraction_{method_name}_{attempt}_{timestamp}.png"
-            cv2.imwrite(filename, image)
+            filename = f"coordinate_extraction_{method_name}_{attempt}_{timestamp}.png"
+            info = (f"Method: {method_name}\n"
+                    f"Attempt: {attempt}\n"
+                    f"Extracted coordinates: {coords}\n"
+                    f"Timestamp: {timestamp}\n")
             
-            # Save coordinate info
-            info_file = filename.replace('.png', '_info.txt')
-            with open(info_file, 'w') as f:
-                f.write(f"Method: {method_name}\n")
-                f.write(f"Attempt: {attempt}\n")
-                f.write(f"Extracted coordinates: {coords}\n")
-                f.write(f"Timestamp: {timestamp}\n")
+            get_debug_writer().write_batch("coordinate_extraction", [
+                (filename, np.array(image)),
+                (filename.replace('.png', '_info.txt'), info)
+            ])
                 
         except Exception as e:
             self.logger.debug(f"Could not save debug info: {e}")
\ No newline at end of file
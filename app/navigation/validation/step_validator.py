@@ -1,6 +1,6 @@
 import math
 import logging
-from PIL import ImageGrab
+from app.screen_capture.capture_backend import get_capture_backend
 
 logger = logging.getLogger('PokeXHelper')
 
@@ -55,10 +55,7 @@ class StepValidator:
                 bbox = (self.coordinate_area.x1, self.coordinate_area.y1, 
                        self.coordinate_area.x2, self.coordinate_area.y2)
                 
-                try:
-                    coordinate_image = ImageGrab.grab(bbox=bbox, all_screens=True)
-                except TypeError:
-                    coordinate_image = ImageGrab.grab(bbox=bbox)
+                coordinate_image = get_capture_backend().grab(bbox=bbox)
                 
                 coords = self.coordinate_validator.extract_coordinates_from_image(coordinate_image)
                 
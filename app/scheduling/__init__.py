@@ -0,0 +1,10 @@
+from .scheduler import TaskScheduler, ScheduledTask
+from .rate_policy import AdaptiveRatePolicy
+from .cooldowns import CooldownManager
+
+__all__ = [
+    'TaskScheduler',
+    'ScheduledTask',
+    'AdaptiveRatePolicy',
+    'CooldownManager'
+]
\ No newline at end of file
@@ -0,0 +1,71 @@
+import time
+import logging
+import threading
+
+logger = logging.getLogger('PokeXHelper')
+
+class CooldownManager:
+    """Named per-action cooldowns and timers.
+    
+    Actions trigger a cooldown instead of sleeping, so the checks keep
+    sensing while it runs. Callers ask is_ready() before acting again, and
+    threads that do have to wait use wait(), which can be interrupted.
+    """
+    
+    def __init__(self):
+        self.logger = logging.getLogger('PokeXHelper')
+        self.durations = {}
+        self._expires = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+    
+    def set_duration(self, name, seconds):
+        self.durations[name] = seconds
+    
+    def trigger(self, name, seconds=None, now=None):
+        """Start (or restart) a cooldown and return when it expires"""
+        seconds = seconds if seconds is not None else self.durations.get(name, 0.0)
+        now = now if now is not None else time.perf_counter()
+        
+        with self._changed:
+            self._expires[name] = now + seconds
+            self._changed.notify_all()
+        return now + seconds
+    
+    def cancel(self, name=None):
+        with self._changed:
+            if name is None:
+                self._expires.clear()
+            else:
+                self._expires.pop(name, None)
+            self._changed.notify_all()
+    
+    def expires_at(self, name):
+        return self._expires.get(name, 0.0)
+    
+    def remaining(self, name, now=None):
+        now = now if now is not None else time.perf_counter()
+        return max(0.0, self._expires.get(name, 0.0) - now)
+    
+    def is_ready(self, name, now=None):
+        return self.remaining(name, now) <= 0.0
+    
+    def active(self, now=None):
+        now = now if now is not None else time.perf_counter()
+        return {name: expires - now for name, expires in self._expires.items() if expires > now}
+    
+    def wait(self, name, should_stop=None, poll_interval=0.1):
+        """Block until the cooldown expires; returns False if should_stop() interrupted it"""
+        with self._changed:
+            while True:
+                remaining = self._expires.get(name, 0.0) - time.perf_counter()
+                if remaining <= 0:
+                    return True
+                if should_stop and should_stop():
+                    return False
+                self._changed.wait(min(remaining, poll_interval))
+    
+    def sleep(self, name, seconds, should_stop=None):
+        """Trigger a cooldown and wait for it, interruptible by should_stop() or cancel()"""
+        self.trigger(name, seconds)
+        return self.wait(name, should_stop)
\ No newline at end of file
@@ -0,0 +1,87 @@
+import time
+import collections
+
+class AdaptiveRatePolicy:
+    """Picks check intervals from recent health and battle readings.
+    
+    Checks run at their normal rates, twice as fast while a battle is active
+    or HP is dropping quickly, and back off to the configured scan interval
+    once nothing has happened for idle_after seconds.
+    """
+    
+    def __init__(self, scan_interval=0.5, health_interval=0.1, battle_interval=0.5,
+                 boost_factor=2.0, fall_rate=5.0, idle_after=10.0, window=1.5, hp_tracker=None):
+        self.scan_interval = scan_interval
+        self.health_interval = health_interval
+        self.battle_interval = battle_interval
+        self.boost_factor = boost_factor
+        self.fall_rate = fall_rate
+        self.idle_after = idle_after
+        self.window = window
+        self.hp_tracker = hp_tracker
+        
+        self.in_battle = False
+        self.last_activity = time.time()
+        self._health_samples = collections.deque()
+    
+    def record_health(self, percentage, timestamp=None):
+        timestamp = timestamp if timestamp is not None else time.time()
+        samples = self._health_samples
+        
+        if samples and abs(samples[-1][1] - percentage) >= 1.0:
+            self.last_activity = timestamp
+        
+        samples.append((timestamp, percentage))
+        while samples and samples[0][0] < timestamp - self.window:
+            samples.popleft()
+    
+    def record_battle(self, in_battle, timestamp=None):
+        if in_battle or in_battle != self.in_battle:
+            self.last_activity = timestamp if timestamp is not None else time.time()
+        self.in_battle = in_battle
+    
+    def record_activity(self, timestamp=None):
+        self.last_activity = timestamp if timestamp is not None else time.time()
+    
+    def get_health_slope(self):
+        """HP change in percent per second over the sample window"""
+        if self.hp_tracker is not None:
+            return self.hp_tracker.get_rate()
+        
+        samples = self._health_samples
+        if len(samples) < 2:
+            return 0.0
+        
+        span = samples[-1][0] - samples[0][0]
+        if span < 0.2:
+            return 0.0
+        return (samples[-1][1] - samples[0][1]) / span
+    
+    def is_health_falling(self):
+        return self.get_health_slope() <= -self.fall_rate
+    
+    def is_idle(self, now=None):
+        now = now if now is not None else time.time()
+        return not self.in_battle and now - self.last_activity >= self.idle_after
+    
+    def get_mode(self, now=None):
+        if self.in_battle or self.is_health_falling():
+            return "active"
+        if self.is_idle(now):
+            return "idle"
+        return "normal"
+    
+    def get_intervals(self, now=None):
+        mode = self.get_mode(now)
+        
+        if mode == "active":
+            return mode, {
+                'health': self.health_interval / self.boost_factor,
+                'battle': self.battle_interval / self.boost_factor
+            }
+        if mode == "idle":
+            return mode, {
+                'health': max(self.health_interval, self.scan_interval),
+                'battle': max(self.battle_interval, self.scan_interval)
+            }
+        return mode, {'health': self.health_interval, 'battle': self.battle_interval}
\ No newline at end of file
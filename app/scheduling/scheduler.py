@@ -0,0 +1,176 @@
+import time
+import logging
+import threading
+
+logger = logging.getLogger('PokeXHelper')
+
+class ScheduledTask:
+    """One periodic check with its own rate, priority and latency budget"""
+    
+    def __init__(self, name, callback, interval, priority=0, budget_ms=None, condition=None, cooldown=None):
+        self.name = name
+        self.callback = callback
+        self.interval = interval
+        self.priority = priority
+        self.budget_ms = budget_ms
+        self.condition = condition
+        self.cooldown = cooldown
+        
+        self.next_due = 0.0
+        self.last_run = 0.0
+        self.run_count = 0
+        self.skip_count = 0
+        self.overrun_count = 0
+        self.error_count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.max_late_ms = 0.0
+    
+    @property
+    def rate(self):
+        return 1.0 / self.interval if self.interval > 0 else 0.0
+    
+    def set_interval(self, interval):
+        """Change the period; a shorter period pulls the next deadline forward"""
+        if interval == self.interval:
+            return
+        self.interval = interval
+        if self.last_run:
+            self.next_due = min(self.next_due, self.last_run + interval)
+    
+    def set_rate(self, hz):
+        self.set_interval(1.0 / hz)
+    
+    def is_enabled(self):
+        if self.condition is None:
+            return True
+        try:
+            return bool(self.condition())
+        except Exception as e:
+            logger.debug(f"Condition for task {self.name} failed: {e}")
+            return False
+    
+    def to_dict(self):
+        return {
+            'interval': round(self.interval, 3),
+            'priority': self.priority,
+            'runs': self.run_count,
+            'skipped': self.skip_count,
+            'overruns': self.overrun_count,
+            'errors': self.error_count,
+            'mean_ms': round(self.total_ms / self.run_count, 3) if self.run_count else 0.0,
+            'max_ms': round(self.max_ms, 3),
+            'max_late_ms': round(self.max_late_ms, 3)
+        }
+
+class TaskScheduler:
+    """Earliest-deadline scheduler for the helper checks.
+    
+    Due tasks run highest priority first. A task that falls behind is
+    rescheduled from now rather than run repeatedly to catch up, and the
+    loop sleeps until the next deadline instead of a fixed interval.
+    
+    A task can name a cooldown from the shared CooldownManager; it is then
+    also woken the moment that cooldown expires, so follow-up checks after
+    an action do not wait for the task's next period.
+    """
+    
+    def __init__(self, max_sleep=0.5, cooldowns=None):
+        self.logger = logging.getLogger('PokeXHelper')
+        self.cooldowns = cooldowns
+        self.tasks = {}
+        self.max_sleep = max_sleep
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+    
+    def add_task(self, name, callback, interval, priority=0, budget_ms=None, condition=None, cooldown=None):
+        task = ScheduledTask(name, callback, interval, priority, budget_ms, condition, cooldown)
+        task.next_due = time.perf_counter()
+        self.tasks[name] = task
+        return task
+    
+    def remove_task(self, name):
+        self.tasks.pop(name, None)
+    
+    def get_task(self, name):
+        return self.tasks.get(name)
+    
+    def set_interval(self, name, interval):
+        task = self.tasks.get(name)
+        if task:
+            task.set_interval(interval)
+            self._wake.set()
+    
+    def run_pending(self, now=None):
+        """Run every task whose deadline has passed and return how many ran"""
+        now = time.perf_counter() if now is None else now
+        due = [task for task in self.tasks.values() if self._next_deadline(task, now) <= now]
+        due.sort(key=lambda task: (-task.priority, task.next_due))
+        
+        ran = 0
+        for task in due:
+            if self._stopped.is_set():
+                break
+            
+            if not task.is_enabled():
+                task.skip_count += 1
+                task.next_due = now + task.interval
+                continue
+            
+            start = time.perf_counter()
+            task.max_late_ms = max(task.max_late_ms, (start - task.next_due) * 1000)
+            try:
+                task.callback()
+            except Exception as e:
+                task.error_count += 1
+                self.logger.error(f"Scheduled task {task.name} failed: {e}")
+            
+            finished = time.perf_counter()
+            elapsed_ms = (finished - start) * 1000
+            task.total_ms += elapsed_ms
+            task.max_ms = max(task.max_ms, elapsed_ms)
+            task.run_count += 1
+            task.last_run = start
+            if task.budget_ms is not None and elapsed_ms > task.budget_ms:
+                task.overrun_count += 1
+                self.logger.debug(f"Task {task.name} took {elapsed_ms:.1f}ms (budget {task.budget_ms}ms)")
+            
+            if start < task.next_due:
+                task.next_due = finished + task.interval
+            else:
+                task.next_due = max(task.next_due + task.interval, finished)
+            ran += 1
+        
+        return ran
+    
+    def time_until_next(self, now=None):
+        if not self.tasks:
+            return self.max_sleep
+        now = time.perf_counter() if now is None else now
+        next_due = min(self._next_deadline(task, now) for task in self.tasks.values())
+        return max(0.0, min(self.max_sleep, next_due - now))
+    
+    def _next_deadline(self, task, now):
+        if task.cooldown is None or self.cooldowns is None:
+            return task.next_due
+        
+        expires = self.cooldowns.expires_at(task.cooldown)
+        if task.last_run < expires < task.next_due:
+            return expires
+        return task.next_due
+    
+    def run(self):
+        """Run tasks until stop() is called"""
+        while not self._stopped.is_set():
+            self.run_pending()
+            delay = self.time_until_next()
+            if delay > 0:
+                self._wake.wait(delay)
+                self._wake.clear()
+    
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+    
+    def get_stats(self):
+        return {name: task.to_dict() for name, task in self.tasks.items()}
\ No newline at end of file
@@ -1,10 +1,11 @@
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk, ImageGrab
+from PIL import Image, ImageTk
 import logging
 import ctypes
-import os
 from ctypes import wintypes, Structure, c_wchar, sizeof, byref
+from .capture_backend import get_capture_backend
+from app.utils.debug_writer import get_debug_writer
 
 logger = logging.getLogger('PokeXHelper')
 
@@ -69,14 +70,8 @@ class AreaSelector:
                 self.logger.info(f"{title} configured from saved coordinates: ({self.x1},{self.y1}) to ({self.x2},{self.y2})")
                 
                 try:
-                    self.preview_image = ImageGrab.grab(bbox=(self.x1, self.y1, self.x2, self.y2), all_screens=True)
+                    self.preview_image = get_capture_backend().grab(bbox=(self.x1, self.y1, self.x2, self.y2))
                     self.logger.debug(f"Created preview image for {title}")
-                except TypeError:
-                    try:
-                        self.preview_image = ImageGrab.grab(bbox=(self.x1, self.y1, self.x2, self.y2))
-                        self.logger.debug(f"Created preview image for {title} (fallback method)")
-                    except Exception as e:
-                        self.logger.warning(f"Could not create preview image for {title}: {e}")
                 except Exception as e:
                     self.logger.warning(f"Could not create preview image for {title}: {e}")
                     
@@ -171,7 +166,7 @@ class AreaSelector:
             self.logger.debug(f"Creating selection window with desktop bounds: {self.desktop_bounds}")
             
             try:
-                screenshot = ImageGrab.grab(all_screens=True)
+                screenshot = get_capture_backend().grab()
                 self.logger.debug(f"Screenshot captured with size: {screenshot.size}")
             except Exception as e:
                 self.logger.error(f"Failed to capture screenshot: {e}")
@@ -350,17 +345,11 @@ class AreaSelector:
         height = abs(self.y2 - self.y1)
         
         try:
-            try:
-                self.preview_image = ImageGrab.grab(bbox=(self.x1, self.y1, self.x2, self.y2), all_screens=True)
-            except TypeError:
-                self.preview_image = ImageGrab.grab(bbox=(self.x1, self.y1, self.x2, self.y2))
+            self.preview_image = get_capture_backend().grab(bbox=(self.x1, self.y1, self.x2, self.y2))
             
-            debug_dir = "debug_images"
-            if not os.path.exists(debug_dir):
-                os.makedirs(debug_dir)
-            preview_path = f"{debug_dir}/{self.title.replace(' ', '_').lower()}_preview.png"
-            self.preview_image.save(preview_path)
-            self.logger.debug(f"Saved preview to {preview_path}")
+            preview_path = f"{self.title.replace(' ', '_').lower()}_preview.png"
+            if get_debug_writer().write("area_preview", self.preview_image, preview_path, rgb=True):
+                self.logger.debug(f"Queued preview {preview_path}")
             
         except Exception as e:
             self.logger.error(f"Error creating preview: {e}")
@@ -417,10 +406,7 @@ class AreaSelector:
                 self.logger.error(f"Invalid coordinate order: ({self.x1},{self.y1}) to ({self.x2},{self.y2})")
                 return None
             
-            try:
-                screenshot = ImageGrab.grab(bbox=(self.x1, self.y1, self.x2, self.y2), all_screens=True)
-            except TypeError:
-                screenshot = ImageGrab.grab(bbox=(self.x1, self.y1, self.x2, self.y2))
+            screenshot = get_capture_backend().grab(bbox=(self.x1, self.y1, self.x2, self.y2))
             
             if screenshot.size[0] == 0 or screenshot.size[1] == 0:
                 self.logger.error(f"Screenshot has zero dimensions: {screenshot.size}")
@@ -0,0 +1,306 @@
+import os
+import abc
+import logging
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger('PokeXHelper')
+
+class CaptureBackend(abc.ABC):
+    name = "base"
+    
+    def __init__(self):
+        self.logger = logging.getLogger('PokeXHelper')
+        self.grab_count = 0
+    
+    @abc.abstractmethod
+    def grab(self, bbox=None):
+        """Return an RGB PIL image of bbox (x1, y1, x2, y2) in screen coordinates, or the whole desktop"""
+    
+    def grab_array(self, bbox=None):
+        return np.asarray(self.grab(bbox).convert("RGB"))
+    
+    def close(self):
+        pass
+
+class ImageGrabBackend(CaptureBackend):
+    name = "imagegrab"
+    
+    def grab(self, bbox=None):
+        from PIL import ImageGrab
+        
+        self.grab_count += 1
+        try:
+            return ImageGrab.grab(bbox=bbox, all_screens=True)
+        except TypeError:
+            return ImageGrab.grab(bbox=bbox)
+
+class _ArrayFrameBackend(CaptureBackend):
+    """Shared cropping for backends that hold whole desktop frames as numpy arrays"""
+    
+    def __init__(self, origin=(0, 0), auto_advance=True):
+        super().__init__()
+        self.origin = origin
+        self.auto_advance = auto_advance
+        self.frame_index = -1
+    
+    @abc.abstractmethod
+    def _current_frame(self):
+        pass
+    
+    @abc.abstractmethod
+    def advance(self):
+        pass
+    
+    def grab(self, bbox=None):
+        return Image.fromarray(self.grab_array(bbox))
+    
+    def grab_array(self, bbox=None):
+        if self.auto_advance or self.frame_index < 0:
+            self.advance()
+        
+        self.grab_count += 1
+        frame = self._current_frame()
+        if bbox is None:
+            return frame
+        
+        return self._crop(frame, bbox)
+    
+    def _crop(self, frame, bbox):
+        x1, y1, x2, y2 = [int(v) for v in bbox]
+        x1 -= self.origin[0]
+        x2 -= self.origin[0]
+        y1 -= self.origin[1]
+        y2 -= self.origin[1]
+        
+        frame_height, frame_width = frame.shape[:2]
+        if 0 <= x1 and 0 <= y1 and x2 <= frame_width and y2 <= frame_height:
+            return frame[y1:y2, x1:x2]
+        
+        region = np.zeros((max(0, y2 - y1), max(0, x2 - x1), 3), dtype=np.uint8)
+        src_x1, src_y1 = max(0, x1), max(0, y1)
+        src_x2, src_y2 = min(frame_width, x2), min(frame_height, y2)
+        if src_x2 > src_x1 and src_y2 > src_y1:
+            region[src_y1 - y1:src_y2 - y1, src_x1 - x1:src_x2 - x1] = frame[src_y1:src_y2, src_x1:src_x2]
+        return region
+
+class ReplayBackend(_ArrayFrameBackend):
+    """Feeds recorded frames from a directory of desktop PNGs or a recorded session file"""
+    
+    name = "replay"
+    
+    def __init__(self, source, origin=(0, 0), loop=False, auto_advance=True, preload=False):
+        super().__init__(origin, auto_advance)
+        self.source = source
+        self.loop = loop
+        self.exhausted = False
+        
+        self._frames = None
+        self._frame = None
+        self._session = None
+        self._session_ticks = None
+        self._session_canvas = None
+        self.frame_paths = []
+        
+        if os.path.isfile(source):
+            self._open_session(source)
+            return
+        
+        if not os.path.isdir(source):
+            raise ValueError(f"Replay source not found: {source}")
+        
+        self.frame_paths = sorted(
+            os.path.join(source, filename)
+            for filename in os.listdir(source)
+            if filename.lower().endswith('.png')
+        )
+        if not self.frame_paths:
+            raise ValueError(f"No PNG frames found in {source}")
+        
+        if preload:
+            self._frames = [self._load_frame(path) for path in self.frame_paths]
+        
+        self.logger.info(f"Replay backend loaded {len(self.frame_paths)} frames from {source}")
+    
+    def __len__(self):
+        if self._session is not None:
+            return sum(1 for _ in self._session.iter_ticks())
+        return len(self.frame_paths)
+    
+    def _open_session(self, path):
+        from app.session.session_file import SessionReader
+        
+        self._session = SessionReader(path)
+        boxes = [box for box in self._session.metadata.get('regions', {}).values() if box]
+        if not boxes:
+            for session_tick in self._session.iter_ticks():
+                boxes.extend(record.meta['bbox'] for record in session_tick.frames.values() if record.meta.get('bbox'))
+        if not boxes:
+            raise ValueError(f"Session has no region frames: {path}")
+        
+        x1 = min(box[0] for box in boxes)
+        y1 = min(box[1] for box in boxes)
+        x2 = max(box[2] for box in boxes)
+        y2 = max(box[3] for box in boxes)
+        
+        self.origin = (x1, y1)
+        self._session_canvas = np.zeros((y2 - y1, x2 - x1, 3), dtype=np.uint8)
+        self._session_ticks = self._session.iter_ticks()
+        self.logger.info(f"Replay backend opened session {path} covering ({x1},{y1}) to ({x2},{y2})")
+    
+    def _advance_session(self):
+        session_tick = next(self._session_ticks, None)
+        if session_tick is None:
+            if not self.loop:
+                self.exhausted = True
+                return False
+            self._session_ticks = self._session.iter_ticks()
+            session_tick = next(self._session_ticks, None)
+            if session_tick is None:
+                return False
+        
+        for record in session_tick.frames.values():
+            bbox = record.meta.get('bbox')
+            if not bbox:
+                continue
+            height, width = record.data.shape[:2]
+            self._fit_canvas((bbox[0], bbox[1], bbox[0] + width, bbox[1] + height))
+            x1, y1 = bbox[0] - self.origin[0], bbox[1] - self.origin[1]
+            self._session_canvas[y1:y1 + height, x1:x1 + width] = record.data
+        
+        self.frame_index += 1
+        self._frame = self._session_canvas
+        return True
+    
+    def _fit_canvas(self, bbox):
+        """Grow the session canvas to cover bbox, e.g. a region reselected mid-recording"""
+        height, width = self._session_canvas.shape[:2]
+        x1, y1 = self.origin
+        x2, y2 = x1 + width, y1 + height
+        if bbox[0] >= x1 and bbox[1] >= y1 and bbox[2] <= x2 and bbox[3] <= y2:
+            return
+        
+        new_x1, new_y1 = min(x1, bbox[0]), min(y1, bbox[1])
+        new_x2, new_y2 = max(x2, bbox[2]), max(y2, bbox[3])
+        canvas = np.zeros((new_y2 - new_y1, new_x2 - new_x1, 3), dtype=np.uint8)
+        canvas[y1 - new_y1:y1 - new_y1 + height, x1 - new_x1:x1 - new_x1 + width] = self._session_canvas
+        
+        self.origin = (new_x1, new_y1)
+        self._session_canvas = canvas
+        self.logger.info(f"Replay canvas grown to ({new_x1},{new_y1}) to ({new_x2},{new_y2}) for frame at {tuple(bbox)}")
+    
+    def _load_frame(self, path):
+        with Image.open(path) as image:
+            return np.asarray(image.convert("RGB"))
+    
+    def advance(self):
+        if self._session is not None:
+            return self._advance_session()
+        
+        next_index = self.frame_index + 1
+        if next_index >= len(self.frame_paths):
+            if not self.loop:
+                self.exhausted = True
+                return False
+            next_index = 0
+        
+        self.frame_index = next_index
+        if self._frames is not None:
+            self._frame = self._frames[next_index]
+        else:
+            self._frame = self._load_frame(self.frame_paths[next_index])
+        return True
+    
+    def seek(self, index):
+        if self._session is not None:
+            self._session_ticks = self._session.iter_ticks()
+            self.frame_index = -1
+            self.exhausted = False
+            for _ in range(max(0, index)):
+                next(self._session_ticks, None)
+                self.frame_index += 1
+            return self.advance()
+        
+        self.frame_index = max(-1, min(index, len(self.frame_paths)) - 1)
+        self.exhausted = False
+        return self.advance()
+    
+    def _current_frame(self):
+        return self._frame
+    
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+class SyntheticBackend(_ArrayFrameBackend):
+    """Renders desktop frames in memory, one renderer call per frame"""
+    
+    name = "synthetic"
+    
+    def __init__(self, size=(1920, 1080), background=(0, 0, 0), renderer=None, auto_advance=True):
+        super().__init__((0, 0), auto_advance)
+        width, height = size
+        self.size = size
+        self.background = background
+        self.renderer = renderer
+        self.shapes = []
+        self.canvas = np.empty((height, width, 3), dtype=np.uint8)
+    
+    def fill_rect(self, bbox, color):
+        self.shapes.append((bbox, color))
+    
+    def draw_bar(self, bbox, percentage, fill_color=(0, 200, 0), empty_color=(60, 60, 60)):
+        x1, y1, x2, y2 = bbox
+        split = x1 + int(round((x2 - x1) * max(0.0, min(100.0, percentage)) / 100))
+        self.canvas[y1:y2, x1:x2] = empty_color
+        self.canvas[y1:y2, x1:split] = fill_color
+    
+    def clear_shapes(self):
+        self.shapes = []
+    
+    def advance(self):
+        self.frame_index += 1
+        self.canvas[:] = self.background
+        for (x1, y1, x2, y2), color in self.shapes:
+            self.canvas[y1:y2, x1:x2] = color
+        if self.renderer:
+            self.renderer(self, self.frame_index)
+        return True
+    
+    def _current_frame(self):
+        return self.canvas
+
+_capture_backend = None
+
+def create_capture_backend(spec):
+    """Build a backend from 'imagegrab', 'replay:<dir or session file>' or 'synthetic[:WxH]'"""
+    kind, _, argument = (spec or "imagegrab").partition(":")
+    kind = kind.strip().lower()
+    
+    if kind == "imagegrab":
+        return ImageGrabBackend()
+    if kind == "replay":
+        return ReplayBackend(argument, loop=True)
+    if kind == "synthetic":
+        size = (1920, 1080)
+        if argument:
+            width, height = argument.lower().split("x")
+            size = (int(width), int(height))
+        return SyntheticBackend(size)
+    
+    raise ValueError(f"Unknown capture backend: {spec}")
+
+def get_capture_backend():
+    global _capture_backend
+    if _capture_backend is None:
+        spec = os.environ.get("PXG_CAPTURE_BACKEND", "imagegrab")
+        _capture_backend = create_capture_backend(spec)
+        logger.info(f"Using capture backend: {_capture_backend.name}")
+    return _capture_backend
+
+def set_capture_backend(backend):
+    global _capture_backend
+    if _capture_backend is not None and _capture_backend is not backend:
+        _capture_backend.close()
+    _capture_backend = backend
+    logger.info(f"Capture backend set to: {backend.name}")
\ No newline at end of file
@@ -0,0 +1,158 @@
+import time
+import logging
+import threading
+from .capture_backend import get_capture_backend
+
+logger = logging.getLogger('PokeXHelper')
+
+class RegionFrame:
+    """View of one configured area inside a shared bus frame"""
+    
+    def __init__(self, name, image, bbox, frame_id, timestamp):
+        self.name = name
+        self.image = image
+        self.bbox = bbox
+        self.frame_id = frame_id
+        self.timestamp = timestamp
+    
+    @property
+    def width(self):
+        return self.image.shape[1]
+    
+    @property
+    def height(self):
+        return self.image.shape[0]
+    
+    def __repr__(self):
+        return f"RegionFrame(name='{self.name}', frame_id={self.frame_id}, bbox={self.bbox})"
+
+class FrameBus:
+    """Captures the union of all registered areas once per tick and hands out views"""
+    
+    def __init__(self, backend=None):
+        self.logger = logger
+        self.regions = {}
+        self.backend = backend
+        
+        self._lock = threading.Lock()
+        self._frame = None
+        self._frame_bbox = None
+        self._frame_id = 0
+        self._timestamp = 0.0
+        
+        self.capture_count = 0
+        self.last_capture_ms = 0.0
+    
+    def register_region(self, name, area):
+        self.regions[name] = area
+        self.logger.debug(f"Frame bus region registered: {name}")
+    
+    def unregister_region(self, name):
+        self.regions.pop(name, None)
+    
+    @property
+    def frame_id(self):
+        return self._frame_id
+    
+    @property
+    def timestamp(self):
+        return self._timestamp
+    
+    def get_frame_age(self):
+        if self._frame is None:
+            return float('inf')
+        return time.time() - self._timestamp
+    
+    def get_region_bbox(self, name):
+        area = self.regions.get(name)
+        if area is None or not area.is_setup():
+            return None
+        
+        bbox = (int(area.x1), int(area.y1), int(area.x2), int(area.y2))
+        if bbox[2] <= bbox[0] or bbox[3] <= bbox[1]:
+            return None
+        return bbox
+    
+    def get_union_bbox(self):
+        boxes = [self.get_region_bbox(name) for name in self.regions]
+        boxes = [box for box in boxes if box is not None]
+        if not boxes:
+            return None
+        
+        return (
+            min(box[0] for box in boxes),
+            min(box[1] for box in boxes),
+            max(box[2] for box in boxes),
+            max(box[3] for box in boxes)
+        )
+    
+    def capture(self):
+        union_bbox = self.get_union_bbox()
+        if union_bbox is None:
+            return None
+        
+        start = time.perf_counter()
+        timestamp = time.time()
+        
+        try:
+            backend = self.backend or get_capture_backend()
+            frame = backend.grab_array(union_bbox)
+        except Exception as e:
+            self.logger.error(f"Frame bus capture failed: {e}")
+            return None
+        
+        if frame.flags.writeable:
+            # Writable frames belong to the backend and may be redrawn; read-only ones are immutable
+            frame = frame.copy()
+            frame.flags.writeable = False
+        
+        with self._lock:
+            self._frame = frame
+            self._frame_bbox = union_bbox
+            self._frame_id += 1
+            self._timestamp = timestamp
+            frame_id = self._frame_id
+        
+        self.capture_count += 1
+        self.last_capture_ms = (time.perf_counter() - start) * 1000
+        return frame_id
+    
+    def get_region(self, name, max_age=None):
+        region_bbox = self.get_region_bbox(name)
+        if region_bbox is None:
+            return None
+        
+        if not self._covers(region_bbox) or (max_age is not None and self.get_frame_age() > max_age):
+            self.capture()
+        
+        with self._lock:
+            frame = self._frame
+            frame_bbox = self._frame_bbox
+            frame_id = self._frame_id
+            timestamp = self._timestamp
+        
+        if frame is None or not self._contains(frame_bbox, region_bbox):
+            return None
+        
+        x1 = region_bbox[0] - frame_bbox[0]
+        y1 = region_bbox[1] - frame_bbox[1]
+        x2 = region_bbox[2] - frame_bbox[0]
+        y2 = region_bbox[3] - frame_bbox[1]
+        
+        return RegionFrame(name, frame[y1:y2, x1:x2], region_bbox, frame_id, timestamp)
+    
+    def get_region_image(self, name, max_age=None):
+        region = self.get_region(name, max_age)
+        return region.image if region is not None else None
+    
+    def _covers(self, region_bbox):
+        with self._lock:
+            frame_bbox = self._frame_bbox
+        return self._frame is not None and self._contains(frame_bbox, region_bbox)
+    
+    @staticmethod
+    def _contains(outer, inner):
+        if outer is None:
+            return False
+        return (outer[0] <= inner[0] and outer[1] <= inner[1] and
+                outer[2] >= inner[2] and outer[3] >= inner[3])
\ No newline at end of file
@@ -0,0 +1,198 @@
+import os
+import json
+import time
+import atexit
+import logging
+import tempfile
+import threading
+import collections
+import cv2
+import numpy as np
+from app.utils.debug_writer import get_debug_writer
+
+logger = logging.getLogger('PokeXHelper')
+
+class RingEntry:
+    def __init__(self, name, offset, shape, dtype, timestamp, frame_id=None, rgb=False):
+        self.name = name
+        self.offset = offset
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.nbytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.timestamp = timestamp
+        self.frame_id = frame_id
+        self.rgb = rgb
+    
+    def overlaps(self, start, end):
+        return self.offset < end and start < self.offset + self.nbytes
+    
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'shape': list(self.shape),
+            'dtype': str(self.dtype),
+            'timestamp': self.timestamp,
+            'frame_id': self.frame_id
+        }
+
+class FrameRingBuffer:
+    """Keeps the last few seconds of region frames and masks in a memory-mapped file.
+    
+    Pushing only copies bytes into the map; nothing is encoded or written out
+    until dump() is called when something goes wrong.
+    """
+    
+    def __init__(self, path=None, capacity_bytes=64 * 1024 * 1024, max_seconds=10.0,
+                 min_dump_interval=5.0):
+        self.path = path or os.path.join(tempfile.gettempdir(), f"pxg_frame_ring_{os.getpid()}.bin")
+        self.capacity_bytes = capacity_bytes
+        self.max_seconds = max_seconds
+        self.min_dump_interval = min_dump_interval
+        
+        self._buffer = np.memmap(self.path, dtype=np.uint8, mode='w+', shape=(capacity_bytes,))
+        self._entries = collections.deque()
+        self._write_offset = 0
+        self._lock = threading.Lock()
+        self._last_region_frames = {}
+        self._last_dump_time = 0.0
+        
+        self.push_count = 0
+        self.dump_count = 0
+    
+    def push(self, name, image, frame_id=None, timestamp=None, rgb=False):
+        """Copy an image into the ring, evicting the oldest entries it overwrites"""
+        if self._buffer is None or image is None:
+            return
+        
+        array = np.ascontiguousarray(image)
+        nbytes = array.nbytes
+        if nbytes == 0 or nbytes > self.capacity_bytes:
+            return
+        
+        timestamp = timestamp if timestamp is not None else time.time()
+        
+        with self._lock:
+            if self._write_offset + nbytes > self.capacity_bytes:
+                self._write_offset = 0
+            
+            start = self._write_offset
+            end = start + nbytes
+            self._evict(start, end, timestamp)
+            
+            self._buffer[start:end] = array.reshape(-1).view(np.uint8)
+            self._entries.append(RingEntry(name, start, array.shape, array.dtype, timestamp, frame_id, rgb))
+            self._write_offset = end
+            self.push_count += 1
+    
+    def push_region(self, region_frame):
+        """Push a frame bus RegionFrame once per frame id"""
+        if region_frame is None:
+            return
+        
+        if self._last_region_frames.get(region_frame.name) == region_frame.frame_id:
+            return
+        self._last_region_frames[region_frame.name] = region_frame.frame_id
+        
+        self.push(region_frame.name, region_frame.image, region_frame.frame_id, region_frame.timestamp, rgb=True)
+    
+    def _evict(self, start, end, now):
+        cutoff = now - self.max_seconds
+        while self._entries and self._entries[0].timestamp < cutoff:
+            self._entries.popleft()
+        
+        if any(entry.overlaps(start, end) for entry in self._entries):
+            self._entries = collections.deque(entry for entry in self._entries if not entry.overlaps(start, end))
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def snapshot(self, max_seconds=None):
+        """Return (entry, image copy) pairs for the retained window, oldest first"""
+        cutoff = time.time() - (max_seconds if max_seconds is not None else self.max_seconds)
+        
+        with self._lock:
+            if self._buffer is None:
+                return []
+            
+            snapshot = []
+            for entry in self._entries:
+                if entry.timestamp < cutoff:
+                    continue
+                raw = self._buffer[entry.offset:entry.offset + entry.nbytes]
+                data = np.array(raw).view(entry.dtype).reshape(entry.shape)
+                snapshot.append((entry, data))
+            return snapshot
+    
+    def dump(self, reason, details=None):
+        """Queue the retained window as a folder of PNGs plus a manifest and return the folder path"""
+        now = time.time()
+        if now - self._last_dump_time < self.min_dump_interval:
+            logger.debug(f"Skipping frame ring dump for '{reason}', last dump was {now - self._last_dump_time:.1f}s ago")
+            return None
+        self._last_dump_time = now
+        
+        try:
+            snapshot = self.snapshot()
+            if not snapshot:
+                return None
+            
+            safe_reason = "".join(c if c.isalnum() or c in "-_" else "_" for c in reason)
+            folder = f"failure_{time.strftime('%Y%m%d_%H%M%S')}_{safe_reason}"
+            
+            items = []
+            manifest = {'reason': reason, 'time': now, 'details': details or {}, 'frames': []}
+            for number, (entry, data) in enumerate(snapshot):
+                filename = f"{number:03d}_{entry.name}.png"
+                if entry.rgb and data.ndim == 3:
+                    data = cv2.cvtColor(data, cv2.COLOR_RGB2BGR)
+                items.append((os.path.join(folder, filename), data))
+                
+                frame_info = entry.to_dict()
+                frame_info['file'] = filename
+                manifest['frames'].append(frame_info)
+            
+            items.append((os.path.join(folder, "manifest.json"), json.dumps(manifest, indent=2, default=str)))
+            
+            # Failure dumps are kept regardless of the debug image setting
+            writer = get_debug_writer()
+            if not writer.write_batch("failure_dump", items, force=True):
+                return None
+            
+            self.dump_count += 1
+            folder = os.path.join(writer.root_dir, folder)
+            logger.info(f"Frame ring queued {len(snapshot)} images for {folder} ({reason})")
+            return folder
+        
+        except Exception as e:
+            logger.error(f"Error dumping frame ring: {e}")
+            return None
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._write_offset = 0
+            self._last_region_frames = {}
+    
+    def close(self):
+        with self._lock:
+            if self._buffer is None:
+                return
+            self._entries.clear()
+            buffer = self._buffer
+            self._buffer = None
+        
+        del buffer
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+_frame_ring = None
+
+def get_frame_ring():
+    global _frame_ring
+    if _frame_ring is None:
+        capacity_mb = int(os.environ.get("PXG_FRAME_RING_MB", "64"))
+        _frame_ring = FrameRingBuffer(capacity_bytes=capacity_mb * 1024 * 1024)
+        atexit.register(_frame_ring.close)
+    return _frame_ring
\ No newline at end of file
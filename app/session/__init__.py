@@ -0,0 +1,13 @@
+from .session_file import SessionWriter, SessionReader, SessionRecord, SessionTick, SessionFormatError
+from .recorder import SessionRecorder
+from .replayer import SessionReplayer
+
+__all__ = [
+    'SessionWriter',
+    'SessionReader',
+    'SessionRecord',
+    'SessionTick',
+    'SessionFormatError',
+    'SessionRecorder',
+    'SessionReplayer'
+]
\ No newline at end of file
@@ -0,0 +1,111 @@
+import os
+import time
+import queue
+import logging
+import threading
+from .session_file import SessionWriter
+
+logger = logging.getLogger('PokeXHelper')
+
+class SessionRecorder:
+    """Records region frames, detector outputs and input actions on a background writer thread"""
+    
+    def __init__(self, path, metadata=None, queue_size=256, chunk_size=4 * 1024 * 1024):
+        self.path = path
+        self.metadata = metadata or {}
+        self.chunk_size = chunk_size
+        
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._writer = None
+        self._recorded_frames = {}
+        
+        self.tick = 0
+        self.tick_timestamp = 0.0
+        self.dropped_count = 0
+        self.running = False
+    
+    @staticmethod
+    def default_path(session_dir="sessions"):
+        return os.path.join(session_dir, f"session_{time.strftime('%Y%m%d_%H%M%S')}.pxgs")
+    
+    def start(self):
+        if self.running:
+            return
+        
+        metadata = dict(self.metadata)
+        metadata.setdefault('created', time.time())
+        self._writer = SessionWriter(self.path, metadata, chunk_size=self.chunk_size)
+        
+        self.running = True
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+        logger.info(f"Session recording started: {self.path}")
+    
+    def stop(self):
+        if not self.running:
+            return
+        
+        self.running = False
+        self._queue.put(None)
+        if self._thread:
+            self._thread.join(timeout=5.0)
+        
+        if self.dropped_count:
+            logger.warning(f"Session recorder dropped {self.dropped_count} records under load")
+        logger.info(f"Session recording stopped: {self.path}")
+    
+    def begin_tick(self, tick, timestamp=None):
+        self.tick = tick
+        self.tick_timestamp = timestamp if timestamp is not None else time.time()
+    
+    def record_frame(self, region_frame):
+        if region_frame is None:
+            return
+        
+        if self._recorded_frames.get(region_frame.name) == region_frame.frame_id:
+            return
+        self._recorded_frames[region_frame.name] = region_frame.frame_id
+        
+        self._enqueue(('frame', region_frame.name, region_frame.image, region_frame.frame_id,
+                       region_frame.timestamp, region_frame.bbox))
+    
+    def record_output(self, detector, value, tick=None):
+        self._enqueue(('output', detector, value, self._tick(tick), time.time()))
+    
+    def record_action(self, action, tick=None, **details):
+        self._enqueue(('action', action, details, self._tick(tick), time.time()))
+    
+    def _tick(self, tick):
+        return self.tick if tick is None else tick
+    
+    def _enqueue(self, item):
+        if not self.running:
+            return
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped_count += 1
+    
+    def _write_loop(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                
+                kind = item[0]
+                try:
+                    if kind == 'frame':
+                        _, region, image, tick, timestamp, bbox = item
+                        self._writer.write_frame(region, image, tick, timestamp, bbox)
+                    elif kind == 'output':
+                        _, detector, value, tick, timestamp = item
+                        self._writer.write_output(detector, value, tick, timestamp)
+                    elif kind == 'action':
+                        _, action, details, tick, timestamp = item
+                        self._writer.write_action(action, tick, timestamp, **details)
+                except Exception as e:
+                    logger.error(f"Error writing session record: {e}")
+        finally:
+            self._writer.close()
\ No newline at end of file
@@ -0,0 +1,156 @@
+import time
+import logging
+from .session_file import SessionReader
+
+logger = logging.getLogger('PokeXHelper')
+
+class DetectorReplayStats:
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.compared = 0
+        self.mismatches = []
+    
+    @property
+    def mean_ms(self):
+        return (self.total_seconds / self.calls) * 1000 if self.calls else 0.0
+    
+    def to_dict(self):
+        return {
+            'calls': self.calls,
+            'mean_ms': round(self.mean_ms, 3),
+            'total_ms': round(self.total_seconds * 1000, 3),
+            'compared': self.compared,
+            'mismatches': len(self.mismatches)
+        }
+
+class SessionReplayer:
+    """Drives the detectors from a recorded session and compares against what was recorded"""
+    
+    def __init__(self, path, health_detector=None, battle_detector=None,
+                 navigation_manager=None, coordinate_validator=None, tolerance=0.5):
+        self.path = path
+        self.health_detector = health_detector
+        self.battle_detector = battle_detector
+        self.navigation_manager = navigation_manager
+        self.coordinate_validator = coordinate_validator
+        self.tolerance = tolerance
+        self.stats = {}
+        self.metadata = {}
+        self.compared_count = 0
+        self.uncompared_ticks = []
+    
+    def run(self, start_time=None, end_time=None, speed=None):
+        """Replay the session; speed=None runs as fast as possible, 1.0 is real time"""
+        self.stats = {}
+        self.compared_count = 0
+        self.uncompared_ticks = []
+        tick_count = 0
+        first_timestamp = None
+        wall_start = time.perf_counter()
+        
+        with SessionReader(self.path) as reader:
+            self.metadata = reader.metadata
+            for session_tick in reader.iter_ticks(start_time, end_time):
+                if speed and first_timestamp is not None:
+                    due = (session_tick.timestamp - first_timestamp) / speed
+                    delay = due - (time.perf_counter() - wall_start)
+                    if delay > 0:
+                        time.sleep(delay)
+                if first_timestamp is None:
+                    first_timestamp = session_tick.timestamp
+                
+                compared_before = self.compared_count
+                self._replay_tick(session_tick)
+                if self.compared_count == compared_before:
+                    self.uncompared_ticks.append(session_tick.tick)
+                tick_count += 1
+            
+            session_duration = reader.duration
+        
+        wall_seconds = time.perf_counter() - wall_start
+        report = {
+            'ticks': tick_count,
+            'uncompared_ticks': len(self.uncompared_ticks),
+            'wall_seconds': round(wall_seconds, 3),
+            'session_seconds': round(session_duration, 3),
+            'ticks_per_second': round(tick_count / wall_seconds, 1) if wall_seconds > 0 else 0.0,
+            'speedup': round(session_duration / wall_seconds, 1) if wall_seconds > 0 else 0.0,
+            'detectors': {name: stats.to_dict() for name, stats in self.stats.items()}
+        }
+        logger.info(f"Replayed {tick_count} ticks in {wall_seconds:.2f}s ({report['speedup']}x real time)")
+        if self.uncompared_ticks:
+            logger.warning(f"{len(self.uncompared_ticks)} of {tick_count} ticks had nothing to compare")
+        return report
+    
+    def get_mismatches(self):
+        return {name: stats.mismatches for name, stats in self.stats.items() if stats.mismatches}
+    
+    def _replay_tick(self, session_tick):
+        frames = session_tick.frames
+        outputs = session_tick.outputs
+        
+        if self.health_detector and "health_bar" in frames:
+            self._run("health", session_tick, outputs,
+                      self.health_detector.detect_health_percentage, frames["health_bar"].data)
+        
+        if self.battle_detector and "battle_area" in frames:
+            battle_image = frames["battle_area"].data
+            self._run("in_battle", session_tick, outputs, self.battle_detector.is_in_battle, battle_image)
+            self._run("enemy_count", session_tick, outputs, self.battle_detector.count_enemy_pokemon, battle_image)
+        
+        if self.navigation_manager and "minimap" in frames:
+            minimap_image = frames["minimap"].data
+            bbox = frames["minimap"].meta.get('bbox')
+            origin = tuple(bbox[:2]) if bbox else None
+            for step in self.navigation_manager.steps:
+                if step.template_image is None:
+                    continue
+                self._run(f"step_icon_{step.step_id}", session_tick, outputs,
+                          self.navigation_manager.locate_step_icon, step, minimap_image, origin,
+                          self._step_icon_threshold(step, outputs))
+        
+        if self.coordinate_validator and "coordinate_area" in frames:
+            self._run("coordinates", session_tick, outputs,
+                      self.coordinate_validator.extract_coordinates_from_image, frames["coordinate_area"].data)
+    
+    def _step_icon_threshold(self, step, outputs):
+        """Threshold the recorded lookup used: per tick, then the session's, then the manager's current one"""
+        threshold = outputs.get(f"step_icon_{step.step_id}_threshold")
+        if threshold is None:
+            threshold = self.metadata.get('step_icon_threshold', getattr(self.navigation_manager, 'step_icon_threshold', 0.7))
+        return threshold
+    
+    def _run(self, name, session_tick, outputs, function, *args):
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = DetectorReplayStats(name)
+        
+        start = time.perf_counter()
+        try:
+            value = function(*args)
+        except Exception as e:
+            logger.error(f"Replay of {name} failed at tick {session_tick.tick}: {e}")
+            value = None
+        stats.total_seconds += time.perf_counter() - start
+        stats.calls += 1
+        
+        if name in outputs:
+            stats.compared += 1
+            self.compared_count += 1
+            recorded = outputs[name]
+            if not self._values_match(recorded, value):
+                stats.mismatches.append({'tick': session_tick.tick, 'recorded': recorded, 'replayed': value})
+        
+        return value
+    
+    def _values_match(self, recorded, replayed):
+        if isinstance(recorded, (list, tuple)) and isinstance(replayed, (list, tuple)):
+            return len(recorded) == len(replayed) and all(
+                self._values_match(a, b) for a, b in zip(recorded, replayed))
+        if isinstance(recorded, bool) or isinstance(replayed, bool):
+            return recorded == replayed
+        if isinstance(recorded, (int, float)) and isinstance(replayed, (int, float)):
+            return abs(recorded - replayed) <= self.tolerance
+        return recorded == replayed
\ No newline at end of file
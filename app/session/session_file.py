@@ -0,0 +1,383 @@
+import os
+import json
+import zlib
+import struct
+import bisect
+import logging
+import numpy as np
+
+logger = logging.getLogger('PokeXHelper')
+
+FILE_MAGIC = b'PXGSESS1'
+FOOTER_MAGIC = b'PXGSEND1'
+CHUNK_MAGIC = b'CHNK'
+INDEX_MAGIC = b'PIDX'
+FORMAT_VERSION = 1
+
+RECORD_FRAME = 1
+RECORD_OUTPUT = 2
+RECORD_ACTION = 3
+
+_HEADER = struct.Struct('<8sII')
+_CHUNK_HEADER = struct.Struct('<4sIII')
+_RECORD_HEADER = struct.Struct('<BI')
+_PAYLOAD_HEADER = struct.Struct('<I')
+_FOOTER = struct.Struct('<Q8s')
+
+class SessionFormatError(Exception):
+    pass
+
+class SessionRecord:
+    def __init__(self, kind, meta, data=None):
+        self.kind = kind
+        self.meta = meta
+        self.data = data
+    
+    @property
+    def tick(self):
+        return self.meta.get('tick', 0)
+    
+    @property
+    def timestamp(self):
+        return self.meta.get('timestamp', 0.0)
+    
+    def __repr__(self):
+        return f"SessionRecord(kind={self.kind}, meta={self.meta})"
+
+class SessionTick:
+    """All records that share one helper tick (frame id)"""
+    
+    def __init__(self, tick, timestamp):
+        self.tick = tick
+        self.timestamp = timestamp
+        self.frames = {}
+        self.outputs = {}
+        self.actions = []
+
+class SessionWriter:
+    """Writes records into zlib-compressed chunks followed by a chunk index.
+    
+    Region frames are stored as the XOR against the previous frame of the same
+    region, with the first frame of every chunk stored whole so any chunk can be
+    decoded on its own.
+    """
+    
+    def __init__(self, path, metadata=None, chunk_size=4 * 1024 * 1024, compression_level=1):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.compression_level = compression_level
+        self.index = []
+        
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        self._file = open(path, 'wb')
+        header = json.dumps(metadata or {}).encode('utf-8')
+        self._file.write(_HEADER.pack(FILE_MAGIC, FORMAT_VERSION, len(header)))
+        self._file.write(header)
+        
+        self._buffer = []
+        self._buffer_size = 0
+        self._chunk_info = None
+        self._previous_frames = {}
+        self.record_count = 0
+    
+    def write_frame(self, region, image, tick, timestamp, bbox=None):
+        image = np.ascontiguousarray(image)
+        meta = {
+            'region': region,
+            'tick': tick,
+            'timestamp': timestamp,
+            'bbox': list(bbox) if bbox else None,
+            'shape': list(image.shape),
+            'dtype': str(image.dtype),
+            'encoding': 'raw'
+        }
+        
+        previous = self._previous_frames.get(region)
+        if previous is not None and previous.shape == image.shape and previous.dtype == image.dtype:
+            payload = np.bitwise_xor(image, previous).tobytes()
+            meta['encoding'] = 'xor'
+        else:
+            payload = image.tobytes()
+        
+        self._previous_frames[region] = image
+        self._append(RECORD_FRAME, meta, payload)
+    
+    def write_output(self, detector, value, tick, timestamp):
+        self._append(RECORD_OUTPUT, {'detector': detector, 'value': value, 'tick': tick, 'timestamp': timestamp})
+    
+    def write_action(self, action, tick, timestamp, **details):
+        self._append(RECORD_ACTION, {'action': action, 'details': details, 'tick': tick, 'timestamp': timestamp})
+    
+    def _append(self, kind, meta, payload=b''):
+        meta_bytes = json.dumps(meta, default=_json_default).encode('utf-8')
+        record = b''.join([
+            _RECORD_HEADER.pack(kind, len(meta_bytes)),
+            meta_bytes,
+            _PAYLOAD_HEADER.pack(len(payload)),
+            payload
+        ])
+        
+        tick = meta.get('tick', 0)
+        timestamp = meta.get('timestamp', 0.0)
+        if self._chunk_info is None:
+            self._chunk_info = {
+                'first_tick': tick, 'last_tick': tick,
+                'first_timestamp': timestamp, 'last_timestamp': timestamp,
+                'records': 0
+            }
+        info = self._chunk_info
+        info['first_tick'] = min(info['first_tick'], tick)
+        info['last_tick'] = max(info['last_tick'], tick)
+        info['first_timestamp'] = min(info['first_timestamp'], timestamp)
+        info['last_timestamp'] = max(info['last_timestamp'], timestamp)
+        info['records'] += 1
+        
+        self._buffer.append(record)
+        self._buffer_size += len(record)
+        self.record_count += 1
+        
+        if self._buffer_size >= self.chunk_size:
+            self.flush_chunk()
+    
+    def flush_chunk(self):
+        if not self._buffer:
+            return
+        
+        raw = b''.join(self._buffer)
+        compressed = zlib.compress(raw, self.compression_level)
+        
+        info = self._chunk_info
+        info['offset'] = self._file.tell()
+        self._file.write(_CHUNK_HEADER.pack(CHUNK_MAGIC, len(compressed), len(raw), info['records']))
+        self._file.write(compressed)
+        self._file.flush()
+        self.index.append(info)
+        
+        self._buffer = []
+        self._buffer_size = 0
+        self._chunk_info = None
+        self._previous_frames = {}
+    
+    def close(self):
+        if self._file is None:
+            return
+        
+        self.flush_chunk()
+        
+        index_offset = self._file.tell()
+        index_bytes = zlib.compress(json.dumps(self.index).encode('utf-8'))
+        self._file.write(INDEX_MAGIC + _PAYLOAD_HEADER.pack(len(index_bytes)))
+        self._file.write(index_bytes)
+        self._file.write(_FOOTER.pack(index_offset, FOOTER_MAGIC))
+        self._file.close()
+        self._file = None
+        
+        logger.info(f"Session file closed: {self.path} ({self.record_count} records, {len(self.index)} chunks)")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class SessionReader:
+    """Random-access reader for session files written by SessionWriter"""
+    
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        
+        magic, version, header_length = _HEADER.unpack(self._file.read(_HEADER.size))
+        if magic != FILE_MAGIC:
+            self._file.close()
+            raise SessionFormatError(f"Not a session file: {path}")
+        if version > FORMAT_VERSION:
+            self._file.close()
+            raise SessionFormatError(f"Unsupported session version {version}: {path}")
+        
+        self.metadata = json.loads(self._file.read(header_length).decode('utf-8'))
+        self._data_offset = self._file.tell()
+        
+        self.index = self._read_index()
+        if self.index is None:
+            logger.warning(f"Session index missing, scanning chunks: {path}")
+            self.index = self._scan_chunks()
+        
+        self._chunk_starts = [chunk['first_timestamp'] for chunk in self.index]
+    
+    def _read_index(self):
+        self._file.seek(0, os.SEEK_END)
+        file_size = self._file.tell()
+        if file_size < self._data_offset + _FOOTER.size:
+            return None
+        
+        self._file.seek(file_size - _FOOTER.size)
+        index_offset, magic = _FOOTER.unpack(self._file.read(_FOOTER.size))
+        if magic != FOOTER_MAGIC:
+            return None
+        
+        self._file.seek(index_offset)
+        if self._file.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+            return None
+        (length,) = _PAYLOAD_HEADER.unpack(self._file.read(_PAYLOAD_HEADER.size))
+        return json.loads(zlib.decompress(self._file.read(length)).decode('utf-8'))
+    
+    def _scan_chunks(self):
+        """Rebuild the chunk index of a session that was not closed cleanly"""
+        index = []
+        offset = self._data_offset
+        
+        while True:
+            self._file.seek(offset)
+            header = self._file.read(_CHUNK_HEADER.size)
+            if len(header) < _CHUNK_HEADER.size:
+                break
+            
+            magic, compressed_length, raw_length, record_count = _CHUNK_HEADER.unpack(header)
+            if magic != CHUNK_MAGIC:
+                break
+            
+            try:
+                records = self._decode_records(zlib.decompress(self._file.read(compressed_length)))
+            except zlib.error:
+                break
+            
+            ticks = [record.tick for record in records] or [0]
+            timestamps = [record.timestamp for record in records] or [0.0]
+            index.append({
+                'offset': offset,
+                'first_tick': min(ticks), 'last_tick': max(ticks),
+                'first_timestamp': min(timestamps), 'last_timestamp': max(timestamps),
+                'records': record_count
+            })
+            offset += _CHUNK_HEADER.size + compressed_length
+        
+        return index
+    
+    def __len__(self):
+        return len(self.index)
+    
+    @property
+    def record_count(self):
+        return sum(chunk['records'] for chunk in self.index)
+    
+    @property
+    def duration(self):
+        if not self.index:
+            return 0.0
+        return self.index[-1]['last_timestamp'] - self.index[0]['first_timestamp']
+    
+    def read_chunk(self, chunk_number):
+        chunk = self.index[chunk_number]
+        self._file.seek(chunk['offset'])
+        magic, compressed_length, raw_length, record_count = _CHUNK_HEADER.unpack(self._file.read(_CHUNK_HEADER.size))
+        if magic != CHUNK_MAGIC:
+            raise SessionFormatError(f"Corrupt chunk {chunk_number} in {self.path}")
+        
+        return self._decode_records(zlib.decompress(self._file.read(compressed_length)))
+    
+    def _decode_records(self, raw):
+        records = []
+        previous_frames = {}
+        position = 0
+        view = memoryview(raw)
+        
+        while position < len(raw):
+            kind, meta_length = _RECORD_HEADER.unpack_from(raw, position)
+            position += _RECORD_HEADER.size
+            meta = json.loads(bytes(view[position:position + meta_length]).decode('utf-8'))
+            position += meta_length
+            (payload_length,) = _PAYLOAD_HEADER.unpack_from(raw, position)
+            position += _PAYLOAD_HEADER.size
+            payload = view[position:position + payload_length]
+            position += payload_length
+            
+            data = None
+            if kind == RECORD_FRAME:
+                data = np.frombuffer(payload, dtype=meta['dtype']).reshape(meta['shape'])
+                if meta.get('encoding') == 'xor':
+                    data = np.bitwise_xor(data, previous_frames[meta['region']])
+                previous_frames[meta['region']] = data
+            
+            records.append(SessionRecord(kind, meta, data))
+        
+        return records
+    
+    def find_chunk(self, timestamp):
+        return max(0, bisect.bisect_right(self._chunk_starts, timestamp) - 1)
+    
+    def _iter_chunks(self, start_time=None, end_time=None):
+        """(chunk number, records inside the time range) for every chunk that overlaps it"""
+        first_chunk = self.find_chunk(start_time) if start_time is not None else 0
+        
+        for chunk_number in range(first_chunk, len(self.index)):
+            if end_time is not None and self.index[chunk_number]['first_timestamp'] > end_time:
+                return
+            
+            records = [record for record in self.read_chunk(chunk_number)
+                       if (start_time is None or record.timestamp >= start_time)
+                       and (end_time is None or record.timestamp <= end_time)]
+            yield chunk_number, records
+    
+    def iter_records(self, start_time=None, end_time=None, kinds=None):
+        for _, records in self._iter_chunks(start_time, end_time):
+            for record in records:
+                if kinds is None or record.kind in kinds:
+                    yield record
+    
+    def iter_ticks(self, start_time=None, end_time=None):
+        """SessionTicks in tick order, each holding every record of its tick.
+        
+        The helper and navigation threads write records for different frame
+        ids in between each other, so records are grouped by tick id and a
+        tick is only yielded once no later chunk can still contain it.
+        """
+        # Lowest tick id any chunk from here on can hold
+        later_first_ticks = [float('inf')] * (len(self.index) + 1)
+        for chunk_number in range(len(self.index) - 1, -1, -1):
+            later_first_ticks[chunk_number] = min(self.index[chunk_number]['first_tick'],
+                                                  later_first_ticks[chunk_number + 1])
+        
+        pending = {}
+        for chunk_number, records in self._iter_chunks(start_time, end_time):
+            for record in records:
+                session_tick = pending.get(record.tick)
+                if session_tick is None:
+                    session_tick = pending[record.tick] = SessionTick(record.tick, record.timestamp)
+                else:
+                    session_tick.timestamp = min(session_tick.timestamp, record.timestamp)
+                
+                if record.kind == RECORD_FRAME:
+                    session_tick.frames[record.meta['region']] = record
+                elif record.kind == RECORD_OUTPUT:
+                    session_tick.outputs[record.meta['detector']] = record.meta['value']
+                elif record.kind == RECORD_ACTION:
+                    session_tick.actions.append(record.meta)
+            
+            horizon = later_first_ticks[chunk_number + 1]
+            for tick in sorted(tick for tick in pending if tick < horizon):
+                yield pending.pop(tick)
+        
+        for tick in sorted(pending):
+            yield pending.pop(tick)
+    
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
\ No newline at end of file
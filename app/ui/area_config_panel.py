@@ -78,6 +78,13 @@ class AreaConfigPanel:
                              command=lambda: self._start_area_selection(title, color, selector))
         select_btn.pack(fill=tk.X)
         
+        if selector is self.health_selector:
+            calibrate_btn = tk.Button(btn_frame, text="Calibrate at Full HP",
+                                      bg="#3d3d3d", fg="#ffffff", relief=tk.FLAT, borderwidth=0,
+                                      font=("Segoe UI", 9), activebackground="#4d4d4d",
+                                      command=self._calibrate_health_clicked)
+            calibrate_btn.pack(fill=tk.X, pady=(4, 0))
+        
         # Store widget references for updates
         self.area_widgets[selector] = {
             'status_dot': status_dot,
@@ -99,6 +106,8 @@ class AreaConfigPanel:
                     self._create_preview_image(selector)
                     self.update_area_status(selector)
                     self.main_app.interface_manager.check_configuration()
+                    if selector is self.health_selector:
+                        self.calibrate_health_bar()
                     # Auto-save configuration
                     self.main_app.save_settings()
                 else:
@@ -121,19 +130,44 @@ class AreaConfigPanel:
             logger.error(f"Error starting {title} selection: {e}")
             self.main_app.log(f"Error starting {title} selection: {e}")
     
+    def _calibrate_health_clicked(self):
+        if self.calibrate_health_bar():
+            self.main_app.save_settings()
+    
+    def calibrate_health_bar(self):
+        """Calibrate on the current health bar, taking HP as full so a bar without a visible empty track still calibrates"""
+        if not self.health_selector.is_setup():
+            self.main_app.log("Select the health bar area before calibrating")
+            return None
+        
+        try:
+            from app.screen_capture.capture_backend import get_capture_backend
+            
+            selector = self.health_selector
+            bbox = (int(selector.x1), int(selector.y1), int(selector.x2), int(selector.y2))
+            image = get_capture_backend().grab_array(bbox=bbox)
+            calibration = self.main_app.health_detector.calibrate(image, area=bbox, bar_full=True)
+            if calibration is None:
+                self.main_app.log("No health bar found to calibrate - keep HP full and the bar visible, then try again")
+                return None
+            
+            self.main_app.log(f"Health bar calibrated at full HP: {calibration.width}x{calibration.height} ({calibration.direction})")
+            return calibration
+            
+        except Exception as e:
+            logger.error(f"Error calibrating health bar: {e}")
+            self.main_app.log(f"Error calibrating health bar: {e}")
+            return None
+    
     def _create_preview_image(self, selector):
         """Create preview image for area selector"""
         try:
             if selector.is_setup():
-                from PIL import ImageGrab
+                from app.screen_capture.capture_backend import get_capture_backend
                 
                 # Capture the area
                 bbox = (selector.x1, selector.y1, selector.x2, selector.y2)
-                try:
-                    preview_img = ImageGrab.grab(bbox=bbox, all_screens=True)
-                except TypeError:
-                    # Fallback for older PIL versions
-                    preview_img = ImageGrab.grab(bbox=bbox)
+                preview_img = get_capture_backend().grab(bbox=bbox)
                 
                 # Store the preview image in the selector
                 selector.preview_image = preview_img
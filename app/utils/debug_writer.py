@@ -0,0 +1,224 @@
+import os
+import time
+import queue
+import atexit
+import logging
+import threading
+import collections
+import cv2
+import numpy as np
+
+logger = logging.getLogger('PokeXHelper')
+
+DEFAULT_SAMPLE_RATES = {
+    'coordinate_extraction': 0.2,
+    'pokemon_detection': 0.2
+}
+
+class DebugImageWriter:
+    """Writes debug images on a background thread so detection never waits on PNG encoding.
+    
+    Callers hand over a copy of the image and return immediately. When the
+    bounded queue is full the new item is dropped rather than blocking the
+    caller. Each category can be sampled down to a fraction of its images,
+    and the oldest files under root_dir are deleted once the directory grows
+    past quota_bytes. While the writer is disabled only forced batches, such
+    as failure dumps, are queued.
+    """
+    
+    def __init__(self, root_dir="debug_images", max_queue=64, quota_bytes=200 * 1024 * 1024,
+                 sample_rates=None, enabled=True):
+        self.logger = logging.getLogger('PokeXHelper')
+        self.root_dir = root_dir
+        self.quota_bytes = quota_bytes
+        self.sample_rates = dict(sample_rates or {})
+        self.default_sample_rate = 1.0
+        self.enabled = enabled
+        
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._seen = collections.Counter()
+        self._files = None
+        self._total_bytes = 0
+        
+        self.queued_count = 0
+        self.written_count = 0
+        self.dropped_count = 0
+        self.sampled_out_count = 0
+        self.evicted_count = 0
+        self.error_count = 0
+    
+    def set_enabled(self, enabled):
+        if enabled != self.enabled:
+            self.logger.info(f"Debug image writing {'enabled' if enabled else 'disabled'}")
+        self.enabled = bool(enabled)
+    
+    def set_sample_rate(self, category, rate):
+        """Keep roughly this fraction (0-1) of the images written under category"""
+        self.sample_rates[category] = max(0.0, min(1.0, rate))
+    
+    def _sampled(self, category):
+        rate = self.sample_rates.get(category, self.default_sample_rate)
+        with self._lock:
+            count = self._seen[category]
+            self._seen[category] = count + 1
+        return int((count + 1) * rate) > int(count * rate)
+    
+    def write(self, category, image, filename, rgb=False):
+        """Queue image for writing to root_dir/filename; returns False if it was not queued"""
+        if image is None:
+            return False
+        data = np.array(image)
+        if rgb and data.ndim == 3 and data.shape[2] == 3:
+            data = cv2.cvtColor(data, cv2.COLOR_RGB2BGR)
+        return self.write_batch(category, [(filename, data)])
+    
+    def write_text(self, category, filename, text):
+        return self.write_batch(category, [(filename, text)])
+    
+    def write_batch(self, category, items, force=False):
+        """Queue several files as one unit, e.g. a failure dump; items are (filename, BGR array or text).
+        
+        force queues the batch even while debug writing is disabled and skips sampling.
+        """
+        if not items or not (self.enabled or force):
+            return False
+        
+        if not force and not self._sampled(category):
+            self.sampled_out_count += 1
+            return False
+        
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((category, items))
+            self.queued_count += 1
+            return True
+        except queue.Full:
+            self.dropped_count += 1
+            self.logger.debug(f"Debug writer queue full, dropped {category}")
+            return False
+    
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._worker_loop, name="DebugImageWriter", daemon=True)
+            self._thread.start()
+    
+    def _worker_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write_items(*item)
+            finally:
+                self._queue.task_done()
+    
+    def _write_items(self, category, items):
+        for filename, content in items:
+            path = os.path.join(self.root_dir, filename)
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                if isinstance(content, str):
+                    with open(path, 'w') as f:
+                        f.write(content)
+                elif not cv2.imwrite(path, content):
+                    raise IOError("encoder returned False")
+                
+                self.written_count += 1
+                self._track_file(path)
+            except Exception as e:
+                self.error_count += 1
+                self.logger.debug(f"Could not write debug file {path} ({category}): {e}")
+        
+        self._enforce_quota()
+    
+    def _scan_existing(self):
+        files = []
+        for folder, _, names in os.walk(self.root_dir):
+            for name in names:
+                path = os.path.join(folder, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, path, stat.st_size))
+        
+        files.sort()
+        self._files = collections.deque((path, size) for _, path, size in files)
+        self._total_bytes = sum(size for _, size in self._files)
+    
+    def _track_file(self, path):
+        if self._files is None:
+            self._scan_existing()
+            return
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        self._files.append((path, size))
+        self._total_bytes += size
+    
+    def _enforce_quota(self):
+        if self._files is None or self.quota_bytes is None:
+            return
+        
+        while self._files and self._total_bytes > self.quota_bytes:
+            path, size = self._files.popleft()
+            self._total_bytes -= size
+            try:
+                os.remove(path)
+                self.evicted_count += 1
+            except OSError:
+                continue
+            
+            folder = os.path.dirname(path)
+            if os.path.normpath(folder) != os.path.normpath(self.root_dir):
+                try:
+                    os.rmdir(folder)
+                except OSError:
+                    pass
+    
+    def flush(self, timeout=5.0):
+        """Wait until everything queued so far has been written"""
+        deadline = time.time() + timeout
+        while self._queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.01)
+        return not self._queue.unfinished_tasks
+    
+    def stop(self, timeout=2.0):
+        if self._thread is None:
+            return
+        self.flush(timeout)
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=timeout)
+        self._thread = None
+    
+    def get_stats(self):
+        return {
+            'queued': self.queued_count,
+            'written': self.written_count,
+            'dropped': self.dropped_count,
+            'sampled_out': self.sampled_out_count,
+            'evicted': self.evicted_count,
+            'errors': self.error_count,
+            'pending': self._queue.qsize(),
+            'bytes': self._total_bytes
+        }
+
+_debug_writer = None
+
+def get_debug_writer():
+    global _debug_writer
+    if _debug_writer is None:
+        quota_mb = int(os.environ.get("PXG_DEBUG_QUOTA_MB", "200"))
+        _debug_writer = DebugImageWriter(quota_bytes=quota_mb * 1024 * 1024, sample_rates=DEFAULT_SAMPLE_RATES)
+        atexit.register(_debug_writer.stop)
+    return _debug_writer
\ No newline at end of file
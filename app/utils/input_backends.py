@@ -0,0 +1,254 @@
+import os
+import abc
+import time
+import ctypes
+import logging
+import threading
+from ctypes import wintypes
+
+logger = logging.getLogger('PokeXHelper')
+
+MOUSE_LEFT = "left"
+MOUSE_RIGHT = "right"
+
+class InputBackend(abc.ABC):
+    name = "base"
+    
+    def __init__(self):
+        self.logger = logging.getLogger('PokeXHelper')
+    
+    @abc.abstractmethod
+    def send_keys(self, events):
+        """Send a sequence of (virtual_key, is_down) events"""
+    
+    @abc.abstractmethod
+    def move_to(self, x, y):
+        pass
+    
+    @abc.abstractmethod
+    def click(self, x=None, y=None, button=MOUSE_LEFT, count=1):
+        """Click at (x, y), or at the current position when no point is given"""
+    
+    @abc.abstractmethod
+    def get_cursor_pos(self):
+        pass
+    
+    def press_key(self, vk_code):
+        return self.send_keys([(vk_code, True), (vk_code, False)])
+    
+    def key_down(self, vk_code):
+        return self.send_keys([(vk_code, True)])
+    
+    def key_up(self, vk_code):
+        return self.send_keys([(vk_code, False)])
+
+ULONG_PTR = ctypes.c_size_t
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", wintypes.LONG),
+        ("dy", wintypes.LONG),
+        ("mouseData", wintypes.DWORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ULONG_PTR)
+    ]
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", wintypes.WORD),
+        ("wScan", wintypes.WORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ULONG_PTR)
+    ]
+
+class _HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [
+        ("uMsg", wintypes.DWORD),
+        ("wParamL", wintypes.WORD),
+        ("wParamH", wintypes.WORD)
+    ]
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("mi", _MOUSEINPUT), ("ki", _KEYBDINPUT), ("hi", _HARDWAREINPUT)]
+
+class _INPUT(ctypes.Structure):
+    _fields_ = [("type", wintypes.DWORD), ("union", _INPUTUNION)]
+
+class Win32InputBackend(InputBackend):
+    """Sends key and mouse events through SendInput.
+    
+    Each press is held for hold_seconds between its down and up events, as
+    pyautogui's pause between them used to do; games that poll key state
+    can miss a press whose down and up arrive in the same SendInput batch.
+    A hold of 0 sends every sequence as a single call.
+    """
+    
+    name = "win32"
+    
+    INPUT_MOUSE = 0
+    INPUT_KEYBOARD = 1
+    KEYEVENTF_KEYUP = 0x0002
+    MOUSEEVENTF_MOVE = 0x0001
+    MOUSEEVENTF_LEFTDOWN = 0x0002
+    MOUSEEVENTF_LEFTUP = 0x0004
+    MOUSEEVENTF_RIGHTDOWN = 0x0008
+    MOUSEEVENTF_RIGHTUP = 0x0010
+    MOUSEEVENTF_VIRTUALDESK = 0x4000
+    MOUSEEVENTF_ABSOLUTE = 0x8000
+    
+    SM_XVIRTUALSCREEN = 76
+    SM_YVIRTUALSCREEN = 77
+    SM_CXVIRTUALSCREEN = 78
+    SM_CYVIRTUALSCREEN = 79
+    
+    BUTTON_FLAGS = {
+        MOUSE_LEFT: (MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP),
+        MOUSE_RIGHT: (MOUSEEVENTF_RIGHTDOWN, MOUSEEVENTF_RIGHTUP)
+    }
+    
+    def __init__(self, hold_seconds=0.03):
+        super().__init__()
+        self.user32 = ctypes.windll.user32
+        self.hold_seconds = hold_seconds
+    
+    def _send(self, inputs):
+        if not inputs:
+            return True
+        array = (_INPUT * len(inputs))(*inputs)
+        sent = self.user32.SendInput(len(inputs), array, ctypes.sizeof(_INPUT))
+        if sent != len(inputs):
+            self.logger.warning(f"SendInput delivered {sent}/{len(inputs)} events")
+            return False
+        return True
+    
+    def _key_input(self, vk_code, is_down):
+        flags = 0 if is_down else self.KEYEVENTF_KEYUP
+        return _INPUT(type=self.INPUT_KEYBOARD, union=_INPUTUNION(ki=_KEYBDINPUT(wVk=vk_code, dwFlags=flags)))
+    
+    def _mouse_input(self, flags, dx=0, dy=0):
+        return _INPUT(type=self.INPUT_MOUSE, union=_INPUTUNION(mi=_MOUSEINPUT(dx=dx, dy=dy, dwFlags=flags)))
+    
+    def _move_input(self, x, y):
+        left = self.user32.GetSystemMetrics(self.SM_XVIRTUALSCREEN)
+        top = self.user32.GetSystemMetrics(self.SM_YVIRTUALSCREEN)
+        width = max(2, self.user32.GetSystemMetrics(self.SM_CXVIRTUALSCREEN))
+        height = max(2, self.user32.GetSystemMetrics(self.SM_CYVIRTUALSCREEN))
+        
+        norm_x = int(round((int(x) - left) * 65535 / (width - 1)))
+        norm_y = int(round((int(y) - top) * 65535 / (height - 1)))
+        flags = self.MOUSEEVENTF_MOVE | self.MOUSEEVENTF_ABSOLUTE | self.MOUSEEVENTF_VIRTUALDESK
+        return self._mouse_input(flags, norm_x, norm_y)
+    
+    def send_keys(self, events):
+        inputs = [self._key_input(vk_code, is_down) for vk_code, is_down in events]
+        if self.hold_seconds <= 0 or len(inputs) < 2:
+            return self._send(inputs)
+        
+        for key_input in inputs[:-1]:
+            self._send([key_input])
+            time.sleep(self.hold_seconds)
+        return self._send(inputs[-1:])
+    
+    def move_to(self, x, y):
+        return self._send([self._move_input(x, y)])
+    
+    def click(self, x=None, y=None, button=MOUSE_LEFT, count=1):
+        down_flag, up_flag = self.BUTTON_FLAGS[button]
+        prefix = [self._move_input(x, y)] if x is not None and y is not None else []
+        presses = [self._mouse_input(down_flag), self._mouse_input(up_flag)] * count
+        
+        if self.hold_seconds <= 0:
+            return self._send(prefix + presses)
+        
+        if not self._send(prefix):
+            return False
+        for press in range(count):
+            if press:
+                time.sleep(self.hold_seconds)
+            if not self._send(presses[2 * press:2 * press + 1]):
+                return False
+            time.sleep(self.hold_seconds)
+            if not self._send(presses[2 * press + 1:2 * press + 2]):
+                return False
+        return True
+    
+    def get_cursor_pos(self):
+        point = wintypes.POINT()
+        self.user32.GetCursorPos(ctypes.byref(point))
+        return point.x, point.y
+
+class RecordingInputBackend(InputBackend):
+    """Records timestamped input events in memory instead of sending them"""
+    
+    name = "recording"
+    
+    def __init__(self, start_position=(0, 0)):
+        super().__init__()
+        self.events = []
+        self.position = start_position
+        self._lock = threading.Lock()
+    
+    def _record(self, kind, **details):
+        with self._lock:
+            self.events.append((time.perf_counter(), kind, details))
+        return True
+    
+    def send_keys(self, events):
+        for vk_code, is_down in events:
+            self._record("key_down" if is_down else "key_up", vk=vk_code)
+        return True
+    
+    def move_to(self, x, y):
+        self.position = (int(x), int(y))
+        return self._record("move", x=int(x), y=int(y))
+    
+    def click(self, x=None, y=None, button=MOUSE_LEFT, count=1):
+        if x is not None and y is not None:
+            self.move_to(x, y)
+        for _ in range(count):
+            self._record("mouse_down", button=button, x=self.position[0], y=self.position[1])
+            self._record("mouse_up", button=button, x=self.position[0], y=self.position[1])
+        return True
+    
+    def get_cursor_pos(self):
+        return self.position
+    
+    def get_events(self, kind=None):
+        with self._lock:
+            return [event for event in self.events if kind is None or event[1] == kind]
+    
+    def clear(self):
+        with self._lock:
+            self.events = []
+
+_input_backend = None
+
+def create_input_backend(spec=None, hold_seconds=None):
+    """Build a backend from 'win32' or 'recording'; defaults to win32 on Windows.
+    
+    hold_seconds defaults to PXG_INPUT_HOLD_MS (30 ms when unset).
+    """
+    kind = (spec or ("win32" if os.name == "nt" else "recording")).strip().lower()
+    
+    if kind == "win32":
+        if hold_seconds is None:
+            hold_seconds = float(os.environ.get("PXG_INPUT_HOLD_MS", "30")) / 1000
+        return Win32InputBackend(hold_seconds)
+    if kind == "recording":
+        return RecordingInputBackend()
+    
+    raise ValueError(f"Unknown input backend: {spec}")
+
+def get_input_backend():
+    global _input_backend
+    if _input_backend is None:
+        _input_backend = create_input_backend(os.environ.get("PXG_INPUT_BACKEND"))
+        logger.info(f"Using input backend: {_input_backend.name}")
+    return _input_backend
+
+def set_input_backend(backend):
+    global _input_backend
+    _input_backend = backend
+    logger.info(f"Input backend set to: {backend.name}")
\ No newline at end of file
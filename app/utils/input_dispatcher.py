@@ -0,0 +1,220 @@
+import time
+import heapq
+import logging
+import itertools
+import threading
+import collections
+
+logger = logging.getLogger('PokeXHelper')
+
+PRIORITY_HEAL = 0
+PRIORITY_BATTLE = 10
+PRIORITY_NAVIGATION = 20
+PRIORITY_BACKGROUND = 50
+
+class InputAction:
+    """A queued input action made of one or more steps that run back to back"""
+    
+    def __init__(self, name, device, steps, priority, deadline=None):
+        self.name = name
+        self.device = device
+        self.steps = steps
+        self.priority = priority
+        self.deadline = deadline
+        
+        self.enqueued_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+        self.status = "queued"
+        self.result = None
+        self._done = threading.Event()
+    
+    @property
+    def latency_ms(self):
+        if self.started_at is None:
+            return None
+        return (self.started_at - self.enqueued_at) * 1000
+    
+    def is_expired(self, now=None):
+        now = now if now is not None else time.perf_counter()
+        return self.deadline is not None and now > self.deadline
+    
+    def cancel(self):
+        if self.status == "queued":
+            self._finish("cancelled", False)
+    
+    def wait(self, timeout=None):
+        """Block until the action ran (or was dropped) and return its result"""
+        if not self._done.wait(timeout):
+            return False
+        return self.result
+    
+    def done(self):
+        return self._done.is_set()
+    
+    def _finish(self, status, result):
+        self.status = status
+        self.result = result
+        self.finished_at = time.perf_counter()
+        self._done.set()
+    
+    def __repr__(self):
+        return f"InputAction(name='{self.name}', priority={self.priority}, status='{self.status}')"
+
+class InputDispatcher:
+    """Single worker that sends all keyboard and mouse input in priority order.
+    
+    Lower priority numbers run first, so a queued heal keypress goes ahead
+    of any waiting mouse action. An action that has started runs all of its
+    steps before the next one is taken; the backends make moves and clicks
+    single calls, so this wait is one call long. Actions still queued after
+    their deadline are dropped rather than sent late.
+    """
+    
+    def __init__(self, mouse_controller=None, history_size=500):
+        self.logger = logging.getLogger('PokeXHelper')
+        self.mouse_controller = mouse_controller
+        
+        self._queue = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+        
+        self.latencies = collections.defaultdict(lambda: collections.deque(maxlen=history_size))
+        self._latency_lock = threading.Lock()
+        self.dispatched_count = 0
+        self.expired_count = 0
+        self.failed_count = 0
+    
+    def start(self):
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        
+        self._thread = threading.Thread(target=self._worker_loop, daemon=True)
+        self._thread.start()
+        self.logger.debug("Input dispatcher started")
+    
+    def stop(self, timeout=2.0):
+        with self._condition:
+            self._running = False
+            pending = [entry[2] for entry in self._queue]
+            self._queue = []
+            self._condition.notify_all()
+        
+        for action in pending:
+            action.cancel()
+        
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+    
+    def submit(self, name, device, steps, priority=PRIORITY_BACKGROUND, deadline=None):
+        """Queue an action; deadline is in seconds from now"""
+        if not self._running:
+            self.start()
+        
+        absolute_deadline = time.perf_counter() + deadline if deadline is not None else None
+        action = InputAction(name, device, steps, priority, absolute_deadline)
+        
+        with self._condition:
+            heapq.heappush(self._queue, (priority, next(self._counter), action))
+            self._condition.notify()
+        return action
+    
+    def press_key(self, key, priority=PRIORITY_HEAL, deadline=None):
+        from app.utils.keyboard_input import press_key
+        return self.submit(f"key:{key}", "keyboard", [lambda: press_key(key)], priority, deadline)
+    
+    def move_to(self, x, y, priority=PRIORITY_NAVIGATION, deadline=None):
+        return self.submit(f"move:{x},{y}", "mouse", [lambda: self.mouse_controller.move_to(x, y)],
+                           priority, deadline)
+    
+    def click_at(self, x, y, priority=PRIORITY_NAVIGATION, deadline=None):
+        return self.submit(f"click:{x},{y}", "mouse", [lambda: self.mouse_controller.click_at(x, y)],
+                           priority, deadline)
+    
+    def pending_count(self):
+        with self._condition:
+            return len(self._queue)
+    
+    def _next_action(self):
+        with self._condition:
+            while self._running and not self._queue:
+                self._condition.wait()
+            if not self._running:
+                return None
+            return heapq.heappop(self._queue)[2]
+    
+    def _worker_loop(self):
+        while True:
+            action = self._next_action()
+            if action is None:
+                break
+            self._dispatch(action)
+    
+    def _dispatch(self, action):
+        if action.done():
+            return
+        
+        if action.is_expired():
+            self.expired_count += 1
+            self.logger.debug(f"Dropped expired input action {action.name}")
+            action._finish("expired", False)
+            return
+        
+        action.started_at = time.perf_counter()
+        action.status = "running"
+        with self._latency_lock:
+            self.latencies[action.device].append(action.latency_ms)
+        
+        result = True
+        try:
+            for step in action.steps:
+                if step() is False:
+                    result = False
+                    break
+        except Exception as e:
+            self.failed_count += 1
+            self.logger.error(f"Input action {action.name} failed: {e}")
+            result = False
+        
+        self.dispatched_count += 1
+        action._finish("done" if result else "failed", result)
+    
+    def _latency_samples(self):
+        """Copy of the latency samples per device, taken while the worker cannot append"""
+        with self._latency_lock:
+            return {device: list(samples) for device, samples in self.latencies.items()}
+    
+    def get_latency(self, device, percentile=0.95):
+        """Queue-to-start latency in seconds at the given percentile, or None without samples"""
+        with self._latency_lock:
+            samples = list(self.latencies.get(device, ()))
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percentile))] / 1000
+    
+    def get_stats(self):
+        stats = {
+            'dispatched': self.dispatched_count,
+            'expired': self.expired_count,
+            'failed': self.failed_count,
+            'pending': self.pending_count(),
+            'latency_ms': {}
+        }
+        
+        for device, samples in self._latency_samples().items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            stats['latency_ms'][device] = {
+                'count': len(ordered),
+                'mean': round(sum(ordered) / len(ordered), 3),
+                'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+                'max': round(ordered[-1], 3)
+            }
+        return stats
\ No newline at end of file
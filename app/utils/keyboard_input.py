@@ -1,6 +1,6 @@
 import time
 import logging
-import ctypes
+from app.utils.input_backends import get_input_backend
 
 logger = logging.getLogger('PokeXHelper')
 
@@ -40,14 +40,7 @@ def press_key(key):
         
         logger.debug(f"Pressing key '{key}' (VK: {vk_code})")
         
-        KEYEVENTF_KEYUP = 0x0002
-        
-        ctypes.windll.user32.keybd_event(vk_code, 0, 0, 0)
-        time.sleep(0.05)
-        
-        ctypes.windll.user32.keybd_event(vk_code, 0, KEYEVENTF_KEYUP, 0)
-        
-        return True
+        return get_input_backend().press_key(vk_code)
     except Exception as e:
         logger.error(f"Error pressing key '{key}': {e}", exc_info=True)
         return False
@@ -59,20 +52,12 @@ def press_key_combination(key1, key2):
         
         logger.debug(f"Pressing key combination '{key1}+{key2}'")
         
-        KEYEVENTF_KEYUP = 0x0002
-        
-        ctypes.windll.user32.keybd_event(vk_code1, 0, 0, 0)
-        time.sleep(0.05)
-        
-        ctypes.windll.user32.keybd_event(vk_code2, 0, 0, 0)
-        time.sleep(0.05)
-        
-        ctypes.windll.user32.keybd_event(vk_code2, 0, KEYEVENTF_KEYUP, 0)
-        time.sleep(0.05)
-        
-        ctypes.windll.user32.keybd_event(vk_code1, 0, KEYEVENTF_KEYUP, 0)
-        
-        return True
+        return get_input_backend().send_keys([
+            (vk_code1, True),
+            (vk_code2, True),
+            (vk_code2, False),
+            (vk_code1, False)
+        ])
     except Exception as e:
         logger.error(f"Error pressing key combination {key1}+{key2}: {e}", exc_info=True)
         return False
@@ -83,13 +68,10 @@ def hold_key(key, duration):
         
         logger.debug(f"Holding key '{key}' for {duration}s")
         
-        KEYEVENTF_KEYUP = 0x0002
-        
-        ctypes.windll.user32.keybd_event(vk_code, 0, 0, 0)
+        backend = get_input_backend()
+        backend.key_down(vk_code)
         time.sleep(duration)
-        ctypes.windll.user32.keybd_event(vk_code, 0, KEYEVENTF_KEYUP, 0)
-        
-        return True
+        return backend.key_up(vk_code)
     except Exception as e:
         logger.error(f"Error holding key '{key}': {e}", exc_info=True)
         return False
\ No newline at end of file
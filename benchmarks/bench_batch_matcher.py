@@ -0,0 +1,90 @@
+"""Latency of matching many Pokemon templates against one screen.
+
+Compares the previous per-template loop (screen and template converted to
+gray on every call, np.where over each result map) with
+BatchTemplateMatcher run serially and on its thread pool.
+
+    python benchmarks/bench_batch_matcher.py [--templates 10 50 200] [--workers 4]
+"""
+import os
+import sys
+import time
+import argparse
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.processors.batch_matcher import BatchTemplateMatcher
+
+def make_scene(template_count, screen_size, template_size, seed=0):
+    """Noise screen with a few of the BGR templates pasted in"""
+    rng = np.random.default_rng(seed)
+    height, width = screen_size
+    screen = cv2.GaussianBlur(rng.integers(0, 255, (height, width, 3), dtype=np.uint8), (0, 0), 1.5)
+    templates = {}
+    for number in range(template_count):
+        template = cv2.GaussianBlur(rng.integers(0, 255, (template_size, template_size, 3), dtype=np.uint8), (0, 0), 1.0)
+        templates[f"pokemon_{number}"] = template
+        if number % 10 == 0:
+            x = int(rng.integers(0, width - template_size))
+            y = int(rng.integers(0, height - template_size))
+            screen[y:y + template_size, x:x + template_size] = template[..., ::-1]
+    return screen, templates
+
+def loop_match(screen_rgb, templates, threshold):
+    """The per-template loop PokemonDetector.detect_multiple_pokemon used before"""
+    detections = {}
+    for name, template in templates.items():
+        screen_gray = cv2.cvtColor(screen_rgb, cv2.COLOR_RGB2GRAY)
+        template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+        result = cv2.matchTemplate(screen_gray, template_gray, cv2.TM_CCOEFF_NORMED)
+        locations = np.where(result >= threshold)
+        detections[name] = len(locations[0]) > 0
+    return detections
+
+def median_ms(function, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--templates", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--screen", type=int, nargs=2, default=[480, 640], metavar=("HEIGHT", "WIDTH"))
+    parser.add_argument("--template-size", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    args = parser.parse_args()
+    
+    serial = BatchTemplateMatcher(max_workers=1)
+    threaded = BatchTemplateMatcher(max_workers=args.workers)
+    print(f"cpus: {os.cpu_count()}  opencv threads: {cv2.getNumThreads()}  workers: {args.workers}")
+    print(f"{'templates':>9} {'found':>6} {'loop ms':>9} {'batch ms':>9} {'threaded ms':>12} {'speedup':>8}")
+    
+    for template_count in args.templates:
+        screen, templates = make_scene(template_count, tuple(args.screen), args.template_size)
+        gray_templates = {name: cv2.cvtColor(template, cv2.COLOR_BGR2GRAY) for name, template in templates.items()}
+        
+        def batch(matcher):
+            return matcher.match_all(cv2.cvtColor(screen, cv2.COLOR_RGB2GRAY), gray_templates, args.threshold)
+        
+        expected = loop_match(screen, templates, args.threshold)
+        found = batch(threaded)
+        assert {name: detection['detected'] for name, detection in found.items()} == expected
+        
+        loop_ms = median_ms(lambda: loop_match(screen, templates, args.threshold), args.repeats)
+        serial_ms = median_ms(lambda: batch(serial), args.repeats)
+        threaded_ms = median_ms(lambda: batch(threaded), args.repeats)
+        found_count = sum(detection['detected'] for detection in found.values())
+        print(f"{template_count:>9} {found_count:>6} {loop_ms:>9.1f} {serial_ms:>9.1f} {threaded_ms:>12.1f} "
+              f"{loop_ms / min(serial_ms, threaded_ms):>7.1f}x")
+    
+    threaded.shutdown()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
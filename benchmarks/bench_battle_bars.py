@@ -0,0 +1,101 @@
+"""Latency of battle health bar extraction against bar count and battle area size.
+
+Compares the findContours loop BattleDetector uses with a single
+connected-components pass filtered with numpy, on synthetic battle areas
+with N green bars. The components pass did not beat the contour loop on
+the default battle area, so the detector keeps findContours; run this
+again before switching.
+
+    python benchmarks/bench_battle_bars.py [--repeats 200]
+"""
+import os
+import sys
+import time
+import argparse
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.detectors.battle_detector import BattleDetector
+from app.core.processors.color_lut import GREEN
+
+BASE_SIZE = (367, 266)
+
+def make_battle_area(bar_count, scale, seed=0):
+    rng = np.random.default_rng(seed)
+    height, width = int(BASE_SIZE[0] * scale), int(BASE_SIZE[1] * scale)
+    image = rng.integers(0, 90, (height, width, 3), dtype=np.uint8)
+    image[..., 2] = rng.integers(90, 160, (height, width), dtype=np.uint8)
+    
+    bar_width, bar_height = 80, 6
+    columns = max(1, (width - 10) // (bar_width + 10))
+    for number in range(bar_count):
+        row, column = divmod(number, columns)
+        x = 10 + column * (bar_width + 10)
+        y = 10 + row * (bar_height + 8)
+        if y + bar_height >= height:
+            break
+        filled = int(bar_width * rng.uniform(0.3, 1.0))
+        image[y:y + bar_height, x:x + bar_width] = (60, 60, 60)
+        image[y:y + bar_height, x:x + filled] = (40, 200, 40)
+    
+    image.flags.writeable = False
+    return image
+
+def component_bars(mask, min_area=50, min_width=30, min_aspect=2.0):
+    """Bars from one connectedComponentsWithStats pass over the box around the green pixels"""
+    left, top, box_width, box_height = cv2.boundingRect(mask)
+    if box_width == 0 or box_height == 0:
+        return []
+    
+    roi = mask[top:top + box_height, left:left + box_width]
+    max_components = ((box_width + 1) // 2) * ((box_height + 1) // 2)
+    label_type = cv2.CV_16U if max_components < 65535 else cv2.CV_32S
+    _, _, stats, _ = cv2.connectedComponentsWithStats(roi, connectivity=8, ltype=label_type)
+    
+    stats = stats[1:, :5]
+    width, height, area = stats[:, cv2.CC_STAT_WIDTH], stats[:, cv2.CC_STAT_HEIGHT], stats[:, cv2.CC_STAT_AREA]
+    # Pixel count runs higher than contourArea, so the same 50 px threshold keeps slightly smaller blobs
+    bars = stats[(area > min_area) & (width > min_aspect * height) & (width > min_width)]
+    bars = bars[np.argsort(bars[:, cv2.CC_STAT_TOP], kind='stable')]
+    fill = bars[:, cv2.CC_STAT_AREA] * 100.0 / (bars[:, cv2.CC_STAT_WIDTH] * bars[:, cv2.CC_STAT_HEIGHT])
+    return [{'x': x + left, 'y': y + top, 'width': w, 'height': h, 'health_percentage': percentage, 'area': float(a)}
+            for (x, y, w, h, a), percentage in zip(bars.tolist(), fill.tolist())]
+
+def median_ms(function, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--bars", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64])
+    parser.add_argument("--scales", type=float, nargs="+", default=[1.0, 2.0, 4.0])
+    args = parser.parse_args()
+    
+    detector = BattleDetector()
+    detector._save_debug_mask = lambda mask, prefix: None
+    
+    print(f"{'area':>11} {'bars':>5} {'found':>6} {'contours ms':>12} {'components ms':>14} {'ratio':>8} {'full pass ms':>13}")
+    for scale in args.scales:
+        for bar_count in args.bars:
+            image = make_battle_area(bar_count, scale)
+            labels = detector._classify_colors(image)
+            mask = detector._apply_morphology(detector._class_mask(labels, GREEN, "green"), name="green").copy()
+            
+            found = len(detector._bars_from_mask(mask))
+            contour_ms = median_ms(lambda: detector._bars_from_mask(mask), args.repeats)
+            component_ms = median_ms(lambda: component_bars(mask), args.repeats)
+            full_ms = median_ms(lambda: detector._extract_health_bars(image), args.repeats)
+            
+            size = f"{image.shape[1]}x{image.shape[0]}"
+            print(f"{size:>11} {bar_count:>5} {found:>6} {contour_ms:>12.3f} {component_ms:>14.3f} "
+                  f"{contour_ms / component_ms:>7.1f}x {full_ms:>13.3f}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
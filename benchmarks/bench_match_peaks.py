@@ -0,0 +1,98 @@
+"""Cost of turning one template match result into a list of matches.
+
+Times only the post-processing of a fixed result map: the previous
+np.where scan that built a dict for every pixel above threshold followed
+by the pairwise overlap filter, against MatchProcessor peak extraction
+with vectorised non-maximum suppression. Low thresholds are where the
+previous path blew up.
+
+    python benchmarks/bench_match_peaks.py [--thresholds 0.8 0.5 0.3] [--repeats 5]
+"""
+import os
+import sys
+import time
+import argparse
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.processors.match_processor import MatchProcessor
+
+def make_scene(screen_size, template_size, copies, seed=0):
+    """Blurred noise screen with one template pasted copies times"""
+    rng = np.random.default_rng(seed)
+    height, width = screen_size
+    screen = cv2.GaussianBlur(rng.integers(0, 255, (height, width), dtype=np.uint8), (0, 0), 1.5)
+    template = screen[:template_size, :template_size].copy()
+    for _ in range(copies):
+        x = int(rng.integers(0, width - template_size))
+        y = int(rng.integers(0, height - template_size))
+        screen[y:y + template_size, x:x + template_size] = template
+    return screen, template
+
+def box_overlap(box1, box2):
+    """Intersection over union of two (x1, y1, x2, y2) boxes, as the previous filter computed it"""
+    x1_1, y1_1, x2_1, y2_1 = box1
+    x1_2, y1_2, x2_2, y2_2 = box2
+    
+    overlap_area = max(0, min(x2_1, x2_2) - max(x1_1, x1_2)) * max(0, min(y2_1, y2_2) - max(y1_1, y1_2))
+    union_area = (x2_1 - x1_1) * (y2_1 - y1_1) + (x2_2 - x1_2) * (y2_2 - y1_2) - overlap_area
+    return overlap_area / union_area if union_area else 0
+
+def loop_matches(result, template_shape, threshold, processor):
+    """The np.where scan and pairwise filter MatchProcessor used before"""
+    height, width = template_shape
+    matches = []
+    for y, x in zip(*np.where(result >= threshold)):
+        matches.append({'box': (x, y, x + width, y + height), 'confidence': result[y, x]})
+    matches.sort(key=lambda match: match['confidence'], reverse=True)
+    
+    filtered = []
+    for match in matches:
+        if all(box_overlap(match['box'], kept['box']) <= 0.3 for kept in filtered):
+            filtered.append(match)
+    return filtered
+
+def peak_matches(result, template_shape, threshold, processor):
+    height, width = template_shape
+    radius = max(1, min(height, width) // 4)
+    ys, xs, scores = processor.find_peaks(result, threshold, radius, processor.max_peaks)
+    boxes = np.stack([xs, ys, xs + width, ys + height], axis=1)
+    return boxes[processor.non_max_suppression(boxes, scores, 0.3)]
+
+def median_ms(function, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.8, 0.5, 0.3, 0.2])
+    parser.add_argument("--screen", type=int, nargs=2, default=[480, 640], metavar=("HEIGHT", "WIDTH"))
+    parser.add_argument("--template-size", type=int, default=40)
+    parser.add_argument("--copies", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    
+    processor = MatchProcessor()
+    screen, template = make_scene(tuple(args.screen), args.template_size, args.copies)
+    result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+    match_ms = median_ms(lambda: cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED), args.repeats)
+    print(f"matchTemplate alone: {match_ms:.2f} ms")
+    print(f"{'threshold':>9} {'pixels':>8} {'loop kept':>10} {'peak kept':>10} {'loop ms':>9} {'peak ms':>8} {'speedup':>8}")
+    
+    for threshold in args.thresholds:
+        pixels = int(np.count_nonzero(result >= threshold))
+        loop_kept = loop_matches(result, template.shape, threshold, processor)
+        peak_kept = peak_matches(result, template.shape, threshold, processor)
+        loop_ms = median_ms(lambda: loop_matches(result, template.shape, threshold, processor), args.repeats)
+        peak_ms = median_ms(lambda: peak_matches(result, template.shape, threshold, processor), args.repeats)
+        print(f"{threshold:>9.2f} {pixels:>8} {len(loop_kept):>10} {len(peak_kept):>10} "
+              f"{loop_ms:>9.2f} {peak_ms:>8.2f} {loop_ms / peak_ms:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
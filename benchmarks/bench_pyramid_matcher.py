@@ -0,0 +1,113 @@
+"""Latency and agreement of pyramid step-icon matching against the full-resolution colour match.
+
+Pastes the step icons from assets/navigation_icons into synthetic minimaps
+of the configured size (265x317) and larger, then locates every icon with
+the previous path (RGB to BGR conversion and a full matchTemplate per
+icon) and with PyramidMatcher on the cached per-step pyramids.
+
+    python benchmarks/bench_pyramid_matcher.py [--sizes 265x317 530x634] [--repeats 20]
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+import cv2
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.core.processors.pyramid_matcher import PyramidMatcher
+
+def load_icons(folder):
+    icons = []
+    for path in sorted(glob.glob(os.path.join(folder, "*.png"))):
+        icon = cv2.imread(path, cv2.IMREAD_COLOR)
+        if icon is not None:
+            icons.append((os.path.basename(path), icon))
+    return icons
+
+def make_minimap(size, icons, seed=0):
+    """Blurred terrain-like noise with each BGR icon pasted once; returns the RGB minimap and icon positions"""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    terrain = rng.integers(0, 255, (height // 6 + 1, width // 6 + 1, 3)).astype(np.uint8)
+    minimap = cv2.resize(terrain, (width, height), interpolation=cv2.INTER_NEAREST)
+    minimap = cv2.GaussianBlur(minimap, (0, 0), 2.0)
+    minimap = cv2.add(minimap, rng.integers(0, 20, minimap.shape, dtype=np.uint8))
+    
+    positions = {}
+    for name, icon in icons:
+        icon_height, icon_width = icon.shape[:2]
+        x = int(rng.integers(0, width - icon_width))
+        y = int(rng.integers(0, height - icon_height))
+        minimap[y:y + icon_height, x:x + icon_width] = icon
+        positions[name] = (x, y)
+    
+    minimap = cv2.cvtColor(minimap, cv2.COLOR_BGR2RGB)
+    minimap.flags.writeable = False
+    return minimap, positions
+
+def full_match(minimap_rgb, icon_bgr):
+    """The path NavigationManager.locate_step_icon used before"""
+    minimap_bgr = cv2.cvtColor(minimap_rgb, cv2.COLOR_RGB2BGR)
+    result = cv2.matchTemplate(minimap_bgr, icon_bgr, cv2.TM_CCOEFF_NORMED)
+    _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    return max_val, max_loc
+
+def median_ms(function, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--icons", default=os.path.join(ROOT, "assets", "navigation_icons"))
+    parser.add_argument("--sizes", nargs="+", default=["265x317", "398x476", "530x634"])
+    parser.add_argument("--seeds", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--threshold", type=float, default=0.7)
+    args = parser.parse_args()
+    
+    icons = load_icons(args.icons)
+    if not icons:
+        print(f"No icons found in {args.icons}")
+        return
+    
+    matcher = PyramidMatcher()
+    pyramids = {name: matcher.build_pyramid(cv2.cvtColor(icon, cv2.COLOR_BGR2RGB)) for name, icon in icons}
+    print(f"{len(icons)} icons, levels: {sorted({len(pyramid) - 1 for pyramid in pyramids.values()})}")
+    print(f"{'minimap':>9} {'found full':>11} {'found pyr':>10} {'agree':>6} {'full ms':>8} {'pyramid ms':>11} {'speedup':>8}")
+    
+    for size_text in args.sizes:
+        size = tuple(int(value) for value in size_text.split("x"))
+        found_full = found_pyramid = agree = total = 0
+        full_times, pyramid_times = [], []
+        
+        for seed in range(args.seeds):
+            minimap, positions = make_minimap(size, icons, seed)
+            for name, icon in icons:
+                full_val, full_loc = full_match(minimap, icon)
+                pyramid_val, pyramid_loc = matcher.match(minimap, pyramids[name], args.threshold)
+                full_hit = full_val >= args.threshold
+                pyramid_hit = pyramid_loc is not None and pyramid_val >= args.threshold
+                
+                total += 1
+                found_full += full_hit and full_loc == positions[name]
+                found_pyramid += pyramid_hit and pyramid_loc == positions[name]
+                agree += full_hit == pyramid_hit and (not full_hit or full_loc == pyramid_loc)
+            
+            full_times.append(median_ms(lambda: [full_match(minimap, icon) for _, icon in icons], args.repeats))
+            pyramid_times.append(median_ms(
+                lambda: [matcher.match(minimap, pyramids[name], args.threshold) for name, _ in icons], args.repeats))
+        
+        full_ms, pyramid_ms = np.median(full_times), np.median(pyramid_times)
+        print(f"{size_text:>9} {found_full:>5}/{total:<5} {found_pyramid:>4}/{total:<5} {agree / total:>6.0%} "
+              f"{full_ms:>8.2f} {pyramid_ms:>11.2f} {full_ms / pyramid_ms:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
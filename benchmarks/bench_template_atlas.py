@@ -0,0 +1,76 @@
+"""Startup cost of loading templates from PNGs versus the packed template atlas.
+
+Writes a folder of synthetic template PNGs to a temporary directory, then
+times decoding every one with cv2.imread against mapping a TemplateAtlas
+and taking a view of every template. The atlas is built once up front,
+and the time of a rebuild after one file changes is reported as well.
+
+    python benchmarks/bench_template_atlas.py [--templates 50 200 800] [--size 48]
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.base.template_atlas import TemplateAtlas
+
+def write_templates(folder, count, size, seed=0):
+    rng = np.random.default_rng(seed)
+    paths = []
+    for number in range(count):
+        template = cv2.GaussianBlur(rng.integers(0, 255, (size, size, 3), dtype=np.uint8), (0, 0), 1.0)
+        path = os.path.join(folder, f"pokemon_{number}.png")
+        cv2.imwrite(path, template)
+        paths.append(path)
+    return paths
+
+def median_ms(function, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--templates", type=int, nargs="+", default=[50, 200, 800])
+    parser.add_argument("--size", type=int, default=48)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    
+    print(f"{'templates':>9} {'imread ms':>10} {'atlas ms':>9} {'speedup':>8} {'rebuild ms':>11} {'identical':>10}")
+    for count in args.templates:
+        root = tempfile.mkdtemp(prefix="template_atlas_")
+        try:
+            source = os.path.join(root, "templates")
+            os.makedirs(source)
+            paths = write_templates(source, count, args.size)
+            cache_dir = os.path.join(root, "cache")
+            TemplateAtlas([source], cache_dir).load()
+            
+            def load_atlas():
+                atlas = TemplateAtlas([source], cache_dir).load()
+                return [atlas.get(path)[0] for path in paths]
+            
+            decoded = [cv2.imread(path, cv2.IMREAD_COLOR) for path in paths]
+            identical = all(np.array_equal(a, b) for a, b in zip(decoded, load_atlas()))
+            imread_ms = median_ms(lambda: [cv2.imread(path, cv2.IMREAD_COLOR) for path in paths], args.repeats)
+            atlas_ms = median_ms(load_atlas, args.repeats)
+            
+            stat = os.stat(paths[0])
+            os.utime(paths[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            rebuild_ms = median_ms(lambda: TemplateAtlas([source], cache_dir).load(), 1)
+            
+            print(f"{count:>9} {imread_ms:>10.2f} {atlas_ms:>9.2f} {imread_ms / atlas_ms:>7.1f}x {rebuild_ms:>11.2f} {str(identical):>10}")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""Agreement and latency of the edge-run battle-menu check against the Canny + HoughLinesP check.
+
+Frames come from recorded sessions (battle_area region), from a folder of
+screenshots, or, when neither is given, from synthetic battle areas with
+and without a menu box, which also have a known answer. The synthetic
+labels come from the same generator the edge-run thresholds were tuned
+on, so only agreement on recorded sessions should decide whether
+BattleDetector.menu_detector can be switched from "hough" to "edge_runs".
+
+    python benchmarks/compare_menu_detector.py [--sessions a.pxgs ...] [--images dir] [--region battle_area]
+"""
+import os
+import sys
+import time
+import argparse
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.detectors.battle_detector import BattleDetector
+from app.session.session_file import SessionReader, RECORD_FRAME
+
+BASE_SIZE = (367, 266)
+
+def hough_menu(image):
+    """The check BattleDetector used before: more than 10 probabilistic Hough segments on Canny edges"""
+    gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    edges = cv2.Canny(gray, 50, 150)
+    lines = cv2.HoughLinesP(edges, 1, np.pi/180, threshold=50, minLineLength=30, maxLineGap=10)
+    return lines is not None and len(lines) > 10
+
+def session_frames(paths, region):
+    for path in paths:
+        with SessionReader(path) as reader:
+            for record in reader.iter_records(kinds=(RECORD_FRAME,)):
+                if record.meta.get('region') == region and record.data.ndim == 3:
+                    yield f"{os.path.basename(path)}#{record.tick}", record.data, None
+
+def image_frames(folder):
+    for name in sorted(os.listdir(folder)):
+        image = cv2.imread(os.path.join(folder, name))
+        if image is not None:
+            yield name, cv2.cvtColor(image, cv2.COLOR_BGR2RGB), None
+
+def synthetic_frames(count, seed=0):
+    """Blurred noise with a few blobs and our health bar; every other frame gets a bordered menu box"""
+    rng = np.random.default_rng(seed)
+    height, width = BASE_SIZE
+    for number in range(count):
+        image = rng.integers(0, 255, (height // 8, width // 8, 3)).astype(np.uint8)
+        image = cv2.resize(image, (width, height), interpolation=cv2.INTER_CUBIC)
+        image = cv2.GaussianBlur(image, (0, 0), rng.uniform(1, 4))
+        for _ in range(rng.integers(0, 4)):
+            center = tuple(int(value) for value in rng.integers(20, 200, 2))
+            color = tuple(int(value) for value in rng.integers(0, 255, 3))
+            cv2.circle(image, center, int(rng.integers(5, 25)), color, -1)
+        
+        has_menu = number % 2 == 0
+        if has_menu:
+            x, y = int(rng.integers(5, 60)), int(rng.integers(150, 250))
+            box_width, box_height = int(rng.integers(120, 190)), int(rng.integers(60, 100))
+            cv2.rectangle(image, (x, y), (x + box_width, y + box_height), (240, 240, 240), -1)
+            cv2.rectangle(image, (x, y), (x + box_width, y + box_height), (40, 40, 40), 2)
+            for row in range(int(rng.integers(1, 4))):
+                line_y = y + (row + 1) * box_height // 4
+                cv2.line(image, (x, line_y), (x + box_width, line_y), (90, 90, 90), 1)
+                cv2.putText(image, "Fight", (x + 8, line_y - 4), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 0), 1)
+        
+        image[10:16, 10:90] = (40, 200, 40)
+        yield f"synthetic#{number}", image, has_menu
+
+def timed(function, image):
+    start = time.perf_counter()
+    result = function(image)
+    return result, (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", nargs="+", default=[])
+    parser.add_argument("--images")
+    parser.add_argument("--region", default="battle_area")
+    parser.add_argument("--synthetic", type=int, default=200)
+    parser.add_argument("--show-disagreements", type=int, default=10)
+    args = parser.parse_args()
+    
+    if args.sessions:
+        frames = session_frames(args.sessions, args.region)
+    elif args.images:
+        frames = image_frames(args.images)
+    else:
+        frames = synthetic_frames(args.synthetic)
+    
+    detector = BattleDetector()
+    edge_runs = lambda image: detector._detect_menu_edge_runs(detector._convert_to_grayscale(image))
+    counts = {(True, True): 0, (True, False): 0, (False, True): 0, (False, False): 0}
+    hough_times, new_times, disagreements = [], [], []
+    hough_correct = new_correct = labelled = 0
+    
+    for name, image, truth in frames:
+        image = np.ascontiguousarray(image)
+        image.flags.writeable = False
+        hough_result, hough_ms = timed(hough_menu, image)
+        new_result, new_ms = timed(edge_runs, image)
+        hough_times.append(hough_ms)
+        new_times.append(new_ms)
+        
+        counts[(hough_result, new_result)] += 1
+        if hough_result != new_result:
+            disagreements.append((name, hough_result, new_result))
+        if truth is not None:
+            labelled += 1
+            hough_correct += hough_result == truth
+            new_correct += new_result == truth
+    
+    total = sum(counts.values())
+    if not total:
+        print("No frames found")
+        return
+    
+    agreement = (counts[(True, True)] + counts[(False, False)]) / total
+    print(f"frames: {total}  agreement with Hough: {agreement:.1%}")
+    print(f"  both menu: {counts[(True, True)]}  neither: {counts[(False, False)]}  "
+          f"Hough only: {counts[(True, False)]}  new only: {counts[(False, True)]}")
+    print(f"  median ms - Hough: {np.median(hough_times):.3f}  new: {np.median(new_times):.3f}  "
+          f"speedup: {np.median(hough_times) / np.median(new_times):.1f}x")
+    if labelled:
+        print(f"  accuracy on labelled frames - Hough: {hough_correct / labelled:.1%}  new: {new_correct / labelled:.1%}")
+    for name, hough_result, new_result in disagreements[:args.show_disagreements]:
+        print(f"  disagree {name}: Hough={hough_result} new={new_result}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file